@@ -0,0 +1,92 @@
+"""
+check_account_status with a 95%-miss workload, with and without the account filter.
+
+Non-client IBANs are well-formed IBANs from outside the customer range, so
+the filter cannot reject them on shape alone. Both backends are measured;
+"unfiltered" disables the filter on the same store.
+
+Usage:
+    python benchmarks/bench_account_filter.py [--records 1000000] [--lookups 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+
+class _PassThrough:
+    """Stands in for a filter that never rules anything out."""
+
+    def might_contain(self, hashes) -> bool:
+        return True
+
+
+def workload(records: int, lookups: int, miss_ratio: float = 0.95):
+    rng = random.Random(0)
+    return [
+        synthetic._iban(records + rng.randrange(records)) if rng.random() < miss_ratio
+        else synthetic._iban(rng.randrange(records))
+        for _ in range(lookups)
+    ]
+
+
+def run(store, ibans) -> float:
+    start = time.perf_counter()
+    for iban in ibans:
+        store.is_premium(iban)
+    return (time.perf_counter() - start) / len(ibans) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    from src.utils import metrics
+    from src.utils.data import CustomerStore
+    from src.utils.sqlite_store import SqliteCustomerStore, import_json
+
+    ibans = workload(args.records, args.lookups)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "customers.json")
+        db_path = os.path.join(tmp, "customers.db")
+        synthetic.write_json(json_path, args.records)
+        import_json(json_path, db_path)
+
+        stores = {"json": CustomerStore.from_json(json_path), "sqlite": SqliteCustomerStore(db_path)}
+        account_filter = stores["json"].account_filter
+        print(
+            f"{args.records:,} accounts | filter {account_filter.size_bytes / 2**20:.2f} MB, "
+            f"{account_filter.buffers()['params'][1]} hashes, "
+            f"expected FPR {account_filter.false_positive_rate:.2%}"
+        )
+
+        for label, store in stores.items():
+            metrics.reset()
+            filtered = run(store, ibans)
+            values = metrics.snapshot()
+            negatives = values.get("account_filter.negatives", 0)
+            false_positives = values.get("account_filter.false_positives", 0)
+
+            store._account_filter = _PassThrough()
+            unfiltered = run(store, ibans)
+            print(
+                f"{label:>7} | filtered {filtered:6.2f} us | unfiltered {unfiltered:6.2f} us | "
+                f"{unfiltered / filtered:4.1f}x | observed FPR {false_positives / (negatives + false_positives):.2%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Conversation throughput on one worker: blocking graph.invoke vs graph.ainvoke.
+
+Runs N concurrent first turns through the real graph (greeter + guardrail,
+two LLM calls each) against a local fake OpenAI server that answers after
+a fixed delay, standing in for model latency. "invoke" reproduces the old
+endpoint, an ``async def`` calling the sync graph, so turns queue behind
+each other on the event loop; "ainvoke" awaits the model and overlaps them.
+
+Usage:
+    python benchmarks/bench_async_graph.py [--latency 0.2] [--concurrency 1 4 16 64]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+
+def completion(content: str) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+    }).encode()
+
+
+GREETING = completion("Hello! Could you give me your name and phone number or IBAN?")
+SAFE = completion(json.dumps({"is_safe": True, "violation_reason": None, "sanitized_content": None}))
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """Answers chat completions after ``latency`` seconds: the guardrail gets a verdict, agents a greeting."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.2
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.latency)
+        payload = SAFE if b"response_format" in body else GREETING
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+async def run(graph, conversations: int, use_async: bool) -> float:
+    from langchain_core.messages import HumanMessage
+
+    async def turn():
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        payload = {"messages": [HumanMessage(content="Hi")]}
+        if use_async:
+            return await graph.ainvoke(payload, config=config)
+        return graph.invoke(payload, config=config)
+
+    start = time.perf_counter()
+    states = await asyncio.gather(*(turn() for _ in range(conversations)))
+    elapsed = time.perf_counter() - start
+    assert all(state["messages"][-1].content for state in states)
+    return elapsed
+
+
+async def compare(graph, concurrency):
+    await run(graph, 1, True)  # build the models and open connections
+    for conversations in concurrency:
+        line = f"{conversations:>3} concurrent"
+        for label, use_async in (("invoke", False), ("ainvoke", True)):
+            elapsed = await run(graph, conversations, use_async)
+            line += f" | {label} {conversations / elapsed:6.1f} turns/s ({elapsed:5.2f}s)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency per call (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    FakeOpenAI.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+    from src.graph.builder import build_graph
+
+    print(f"fake model latency {args.latency * 1000:.0f} ms, 2 LLM calls per turn")
+    # One event loop for the whole run, as in a server worker: the pooled
+    # async connections belong to the loop that opened them.
+    asyncio.run(compare(build_graph(), args.concurrency))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
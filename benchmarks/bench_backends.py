@@ -0,0 +1,100 @@
+"""
+JSON (in-memory columnar) vs. SQLite customer backends.
+
+Measures open time, resident memory and lookup latency for each backend,
+each in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_backends.py [--records 1000000] [--lookups 20000]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def child(location: str, records: int, lookups: int) -> None:
+    """Open one backend, run lookups and print the measurements as JSON."""
+    from src.utils.data import open_customer_store
+
+    baseline = _current_rss_mb()
+    start = time.perf_counter()
+    store = open_customer_store(location)
+    opened = time.perf_counter() - start
+
+    rng = random.Random(0)
+    samples = [synthetic.customer(rng.randrange(records)) for _ in range(lookups)]
+    start = time.perf_counter()
+    for customer in samples:
+        assert store.find_customer(name=customer["name"], phone=customer["phone"]) is not None
+    find = (time.perf_counter() - start) / lookups
+
+    start = time.perf_counter()
+    for i, customer in enumerate(samples):
+        # Half of the probes miss, like traffic from non-clients.
+        store.is_premium(customer["iban"] if i % 2 else customer["iban"][:-1] + "X")
+    status = (time.perf_counter() - start) / lookups
+
+    print(json.dumps({
+        "open_s": opened,
+        "find_us": find * 1e6,
+        "status_us": status * 1e6,
+        "rss_mb": _current_rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.records, args.lookups)
+        return
+
+    from src.utils.sqlite_store import import_json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "customers.json")
+        db_path = os.path.join(tmp, "customers.db")
+        synthetic.write_json(json_path, args.records)
+        start = time.perf_counter()
+        import_json(json_path, db_path)
+        print(f"{args.records:,} customers | SQLite import {time.perf_counter() - start:.1f}s")
+
+        for label, location in (("json", json_path), ("sqlite", f"sqlite:///{db_path}")):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", location,
+                 "--records", str(args.records), "--lookups", str(args.lookups)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{label:>7} | open {result['open_s']:7.3f}s | RSS +{result['rss_mb']:6.0f} MB | "
+                f"find_customer {result['find_us']:6.2f} us | is_premium {result['status_us']:6.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
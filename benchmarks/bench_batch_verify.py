@@ -0,0 +1,94 @@
+"""
+Batch identity verification throughput.
+
+Compares ``verify_batch`` with the per-row path the tools take
+(``find_customer`` then ``is_premium``), on the snapshot-backed JSON store
+and on SQLite. The workload mixes matches on each pair of details, misses
+and rows with too few details.
+
+Usage:
+    python benchmarks/bench_batch_verify.py [--records 1000000] [--rows 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+
+def workload(records: int, rows: int):
+    rng = random.Random(0)
+    identities = []
+    for _ in range(rows):
+        customer = synthetic.customer(rng.randrange(records))
+        roll = rng.random()
+        if roll < 0.25:
+            identity = {"name": customer["name"], "phone": customer["phone"]}
+        elif roll < 0.5:
+            identity = {"name": customer["name"], "iban": customer["iban"]}
+        elif roll < 0.7:
+            identity = {"phone": customer["phone"], "iban": customer["iban"]}
+        elif roll < 0.9:
+            # Wrong person for this phone number.
+            identity = {"name": "Someone Else", "phone": customer["phone"]}
+        else:
+            identity = {"name": customer["name"]}
+        identities.append(identity)
+    return identities
+
+
+def per_row(store, identities) -> None:
+    for identity in identities:
+        details = [identity.get(key) for key in ("name", "phone", "iban")]
+        if sum(bool(detail) for detail in details) < 2:
+            continue
+        customer = store.find_customer(*details)
+        if customer is not None:
+            store.is_premium(customer["iban"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    from src.utils.batch_verify import verify_batch
+    from src.utils.snapshot import build_snapshot
+    from src.utils.sqlite_store import SqliteCustomerStore, import_json
+
+    identities = workload(args.records, args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "customers.json")
+        synthetic.write_json(json_path, args.records)
+        stores = {"json": build_snapshot(json_path, os.path.join(tmp, "customers.snapshot"))}
+        import_json(json_path, os.path.join(tmp, "customers.db"))
+        stores["sqlite"] = SqliteCustomerStore(os.path.join(tmp, "customers.db"))
+
+        print(f"{args.records:,} customers, {args.rows:,} rows")
+        for label, store in stores.items():
+            start = time.perf_counter()
+            per_row(store, identities)
+            baseline = time.perf_counter() - start
+
+            start = time.perf_counter()
+            verify_batch(store, identities)
+            batched = time.perf_counter() - start
+            print(
+                f"{label:>7} | per-row {args.rows / baseline:9,.0f} rows/s | "
+                f"verify_batch {args.rows / batched:9,.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
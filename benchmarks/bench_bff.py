@@ -0,0 +1,188 @@
+"""
+Latency the BFF (src/api.py) adds on top of the LangGraph API.
+
+A local stand-in LangGraph server answers /threads, /runs/wait, /state and
+/runs/stream after ``--latency`` seconds per run (thread and state calls
+answer at once). Each conversation sends ``--turns`` messages, and every
+message is timed:
+  - direct: one /runs/wait on a pooled keep-alive client, the floor
+  - old BFF: POST /threads, /runs/wait, GET /state on a new client per
+    message, as src/api.py did before
+  - /chat: the BFF's pooled client and known-threads cache
+  - /chat/stream: the BFF relaying /runs/stream, to its first byte and to
+    the end of the response
+
+The BFF runs in-process (driven through ASGI, so the first body chunk can
+be timed); "added" is each path's latency minus the direct call's.
+
+Usage:
+    python benchmarks/bench_bff.py [--conversations 200] [--turns 3] [--latency 0]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import httpx
+
+REPLY = {"type": "ai", "id": "m1", "content": "Hello! Could you give me your name and phone number or IBAN?"}
+VALUES = {"messages": [{"type": "human", "content": "Hi"}, REPLY], "conversation_ended": False}
+RUN_EVENTS = [
+    ("metadata", {"run_id": "run-bench"}),
+    ("updates", {"greeter": {"messages": [REPLY]}}),
+    ("updates", {"guardrail": None}),
+    ("values", VALUES),
+]
+
+
+class StandInLangGraph(BaseHTTPRequestHandler):
+    """The parts of the LangGraph API the BFF uses."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.endswith("/runs/wait"):
+            time.sleep(self.latency)
+            self._json(VALUES)
+        elif self.path.endswith("/runs/stream"):
+            time.sleep(self.latency)
+            body = "".join(f"event: {e}\ndata: {json.dumps(d)}\n\n" for e, d in RUN_EVENTS).encode()
+            self._send(body, "text/event-stream")
+        else:
+            self._json({"thread_id": "t"})
+
+    def do_GET(self):
+        self._json({"values": VALUES})
+
+    def _json(self, data):
+        self._send(json.dumps(data).encode(), "application/json")
+
+    def _send(self, body: bytes, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def old_bff_turn(base_url: str, thread_id: str, message: str) -> None:
+    """The previous /chat: three round trips on a fresh client."""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        await client.post(f"{base_url}/threads", json={"thread_id": thread_id})
+        payload = {"assistant_id": "agent", "input": {"messages": [{"role": "user", "content": message}]}}
+        response = await client.post(f"{base_url}/threads/{thread_id}/runs/wait", json=payload)
+        response.raise_for_status()
+        state = await client.get(f"{base_url}/threads/{thread_id}/state")
+        state.raise_for_status()
+
+
+async def asgi_post(app, path: str, body: dict) -> tuple:
+    """POST to an ASGI app; return (seconds to the first body chunk, seconds to the end)."""
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 8000),
+    }
+    sent = False
+    first = None
+    start = time.perf_counter()
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()  # no disconnect while the response is sent
+
+    async def send(message):
+        nonlocal first
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body" and message.get("body") and first is None:
+            first = time.perf_counter() - start
+
+    await app(scope, receive, send)
+    return first, time.perf_counter() - start
+
+
+def percentiles(samples) -> str:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return f"p50 {statistics.median(samples) * 1000:6.2f} ms | p99 {p99 * 1000:6.2f} ms"
+
+
+async def compare(base_url: str, conversations: int, turns: int):
+    from src import api
+
+    timings = {label: [] for label in ("direct", "old BFF", "/chat", "/chat/stream first byte", "/chat/stream")}
+    async with httpx.AsyncClient(base_url=base_url) as direct, api.app.router.lifespan_context(api.app):
+        payload = {"assistant_id": "agent", "input": {"messages": [{"role": "user", "content": "Hi"}]}}
+        for _ in range(conversations):
+            threads = {label: str(uuid.uuid4()) for label in timings}
+            for _ in range(turns):
+                start = time.perf_counter()
+                (await direct.post(f"/threads/{threads['direct']}/runs/wait", json=payload)).raise_for_status()
+                timings["direct"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                await old_bff_turn(base_url, threads["old BFF"], "Hi")
+                timings["old BFF"].append(time.perf_counter() - start)
+
+                _, total = await asgi_post(api.app, "/chat", {"message": "Hi", "thread_id": threads["/chat"]})
+                timings["/chat"].append(total)
+
+                first, total = await asgi_post(
+                    api.app, "/chat/stream", {"message": "Hi", "thread_id": threads["/chat/stream"]}
+                )
+                timings["/chat/stream first byte"].append(first)
+                timings["/chat/stream"].append(total)
+
+    floor = statistics.median(timings["direct"])
+    for label, samples in timings.items():
+        added = statistics.median(samples) - floor if label != "direct" else 0.0
+        print(f"{label:>24} | {percentiles(samples)} | added p50 {added * 1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in run latency (s)")
+    args = parser.parse_args()
+
+    StandInLangGraph.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInLangGraph)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    from src import api
+    api.LANGGRAPH_API_URL = base_url
+
+    print(f"{args.conversations} conversations x {args.turns} messages, stand-in run latency {args.latency * 1000:.0f} ms")
+    asyncio.run(compare(base_url, args.conversations, args.turns))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Bouncer fast path: LLM calls and latency per conversation after verification.
+
+Starts each conversation right after ``verify_answer`` returned VERIFIED and
+plays the rest through the real graph against a local fake OpenAI server
+that answers like the agents would (a ``check_account_status`` call first,
+then a reply; a handoff for a premium request) after ``--latency`` seconds:
+  - turn 1: the bouncer's reply to the verification
+  - turn 2: the customer's request (a yacht insurance quote)
+
+Customers are Lisa (Premium), John Smith (Regular) and a verified customer
+whose IBAN has no account (Non-Client). Every request to the fake server
+counts as an LLM call, guardrail calls included.
+
+Usage:
+    python benchmarks/bench_bouncer_fast_path.py [--latency 0.3] [--conversations 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+CUSTOMERS = [
+    ("Premium", {"name": "Lisa", "phone": "+1122334455", "iban": "DE89370400440532013000"}),
+    ("Regular", {"name": "John Smith", "phone": "+1234567890", "iban": "DE89370400440532013001"}),
+    ("Non-Client", {"name": "Test User", "phone": "+5550001234", "iban": "DE00000000000000000000"}),
+]
+REPLIES = {
+    "Premium": "Thank you for verifying. You are a premium client. How can I help you today?",
+    "Regular": "Thank you for verifying. You are a regular client, please call our support department at +11223344.",
+    "Non-Client": "I'm sorry, you are not a client of DEUS Bank. Please contact your bank's support department.",
+}
+SPECIALIST_REPLY = "Our Yacht & Marine Insurance team will help you. You can reach them at +9876543."
+REQUEST = "I would like to get yacht insurance for my new boat."
+
+
+def completion(message: dict) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", **message},
+            "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+    }).encode()
+
+
+def tool_call(name: str, arguments: dict) -> dict:
+    call = {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)}}
+    return {"content": None, "tool_calls": [call]}
+
+
+def answer(body: dict) -> dict:
+    """What the agent whose prompt is in ``body`` would say next."""
+    if "response_format" in body:
+        return {"content": json.dumps({"is_safe": True, "violation_reason": None, "sanitized_content": None})}
+    messages = body["messages"]
+    if "Bouncer agent" not in messages[0]["content"]:
+        return {"content": SPECIALIST_REPLY}
+    tool_results = [m["content"] for m in messages if m["role"] == "tool"]
+    status = next((r for r in reversed(tool_results) if r in REPLIES), None)
+    if status is None:
+        verified = json.loads(next(r for r in tool_results if "VERIFIED" in r))
+        return tool_call("check_account_status", {"iban": verified["user_data"]["iban"]})
+    if messages[-1]["role"] == "user" and status == "Premium":
+        return tool_call("handoff_to_specialist", {})
+    return {"content": REPLIES[status]}
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+    calls = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeOpenAI.calls += 1
+        time.sleep(self.latency)
+        payload = completion(answer(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+async def conversation(graph, customer: dict) -> None:
+    from langchain_core.messages import HumanMessage, ToolMessage
+
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    verified = json.dumps({"status": "VERIFIED", "user_data": {**customer, "secret": "?", "answer": "Yoda"}})
+    await graph.aupdate_state(config, {
+        "messages": [
+            HumanMessage(content="Yoda"),
+            ToolMessage(content=verified, name="verify_answer", tool_call_id="call_verify"),
+        ],
+        "is_verified": True,
+    }, as_node="greeter_tools")
+    await graph.ainvoke(None, config=config)
+    await graph.ainvoke({"messages": [HumanMessage(content=REQUEST)]}, config=config)
+
+
+async def measure(graph, customer: dict, conversations: int) -> tuple:
+    calls = FakeOpenAI.calls
+    start = time.perf_counter()
+    for _ in range(conversations):
+        await conversation(graph, customer)
+    return (FakeOpenAI.calls - calls) / conversations, (time.perf_counter() - start) / conversations
+
+
+async def compare(conversations: int):
+    from src.agents import bouncer
+    from src.graph.builder import build_graph
+
+    graph = build_graph()
+    await conversation(graph, CUSTOMERS[0][1])  # build the models and open connections
+    for status, customer in CUSTOMERS:
+        results = {}
+        for label, enabled in (("LLM bouncer", False), ("fast path", True)):
+            bouncer.BOUNCER_FAST_PATH_ENABLED = enabled
+            results[label] = await measure(graph, customer, conversations)
+        (old_calls, old_time), (new_calls, new_time) = results["LLM bouncer"], results["fast path"]
+        print(
+            f"{status:>10} | LLM calls {old_calls:.0f} -> {new_calls:.0f} | "
+            f"{old_time * 1000:5.0f} ms -> {new_time * 1000:5.0f} ms per conversation | "
+            f"saved {old_calls - new_calls:.0f} calls, {(old_time - new_time) * 1000:.0f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.3, help="fake model latency per call (s)")
+    parser.add_argument("--conversations", type=int, default=5)
+    args = parser.parse_args()
+
+    FakeOpenAI.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["GUARDRAIL_CACHE_ENABLED"] = "false"
+
+    print(f"fake model latency {args.latency * 1000:.0f} ms, {args.conversations} conversations per customer")
+    asyncio.run(compare(args.conversations))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
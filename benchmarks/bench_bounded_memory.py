@@ -0,0 +1,138 @@
+"""
+In-memory checkpointers: resident memory over a day of simulated traffic.
+
+Plays ``--hours`` of conversations against LangGraph's MemorySaver and
+the BoundedMemorySaver behind CHECKPOINTER_URL=memory, on a simulated
+clock. Conversations arrive evenly at ``--rate`` per hour and take
+``--turns`` turns ``--gap`` seconds apart; each turn stores the
+customer's message and the agent's reply as checkpoints (at most the last
+``--window`` messages, like a summarized conversation). A share of them
+(``--ended``) finish with ``conversation_ended``; the rest are abandoned
+mid-conversation and never come back.
+
+The bounded saver uses the configured limits (CHECKPOINT_MAX_THREADS,
+CHECKPOINT_MAX_BYTES, CHECKPOINT_IDLE_TTL, CHECKPOINT_ENDED_TTL). Each
+saver runs in a process of its own; resident memory growth is sampled
+every simulated hour.
+
+Usage:
+    python benchmarks/bench_bounded_memory.py [--hours 24] [--rate 2000] [--ended 0.6]
+"""
+
+import argparse
+import heapq
+import multiprocessing
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+TEXT = "I would like to know more about the insurance options for my new sailing yacht, please. " * 2
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def schedule(args) -> list:
+    """(time, conversation, turn, ends) for every turn, in time order."""
+    rng = random.Random(0)
+    events = []
+    for conversation in range(int(args.hours * args.rate)):
+        start = conversation * 3600 / args.rate
+        ends = rng.random() < args.ended
+        turns = args.turns if ends else rng.randint(1, args.turns - 1)
+        for turn in range(turns):
+            events.append((start + turn * args.gap, conversation, turn, ends and turn == turns - 1))
+    heapq.heapify(events)
+    return [heapq.heappop(events) for _ in range(len(events))]
+
+
+def simulate(name: str, args) -> None:
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.base import empty_checkpoint
+    from langgraph.checkpoint.base.id import uuid6
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from src.graph.checkpointer import BoundedMemorySaver
+
+    clock = Clock()
+    saver = MemorySaver() if name == "memory" else BoundedMemorySaver(clock=clock)
+    events = schedule(args)
+    conversations = {}
+    samples = []
+    baseline = rss_mb()
+    started = time.perf_counter()
+
+    for when, conversation, turn, ends in events:
+        while when >= (len(samples) + 1) * 3600:
+            samples.append(rss_mb() - baseline)
+        clock.now = when
+        thread_id = f"thread-{conversation}"
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        latest = saver.get_tuple(config)
+        messages, checkpoint, config = conversations.pop(thread_id, None) or ([], empty_checkpoint(), config)
+        if latest is not None:
+            config = latest.config
+        for message in (HumanMessage(content=TEXT), AIMessage(content=TEXT)):
+            messages = (messages + [message])[-args.window:]
+            versions = checkpoint["channel_versions"]
+            new_versions = {
+                "messages": saver.get_next_version(versions.get("messages"), None),
+                "conversation_ended": saver.get_next_version(versions.get("conversation_ended"), None),
+            }
+            checkpoint = {
+                **checkpoint,
+                "id": str(uuid6(clock_seq=turn)),
+                "channel_values": {"messages": messages, "conversation_ended": ends and isinstance(message, AIMessage)},
+                "channel_versions": {**versions, **new_versions},
+            }
+            config = saver.put(config, checkpoint, {"source": "loop", "step": turn}, new_versions)
+            saver.put_writes(config, [("messages", [message])], task_id=f"task-{turn}")
+        if not ends:
+            conversations[thread_id] = (messages, checkpoint, config)
+    samples.append(rss_mb() - baseline)
+
+    held = saver.threads if name == "bounded" else len(saver.storage)
+    hourly = " ".join(f"{mb:.0f}" for mb in samples[3::4])
+    print(f"{name:>8} | {time.perf_counter() - started:5.0f} s | {held:6d} threads held | "
+          f"peak {max(samples):5.0f} MB, end {samples[-1]:5.0f} MB", flush=True)
+    print(f"{'':>8} | growth every 4 h (MB): {hourly}", flush=True)
+    if name == "bounded":
+        print(f"{'':>8} | evictions {saver.evictions}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--rate", type=int, default=2000, help="conversations starting per hour")
+    parser.add_argument("--turns", type=int, default=4, help="turns of a conversation that ends")
+    parser.add_argument("--gap", type=float, default=30, help="seconds between a conversation's turns")
+    parser.add_argument("--ended", type=float, default=0.6, help="share of conversations that end")
+    parser.add_argument("--window", type=int, default=10, help="messages a thread keeps (summarization)")
+    args = parser.parse_args()
+
+    print(f"{args.hours:g} h at {args.rate} conversations/h, {args.ended:.0%} ended, "
+          f"{args.turns} turns {args.gap:g} s apart")
+    for name in ("memory", "bounded"):
+        process = multiprocessing.get_context("fork").Process(target=simulate, args=(name, args))
+        process.start()
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
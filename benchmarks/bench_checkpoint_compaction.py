@@ -0,0 +1,135 @@
+"""
+Checkpoint compaction: bytes stored per turn and get_state latency.
+
+Plays ``--conversations`` conversations of ``--turns`` turns through a
+graph shaped like a bot turn (await_input -> agent -> tools -> agent ->
+guardrail, one checkpoint per super-step, about 200 characters per
+message) with every checkpoint kept and every messages version stored in
+full ("full"), and with the configured compaction (CHECKPOINT_HISTORY,
+CHECKPOINT_DELTA_TAIL; "compacted"):
+  - memory: BoundedMemorySaver, bytes as it counts them
+  - sqlite: a SQLite file, bytes as the stored rows' blob sizes
+
+get_state latency is timed after every turn, so the later turns show what
+a long conversation costs to read.
+
+Usage:
+    python benchmarks/bench_checkpoint_compaction.py [--conversations 50] [--turns 20]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+TEXT = "I would like to know more about the insurance options for my new sailing yacht, please. " * 2
+
+
+def build(checkpointer):
+    from langchain_core.messages import AIMessage, ToolMessage
+    from langgraph.graph import END, START, MessagesState, StateGraph
+
+    class TurnState(MessagesState):
+        checked: bool
+
+    def agent(state):
+        if isinstance(state["messages"][-1], ToolMessage):
+            return {"messages": [AIMessage(content=TEXT)]}
+        call = {"name": "lookup", "args": {"query": TEXT[:40]}, "id": f"call_{uuid.uuid4().hex}"}
+        return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
+    def tools(state):
+        call = state["messages"][-1].tool_calls[0]
+        return {"messages": [ToolMessage(content=TEXT, name=call["name"], tool_call_id=call["id"])]}
+
+    builder = StateGraph(TurnState)
+    builder.add_node("await_input", lambda state: {})
+    builder.add_node("agent", agent)
+    builder.add_node("tools", tools)
+    builder.add_node("guardrail", lambda state: {"checked": True})
+    builder.add_edge(START, "await_input")
+    builder.add_edge("await_input", "agent")
+    builder.add_conditional_edges(
+        "agent", lambda state: "tools" if state["messages"][-1].tool_calls else "guardrail", ["tools", "guardrail"]
+    )
+    builder.add_edge("tools", "agent")
+    builder.add_edge("guardrail", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def sqlite_bytes(path: str) -> int:
+    import sqlite3
+
+    connection = sqlite3.connect(path)
+    total = sum(
+        connection.execute(query).fetchone()[0] or 0
+        for query in (
+            "SELECT SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints",
+            "SELECT SUM(LENGTH(blob)) FROM checkpoint_blobs",
+            "SELECT SUM(LENGTH(blob)) FROM checkpoint_writes",
+        )
+    )
+    connection.close()
+    return total
+
+
+def run(backend: str, compacted: bool, args, directory: str) -> None:
+    from langchain_core.messages import HumanMessage
+
+    from src.graph.checkpointer import BoundedMemorySaver, SQLCheckpointSaver
+
+    options = {} if compacted else {"history": 0, "delta_tail": 0}
+    if backend == "memory":
+        saver = BoundedMemorySaver(max_threads=0, max_bytes=0, idle_ttl=0, ended_ttl=None, **options)
+        stored = lambda: saver.bytes  # noqa: E731
+    else:
+        path = str(Path(directory) / f"checkpoints-{compacted}.db")
+        saver = SQLCheckpointSaver.sqlite(path, **options)
+        stored = lambda: sqlite_bytes(path)  # noqa: E731
+    graph = build(saver)
+
+    reads = [[] for _ in range(args.turns)]
+    started = time.perf_counter()
+    for _ in range(args.conversations):
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        for turn in range(args.turns):
+            graph.invoke({"messages": [HumanMessage(content=TEXT)]}, config)
+            began = time.perf_counter()
+            state = graph.get_state(config)
+            reads[turn].append(time.perf_counter() - began)
+            assert len(state.values["messages"]) == 4 * (turn + 1)
+    elapsed = time.perf_counter() - started
+
+    per_turn = stored() / (args.conversations * args.turns)
+    label = f"{backend} {'compacted' if compacted else 'full'}"
+    print(
+        f"{label:>17} | {per_turn / 1024:6.1f} KB stored per turn | get_state p50 turn 1 "
+        f"{statistics.median(reads[0]) * 1e6:5.0f} us, turn {args.turns} "
+        f"{statistics.median(reads[-1]) * 1e6:5.0f} us | {elapsed / (args.conversations * args.turns) * 1e3:5.2f} ms/turn",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.conversations} conversations of {args.turns} turns, 5 super-steps per turn")
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in ("memory", "sqlite"):
+            for compacted in (False, True):
+                run(backend, compacted, args, directory)
+
+
+if __name__ == "__main__":
+    main()
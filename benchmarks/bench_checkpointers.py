@@ -0,0 +1,129 @@
+"""
+Checkpointer backends: write/read latency and memory growth over simulated turns.
+
+Each simulated turn does what a graph turn does to its checkpointer: read
+the thread's latest checkpoint, then store the customer's message and the
+agent's reply, each as a new checkpoint whose ``messages`` channel has a
+new version plus a batch of pending writes against it. Messages are real LangChain
+messages (about 200 characters); like a summarized conversation, a thread
+keeps at most its last ``--window`` messages. Turns go round-robin over
+``--threads`` conversations.
+
+Each backend runs in a process of its own, so its resident memory growth is
+measured from the same baseline:
+  - memory: LangGraph's MemorySaver
+  - sqlite: a SQLite file in WAL mode (its size on disk is reported too)
+  - postgres: only with ``--postgres-url`` (needs psycopg)
+
+Usage:
+    python benchmarks/bench_checkpointers.py [--turns 100000] [--threads 1000] [--postgres-url postgresql://...]
+"""
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+TEXT = "I would like to know more about the insurance options for my new sailing yacht, please. " * 2
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def open_backend(name: str, location: str):
+    from src.graph.checkpointer import SQLCheckpointSaver, open_checkpointer
+
+    if name == "memory":
+        return open_checkpointer("memory")
+    if name == "sqlite":
+        return SQLCheckpointSaver.sqlite(location)
+    return SQLCheckpointSaver.postgres(location)
+
+
+def simulate(name: str, location: str, turns: int, threads: int, window: int) -> None:
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.base import empty_checkpoint
+    from langgraph.checkpoint.base.id import uuid6
+
+    saver = open_backend(name, location)
+    conversations = {}
+    reads, writes = [], []
+    baseline = rss_mb()
+    start = time.perf_counter()
+
+    for turn in range(turns):
+        thread_id = f"thread-{turn % threads}"
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        began = time.perf_counter()
+        latest = saver.get_tuple(config)
+        reads.append(time.perf_counter() - began)
+
+        messages, checkpoint, config = conversations.get(thread_id) or ([], empty_checkpoint(), config)
+        if latest is not None:
+            config = latest.config
+        for message in (HumanMessage(content=TEXT), AIMessage(content=TEXT)):
+            messages = (messages + [message])[-window:]
+            version = saver.get_next_version(checkpoint["channel_versions"].get("messages"), None)
+            checkpoint = {
+                **checkpoint,
+                "id": str(uuid6(clock_seq=turn)),
+                "channel_values": {"messages": messages},
+                "channel_versions": {**checkpoint["channel_versions"], "messages": version},
+            }
+            began = time.perf_counter()
+            config = saver.put(config, checkpoint, {"source": "loop", "step": turn}, {"messages": version})
+            saver.put_writes(config, [("messages", [message])], task_id=f"task-{turn}")
+            writes.append(time.perf_counter() - began)
+        conversations[thread_id] = (messages, checkpoint, config)
+
+    elapsed = time.perf_counter() - start
+    growth = rss_mb() - baseline
+    on_disk = ""
+    if name == "sqlite":
+        size = sum(p.stat().st_size for p in Path(location).parent.glob(Path(location).name + "*"))
+        on_disk = f" | on disk {size / 2**20:6.0f} MB"
+    print(
+        f"{name:>8} | {turns / elapsed:7.0f} turns/s | write p50 {statistics.median(writes) * 1e6:6.0f} us "
+        f"p99 {sorted(writes)[int(len(writes) * 0.99)] * 1e6:6.0f} us | read p50 "
+        f"{statistics.median(reads) * 1e6:6.0f} us p99 {sorted(reads)[int(len(reads) * 0.99)] * 1e6:6.0f} us | "
+        f"memory growth {growth:6.0f} MB{on_disk}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=1000, help="conversations the turns are spread over")
+    parser.add_argument("--window", type=int, default=10, help="messages a thread keeps (summarization)")
+    parser.add_argument("--postgres-url", default="")
+    args = parser.parse_args()
+
+    print(f"{args.turns} turns over {args.threads} threads, {args.window}-message window")
+    with tempfile.TemporaryDirectory() as directory:
+        backends = [("memory", ""), ("sqlite", str(Path(directory) / "checkpoints.db"))]
+        if args.postgres_url:
+            backends.append(("postgres", args.postgres_url))
+        for name, location in backends:
+            process = multiprocessing.get_context("fork").Process(
+                target=simulate, args=(name, location, args.turns, args.threads, args.window)
+            )
+            process.start()
+            process.join()
+    if not args.postgres_url:
+        print("postgres | skipped (pass --postgres-url to run it)")
+
+
+if __name__ == "__main__":
+    main()
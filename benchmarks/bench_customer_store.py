@@ -0,0 +1,81 @@
+"""
+Lookup latency: indexed CustomerStore vs. the previous linear scan.
+
+Usage:
+    python benchmarks/bench_customer_store.py [--sizes 10000 1000000 5000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+from src.utils.data import CustomerStore
+
+
+def linear_find(customers, name=None, phone=None, iban=None):
+    """The pre-index matching loop, kept here as the baseline."""
+    for customer in customers:
+        if name and customer.get("name", "").lower() != name.strip().lower():
+            continue
+        if phone and customer.get("phone", "") != phone.strip():
+            continue
+        if iban and customer.get("iban", "") != iban.strip():
+            continue
+        return customer
+    return None
+
+
+def _time_per_call(fn, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(**query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def run(size: int, lookups: int, scans: int) -> None:
+    data = synthetic.generate(size)
+    start = time.perf_counter()
+    store = CustomerStore(data)
+    build = time.perf_counter() - start
+
+    rng = random.Random(size)
+    samples = [data["customers"][rng.randrange(size)] for _ in range(lookups)]
+    queries = [
+        {"name": c["name"], "phone": c["phone"]} if i % 3 == 0 else
+        {"name": c["name"], "iban": c["iban"]} if i % 3 == 1 else
+        {"phone": c["phone"], "iban": c["iban"]}
+        for i, c in enumerate(samples)
+    ]
+
+    indexed = _time_per_call(store.find_customer, queries)
+    linear = _time_per_call(lambda **q: linear_find(data["customers"], **q), queries[:scans])
+    ibans = [c["iban"] for c in samples]
+    status = _time_per_call(lambda iban: store.is_premium(iban), [{"iban": i} for i in ibans])
+
+    print(
+        f"{size:>10,} records | build {build:7.2f}s | "
+        f"find_customer {indexed * 1e6:7.2f} us | is_premium {status * 1e6:6.2f} us | "
+        f"linear scan {linear * 1e3:9.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 5_000_000])
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--scans", type=int, default=20, help="linear-scan samples (slow)")
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.lookups, args.scans)
+
+
+if __name__ == "__main__":
+    main()
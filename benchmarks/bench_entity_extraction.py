@@ -0,0 +1,197 @@
+"""
+Greeter fast lookup: extraction hit rate and first-turn latency.
+
+A corpus of first messages is built from the customers in
+``data/customers.json`` and a set of phrasings (details in different orders
+and formats, some with fewer than two details, some with a typo):
+  - hit rate: the share of messages answered with the secret question
+    without the LLM, of all messages and of those holding two details
+  - extraction: time to pull the details out of one message
+  - first turn: each message through the real graph against a local fake
+    OpenAI server that answers like the greeter would (a ``lookup_customer``
+    call, then the secret question) after ``--latency`` seconds, with the
+    fast lookup off and on
+
+Every request to the fake server counts as an LLM call, guardrail calls included.
+
+Usage:
+    python benchmarks/bench_entity_extraction.py [--latency 0.3] [--turns 30]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# (phrasing, details it holds); {spaced} is the IBAN in groups of four.
+PHRASINGS = [
+    ("Hi, I'm {name}, my number is {phone}", 2),
+    ("Hello, my name is {name} and my IBAN is {spaced}", 2),
+    ("IBAN {iban}, phone {phone}", 2),
+    ("{name} here. Phone: {phone}, IBAN: {spaced}", 3),
+    ("hi this is {name}, you can reach me on {dashed}", 2),
+    ("my iban is {iban_lower} and my phone number is {phone}", 2),
+    ("Hello, I am {name}. {spaced} is my account.", 2),
+    ("Good morning! I'd like some help. My name is {name}, phone {dashed}.", 2),
+    ("Hi, I'm {name}", 1),
+    ("Hello, I need help with my account", 0),
+    ("I'm {name}, my number is {typo}", 2),
+]
+GREETING = "Hello! To help you, could you share your name and phone number or IBAN?"
+
+
+def corpus() -> list:
+    customers = json.loads((project_root / "data" / "customers.json").read_text())["customers"]
+    messages = []
+    for customer in customers:
+        iban, phone = customer["iban"], customer["phone"]
+        values = {
+            "name": customer["name"],
+            "phone": phone,
+            "iban": iban,
+            "iban_lower": iban.lower(),
+            "spaced": " ".join(iban[i:i + 4] for i in range(0, len(iban), 4)),
+            "dashed": f"{phone[:-7]}-{phone[-7:-4]}-{phone[-4:]}",
+            "typo": phone[:-1] + str((int(phone[-1]) + 1) % 10),
+        }
+        messages += [(template.format(**values), details) for template, details in PHRASINGS]
+    return messages
+
+
+def completion(message: dict) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", **message},
+            "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+    }).encode()
+
+
+def answer(body: dict) -> dict:
+    """What the greeter (or guardrail) would say to the conversation in ``body``."""
+    from src.utils.entities import extract_identity
+
+    if "response_format" in body:
+        return {"content": json.dumps({"is_safe": True, "violation_reason": None, "sanitized_content": None})}
+    messages = body["messages"]
+    if messages[-1]["role"] == "tool":
+        found = messages[-1]["content"]
+        if found.startswith("Customer found"):
+            return {"content": f"Thank you. Please answer this question: {found.split(': ', 1)[1]}"}
+        return {"content": "I couldn't find you with those details. Could you check them?"}
+    identity = extract_identity(messages[-1]["content"])
+    if identity.details < 2:
+        return {"content": GREETING}
+    args = {key: value for key, value in identity._asdict().items() if value is not None}
+    call = {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+            "function": {"name": "lookup_customer", "arguments": json.dumps(args)}}
+    return {"content": None, "tool_calls": [call]}
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+    calls = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeOpenAI.calls += 1
+        time.sleep(self.latency)
+        payload = completion(answer(body))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def extraction(messages: list) -> None:
+    from src.agents import greeter
+    from src.utils.entities import extract_identity
+
+    start = time.perf_counter()
+    for text, _ in messages:
+        extract_identity(text)
+    per_message = (time.perf_counter() - start) / len(messages)
+
+    hits = 0
+    eligible = sum(details >= 2 for _, details in messages)
+    for text, _ in messages:
+        result, _ = greeter._fast_path({"messages": [greeter.HumanMessage(content=text)]})
+        hits += result is not None
+    print(
+        f"{len(messages)} first messages ({eligible} with two or more details) | "
+        f"extraction {per_message * 1e6:.1f} us per message\n"
+        f"hit rate {hits / len(messages):.0%} of all messages, {hits / eligible:.0%} of those with two details"
+    )
+
+
+async def first_turns(messages: list, turns: int) -> None:
+    from langchain_core.messages import HumanMessage
+    from src.agents import greeter
+    from src.graph.builder import build_graph
+
+    graph = build_graph()
+    await graph.ainvoke({"messages": [HumanMessage(content="Hi")]},
+                        config={"configurable": {"thread_id": str(uuid.uuid4())}})  # build the models
+    eligible = [text for text, details in messages if details >= 2][:turns]
+    results = {}
+    for label, enabled in (("LLM lookup", False), ("fast lookup", True)):
+        greeter.GREETER_FAST_PATH_ENABLED = enabled
+        calls = FakeOpenAI.calls
+        start = time.perf_counter()
+        for text in eligible:
+            config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+            await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config=config)
+        results[label] = ((FakeOpenAI.calls - calls) / len(eligible), (time.perf_counter() - start) / len(eligible))
+    (old_calls, old_time), (new_calls, new_time) = results["LLM lookup"], results["fast lookup"]
+    print(
+        f"first turn, {len(eligible)} messages with two details | LLM calls {old_calls:.2f} -> {new_calls:.2f} | "
+        f"{old_time * 1000:.0f} ms -> {new_time * 1000:.0f} ms | saved {(old_time - new_time) * 1000:.0f} ms per turn"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.3, help="fake model latency per call (s)")
+    parser.add_argument("--turns", type=int, default=30, help="first turns to run through the graph per mode")
+    args = parser.parse_args()
+
+    FakeOpenAI.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["GUARDRAIL_CACHE_ENABLED"] = "false"
+
+    messages = corpus()
+    extraction(messages)
+    print(f"fake model latency {args.latency * 1000:.0f} ms")
+    asyncio.run(first_turns(messages, args.turns))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Graph topology: super-steps, checkpoint writes and framework overhead per turn.
+
+Plays five-turn conversations through the real graph with every model
+stubbed in process (answers are instant), so what a turn costs is
+LangGraph's own work: running the nodes, routing, and writing
+checkpoints. Per turn:
+  - steps: nodes run (each one a super-step; LangGraph's own __start__
+    step is not counted)
+  - puts / write batches: checkpoints and pending-write batches the
+    checkpointer receives
+  - overhead: wall time of the turn
+
+Each customer in ``data/customers.json`` says hello, gives their name and
+phone number, answers the secret question, asks about yacht insurance
+(premium customers go through the bouncer's handoff and the specialist's
+expert routing) and says thanks. Runs under each durability mode.
+
+Usage:
+    python benchmarks/bench_graph_topology.py [--conversations 300]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+TURNS = [
+    "Hello",
+    "I'm {name}, my phone number is {phone}",
+    "{answer}",
+    "I'd like to talk about insurance for my new yacht",
+    "Thank you",
+]
+
+
+def stub_models() -> None:
+    """Every agent's model answers instantly, the way the agent expects."""
+    from langchain_core.messages import AIMessage, ToolMessage
+    from langchain_core.runnables import RunnableLambda
+
+    from src.agents.guardrail import SafetyAssessment
+    from src.graph import models
+    from src.graph.config import AGENT_LLM_MODELS, AGENT_LLM_TEMPERATURES
+
+    def agent(text: str, tool: str = "", args: dict = None):
+        def answer(messages):
+            if not tool or isinstance(messages[-1], ToolMessage):
+                return AIMessage(content=text)
+            call = {"name": tool, "args": args or {}, "id": f"call_{uuid.uuid4().hex}"}
+            return AIMessage(content="", tool_calls=[call])
+
+        return RunnableLambda(answer)
+
+    models._runnables.update({
+        "greeter": agent("Welcome to DEUS Bank! Could you give me your name and phone number or IBAN?"),
+        "bouncer": agent("", "handoff_to_specialist"),
+        "specialist": agent(
+            "Our yacht insurance team will contact you shortly.", "route_to_expert", {"category": "yacht_insurance"}
+        ),
+        "guardrail": RunnableLambda(
+            lambda _: SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+        ),
+    })
+    key = (AGENT_LLM_MODELS["summarizer"], AGENT_LLM_TEMPERATURES["summarizer"])
+    models._models[key] = RunnableLambda(lambda _: AIMessage(content="The customer asked about yacht insurance."))
+
+
+def counting_saver():
+    from langgraph.checkpoint.memory import MemorySaver
+
+    class CountingSaver(MemorySaver):
+        puts = 0
+        write_batches = 0
+
+        def put(self, config, checkpoint, metadata, new_versions):
+            self.puts += 1
+            return super().put(config, checkpoint, metadata, new_versions)
+
+        def put_writes(self, config, writes, task_id, task_path=""):
+            self.write_batches += 1
+            return super().put_writes(config, writes, task_id, task_path)
+
+    return CountingSaver()
+
+
+def run(durability: str, conversations: int, customers: list) -> None:
+    from langchain_core.messages import HumanMessage
+
+    from src.graph.builder import build_graph
+
+    saver = counting_saver()
+    graph = build_graph(checkpointer=saver)
+    steps, times = [], []
+    for n in range(conversations):
+        customer = customers[n % len(customers)]
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        for turn in TURNS:
+            message = {"messages": [HumanMessage(content=turn.format(**customer))]}
+            began = time.perf_counter()
+            updates = list(graph.stream(message, config, stream_mode="updates", durability=durability))
+            times.append(time.perf_counter() - began)
+            steps.append(sum(len(update) for update in updates))
+    turns = len(times)
+    print(
+        f"{durability:>6} | {sum(steps) / turns:4.2f} steps | {saver.puts / turns:4.2f} puts | "
+        f"{saver.write_batches / turns:5.2f} write batches | overhead mean {statistics.mean(times) * 1e3:5.2f} ms, "
+        f"p50 {statistics.median(times) * 1e3:5.2f} ms per turn",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", type=int, default=300)
+    args = parser.parse_args()
+
+    stub_models()
+    customers = json.loads((project_root / "data" / "customers.json").read_text())["customers"]
+    print(f"{args.conversations} conversations of {len(TURNS)} turns, models stubbed")
+    run("async", 10, customers)  # warm up
+    for durability in ("async", "sync", "exit"):
+        run(durability, args.conversations, customers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Guardrail verdict cache: hit ratio on a reply stream and lookup overhead.
+
+Replays outgoing messages shaped like the bot's: fixed code-generated
+strings (three-strikes message), near-identical LLM replies (secret
+questions, "call +11223344" for regular clients, expert routing) that vary
+in spacing, casing and which company number they quote, and free-form
+replies that address the customer by name. Every cache miss stands for an
+LLM guardrail call.
+
+Usage:
+    python benchmarks/bench_guardrail_cache.py [--messages 100000] [--customers 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+TEMPLATES = [
+    "I'm sorry, we were unable to verify your identity after several attempts. "
+    "Please visit your nearest branch or contact our customer service to complete the verification process.",
+    "Thank you. To verify your identity, please answer: What is the name of your pet?",
+    "Thank you. To verify your identity, please answer: What city were you born in?",
+    "Thank you. To verify your identity, please answer: What is your mother's maiden name?",
+    "You are a regular client of DEUS Bank. Please call our support department at {phone} for any requests.",
+    "I have routed you to our expert team. You can reach them at {phone}.",
+    "I'm sorry, you don't appear to be a client of DEUS Bank. Please contact your bank's support department.",
+]
+FREE_FORM = [
+    "Hello {name}, you are a premium client. How can I help you today?",
+    "Thanks {name}! Could you also give me your phone number or IBAN?",
+]
+COMPANY_PHONES = ["+11223344", "+9876543", "+1999888", "+888666", "+99887766"]
+
+
+def vary(text: str, rng: random.Random) -> str:
+    """The same reply as an LLM would word it twice: spacing and casing drift."""
+    if rng.random() < 0.3:
+        text = text.replace(". ", ".  ")
+    if rng.random() < 0.2:
+        text = text.lower()
+    return text
+
+
+def stream(messages: int, customers: int, rng: random.Random):
+    for _ in range(messages):
+        if rng.random() < 0.75:
+            text = rng.choice(TEMPLATES).format(phone=rng.choice(COMPANY_PHONES))
+        else:
+            name = synthetic.customer(rng.randrange(customers))["name"].split()[0]
+            text = rng.choice(FREE_FORM).format(name=name)
+        yield vary(text, rng)
+
+
+def replay(cache_factory, replies) -> tuple:
+    from src.agents import guardrail
+    from src.agents.guardrail import SafetyAssessment
+
+    verdict = SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+    guardrail._verdict_cache = cache_factory()
+    misses = 0
+    start = time.perf_counter()
+    for text in replies:
+        key, cached = guardrail._cached(text)
+        if cached is None:
+            misses += 1
+            guardrail._remember(key, verdict)
+    elapsed = time.perf_counter() - start
+    guardrail._verdict_cache.close()
+    return misses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, default=5000)
+    args = parser.parse_args()
+
+    from src.agents.guardrail import normalize_response
+    from src.utils.ttl_cache import TTLCache
+
+    replies = list(stream(args.messages, args.customers, random.Random(0)))
+    print(f"{args.messages:,} outgoing replies, {args.customers:,} customer names")
+    print(
+        f"distinct texts: {len(set(replies)):,} exact, "
+        f"{len(set(map(normalize_response, replies))):,} after normalization"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "verdicts.db")
+        for label, factory in (
+            ("memory", lambda: TTLCache(10_000, 86_400)),
+            ("memory + sqlite", lambda: TTLCache(10_000, 86_400, path)),
+            ("after restart", lambda: TTLCache(10_000, 86_400, path)),
+        ):
+            misses, elapsed = replay(factory, replies)
+            saved = args.messages - misses
+            print(
+                f"{label:>16} | LLM calls {misses:6,} | saved {saved / args.messages:7.2%} | "
+                f"{elapsed / args.messages * 1e6:5.1f} us per reply"
+            )
+
+
+if __name__ == "__main__":
+    main()
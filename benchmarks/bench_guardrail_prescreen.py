@@ -0,0 +1,74 @@
+"""
+Guardrail pre-screen: how many responses skip the LLM, and at what cost.
+
+Screens every response the integration tests send to ``validate_response``
+(tests/integration/test_guardrail_effectiveness.py), labelled safe or
+unsafe by the test class they appear in, and reports:
+  - the fraction decided without the LLM
+  - decisions that contradict the expected label (must be zero)
+  - time per screen
+
+Usage:
+    python benchmarks/bench_guardrail_prescreen.py [--repeat 20000]
+"""
+
+import argparse
+import ast
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+CORPUS = project_root / "tests" / "integration" / "test_guardrail_effectiveness.py"
+
+
+def corpus():
+    """(response, expected is_safe) for every validate_response call in the integration tests."""
+    tree = ast.parse(CORPUS.read_text())
+    for test_class in tree.body:
+        if not isinstance(test_class, ast.ClassDef):
+            continue
+        expected_safe = test_class.name.startswith("TestSafe")
+        for node in ast.walk(test_class):
+            if (
+                isinstance(node, ast.Call)
+                and getattr(node.func, "id", None) == "validate_response"
+                and isinstance(node.args[0], ast.Constant)
+            ):
+                yield node.args[0].value, expected_safe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    from src.agents.guardrail import NEEDS_LLM, SAFE, prescreen
+
+    responses = list(corpus())
+    decided = wrong = 0
+    for text, expected_safe in responses:
+        decision, reason = prescreen(text)
+        if decision != NEEDS_LLM:
+            decided += 1
+            wrong += (decision == SAFE) != expected_safe
+        print(f"{decision:>9} | {'safe' if expected_safe else 'unsafe':>6} | {text[:70]}")
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text, _ in responses:
+            prescreen(text)
+    per_screen = (time.perf_counter() - start) / (args.repeat * len(responses))
+
+    print(
+        f"\n{decided}/{len(responses)} responses ({decided / len(responses):.0%}) skip the LLM, "
+        f"{wrong} contradict the expected verdict, {per_screen * 1e6:.1f} us per screen"
+    )
+
+
+if __name__ == "__main__":
+    main()
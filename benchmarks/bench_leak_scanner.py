@@ -0,0 +1,100 @@
+"""
+Leak scanner: build cost, memory, scan throughput and incremental updates.
+
+Builds ``LeakScanner`` over a synthetic customer file (three patterns per
+customer: full name, phone, IBAN) and reports:
+  - build time and memory held by the automaton
+  - scan throughput in MB/s over bot-like replies, clean and with leaks
+  - updating after a reload that adds 1% new customers vs a full rebuild
+
+Usage:
+    python benchmarks/bench_leak_scanner.py [--customers 1000000] [--replies 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+CLEAN = [
+    "Thank you. To verify your identity, please answer: What is the name of your pet?",
+    "You are a regular client of DEUS Bank. Please call our support department at +11223344 for any requests.",
+    "I have routed you to our expert team. You can reach them at +99887766. Is there anything else, {first}?",
+    "I'm sorry, I cannot approve loans or set interest rates. A specialist can discuss your options.",
+]
+LEAKING = [
+    "Dear {name}, we have your phone number {phone} on file.",
+    "The transfer to IBAN {iban} was received.",
+]
+
+
+def replies(count: int, customers: int, leak_rate: float, rng: random.Random):
+    for _ in range(count):
+        record = synthetic.customer(rng.randrange(customers))
+        template = rng.choice(LEAKING if rng.random() < leak_rate else CLEAN)
+        yield template.format(first=record["name"].split()[0], **record)
+
+
+def throughput(scanner, texts) -> tuple:
+    size = sum(len(text.encode("utf-8")) for text in texts)
+    start = time.perf_counter()
+    leaks = sum(len(scanner.scan(text)) for text in texts)
+    elapsed = time.perf_counter() - start
+    return size / elapsed / 1e6, elapsed / len(texts), leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--replies", type=int, default=20_000)
+    args = parser.parse_args()
+
+    from src.utils.data import CustomerStore
+    from src.utils.leaks import LeakScanner
+
+    grown = args.customers + args.customers // 100
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customers.json")
+        synthetic.write_json(path, args.customers)
+        store = CustomerStore.from_json(path)
+        synthetic.write_json(path, grown)
+        reloaded = CustomerStore.from_json(path)
+
+    start = time.perf_counter()
+    scanner = LeakScanner.build(store)
+    build = time.perf_counter() - start
+    print(
+        f"{args.customers:,} customers, {scanner.patterns:,} patterns: built in {build:.1f}s, "
+        f"{scanner.nbytes / 1e6:.0f} MB"
+    )
+
+    rng = random.Random(0)
+    for label, leak_rate in (("clean replies", 0.0), ("10% leaking", 0.1)):
+        texts = list(replies(args.replies, args.customers, leak_rate, rng))
+        mb_per_s, per_reply, leaks = throughput(scanner, texts)
+        print(f"{label:>14} | {mb_per_s:5.2f} MB/s | {per_reply * 1e6:6.1f} us per reply | {leaks:,} leaks")
+
+    start = time.perf_counter()
+    updated = scanner.updated(reloaded)
+    update = time.perf_counter() - start
+    start = time.perf_counter()
+    LeakScanner.build(reloaded)
+    rebuild = time.perf_counter() - start
+    print(
+        f"reload adding {grown - args.customers:,} customers: incremental update {update:.1f}s "
+        f"({updated.delta_patterns:,} delta patterns) vs full rebuild {rebuild:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Load time and memory: json.load loader vs. the streaming columnar store.
+
+Each loader runs in a fresh interpreter so peak RSS is measured in isolation.
+
+Usage:
+    python benchmarks/bench_loader.py [--records 1000000] [--file customers.json]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+LOADERS = ("json.load", "streaming")
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def child(loader: str, path: str) -> None:
+    """Run one loader and print its measurements as JSON."""
+    from src.utils.data import CustomerStore
+
+    baseline = _current_rss_mb()
+    start = time.perf_counter()
+    if loader == "json.load":
+        with open(path) as f:
+            data = json.load(f)
+    else:
+        data = CustomerStore.from_json(path)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "load_s": elapsed,
+        "peak_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - baseline,
+        "retained_mb": _current_rss_mb() - baseline,
+    }))
+    del data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--file", help="existing customers JSON (skips generation)")
+    parser.add_argument("--child", choices=LOADERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.file)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "customers.json")
+            synthetic.write_json(path, args.records)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{path}: {size_mb:.0f} MB")
+
+        for loader in LOADERS:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", loader, "--file", path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(
+                f"{loader:>10} | load {result['load_s']:6.2f}s | "
+                f"peak +{result['peak_mb']:7.0f} MB | retained +{result['retained_mb']:7.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
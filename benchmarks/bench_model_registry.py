@@ -0,0 +1,120 @@
+"""
+Per-turn model overhead: fresh ChatOpenAI per call vs the model registry.
+
+Before, every agent turn built a ChatOpenAI and converted its tool schemas
+again; the registry does that once per process. Both variants run real
+invocations against a local fake OpenAI server, so the numbers are
+client-side overhead plus loopback HTTP. (langchain-openai already shares a
+default HTTP pool between instances; the registry's own pool mainly adds a
+keep-alive expiry longer than the gap between user turns, which against the
+real API saves a DNS lookup and TLS handshake per turn.)
+
+Usage:
+    python benchmarks/bench_model_registry.py [--turns 300]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "Hello, how can I help you?"},
+        "finish_reason": "stop",
+    }],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+}).encode()
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """Answers every chat completion instantly, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = set()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        FakeOpenAI.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(turns: int, turn):
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        turn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return statistics.median(samples) * 1e3, samples[int(len(samples) * 0.99)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=300)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+    from langchain_core.messages import HumanMessage, SystemMessage
+    from langchain_openai import ChatOpenAI
+
+    from src.agents.greeter import SYSTEM_PROMPT
+    from src.graph import models
+    from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+    from src.tools.greeter_tools import lookup_customer, verify_answer
+
+    messages = [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content="Hi, I'm Lisa")]
+    tools = [lookup_customer, verify_answer]
+
+    def build_only():
+        ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE).bind_tools(tools)
+
+    def fresh_turn():
+        ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE).bind_tools(tools).invoke(messages)
+
+    def registry_turn():
+        models.get_runnable("greeter", lambda model: model.bind_tools(tools)).invoke(messages)
+
+    registry_turn()  # first turn builds the runnable and opens the connection
+    print(f"{args.turns} greeter turns against a local fake OpenAI endpoint")
+    p50, p99 = timed(args.turns, build_only)
+    print(f"{'ChatOpenAI + bind_tools only':>30} | p50 {p50:6.2f} ms | p99 {p99:6.2f} ms")
+    for label, turn in (("fresh model per turn", fresh_turn), ("model registry", registry_turn)):
+        FakeOpenAI.connections.clear()
+        p50, p99 = timed(args.turns, turn)
+        print(
+            f"{label:>30} | p50 {p50:6.2f} ms | p99 {p99:6.2f} ms | "
+            f"{len(FakeOpenAI.connections)} TCP connections"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
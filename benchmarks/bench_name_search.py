@@ -0,0 +1,107 @@
+"""
+Fuzzy name matching: latency and index memory at scale.
+
+Measures the two fuzzy paths:
+  - find_customer with a misspelt name plus the exact phone (the fallback the
+    greeter tools hit; compares only rows sharing that phone, no index)
+  - search_names, ranked candidates from the trigram inverted index
+
+Usage:
+    python benchmarks/bench_name_search.py [--records 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Drop, double or swap one letter of the first name."""
+    first, rest = name.split(" ", 1)
+    i = rng.randrange(1, len(first))
+    edit = rng.choice(("drop", "double", "swap"))
+    if edit == "drop":
+        first = first[:i] + first[i + 1:]
+    elif edit == "double":
+        first = first[:i] + first[i] + first[i:]
+    else:
+        first = first[:i - 1] + first[i] + first[i - 1] + first[i + 1:]
+    return f"{first} {rest}"
+
+
+def _current_rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    from src.utils.data import CustomerStore
+
+    store = CustomerStore(synthetic.generate(args.records))
+    rng = random.Random(0)
+    targets = [synthetic.customer(rng.randrange(args.records)) for _ in range(args.queries)]
+    queries = [(misspell(customer["name"], rng), customer) for customer in targets]
+
+    latencies, hits = [], 0
+    for name, customer in queries:
+        start = time.perf_counter()
+        found = store.find_customer(name=name, phone=customer["phone"])
+        latencies.append(time.perf_counter() - start)
+        hits += found is not None and found["phone"] == customer["phone"]
+    p50, p99 = percentiles(latencies)
+    print(f"{args.records:,} customers")
+    print(f"find_customer(misspelt name, phone) | p50 {p50:7.1f} us | p99 {p99:7.1f} us | matched {hits / len(queries):.1%}")
+
+    rss = _current_rss_mb()
+    start = time.perf_counter()
+    store.search_names("warm up")
+    build = time.perf_counter() - start
+    index = store._name_trigrams
+    print(
+        f"trigram index | build {build:.1f}s | {len(index._ids):,} grams | "
+        f"{index.nbytes / 2**20:.0f} MB held | RSS +{_current_rss_mb() - rss:.0f} MB"
+    )
+
+    latencies, hits = [], 0
+    for name, customer in queries:
+        start = time.perf_counter()
+        results = store.search_names(name, limit=5)
+        latencies.append(time.perf_counter() - start)
+        hits += bool(results) and results[0][1]["phone"] == customer["phone"]
+    p50, p99 = percentiles(latencies)
+    print(f"search_names(misspelt name)         | p50 {p50:7.1f} us | p99 {p99:7.1f} us | top-1 {hits / len(queries):.1%}")
+
+    latencies = []
+    for customer in targets[:200]:
+        first_last = " ".join(customer["name"].split()[:2])
+        start = time.perf_counter()
+        store.search_names(misspell(first_last, rng), limit=5)
+        latencies.append(time.perf_counter() - start)
+    p50, p99 = percentiles(latencies)
+    print(f"search_names(common first+last)     | p50 {p50:7.1f} us | p99 {p99:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Cold-start time: building the store from JSON vs. opening a binary snapshot.
+
+Each mode runs in a fresh interpreter and includes the first lookup.
+
+Usage:
+    python benchmarks/bench_startup.py [--records 1000000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+MODES = {
+    "json": "stream the JSON and build every index",
+    "snapshot": "mmap a current snapshot (size+mtime match)",
+    "snapshot+checksum": "mmap after verifying the JSON checksum (mtime changed)",
+}
+
+
+def child(mode: str, json_path: str, snapshot_path: str) -> None:
+    from src.utils.data import CustomerStore
+    from src.utils.snapshot import open_or_build
+
+    if mode == "snapshot+checksum":
+        stat = os.stat(json_path)
+        os.utime(json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    start = time.perf_counter()
+    if mode == "json":
+        store = CustomerStore.from_json(json_path)
+    else:
+        store = open_or_build(json_path, snapshot_path)
+    customer = synthetic.customer(len(store) // 2)
+    assert store.find_customer(name=customer["name"], iban=customer["iban"]) is not None
+    print(json.dumps({"seconds": time.perf_counter() - start}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    from src.utils.snapshot import build_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "customers.json")
+        snapshot_path = os.path.join(tmp, "customers.snapshot")
+        synthetic.write_json(json_path, args.records)
+        start = time.perf_counter()
+        build_snapshot(json_path, snapshot_path)
+        print(
+            f"{args.records:,} customers | JSON {os.path.getsize(json_path) / 2**20:.0f} MB | "
+            f"snapshot {os.path.getsize(snapshot_path) / 2**20:.0f} MB built in {time.perf_counter() - start:.1f}s"
+        )
+
+        for mode, description in MODES.items():
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, json_path, snapshot_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            seconds = json.loads(output)["seconds"]
+            print(f"{mode:>18} | {seconds * 1000:10.1f} ms | {description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Time to first token and total latency: blocking turn vs sentence streaming.
+
+Runs first turns through the real graph against a local fake OpenAI server
+that streams its reply word by word (first token after ``--first-token``,
+then one word every ``--per-token``) or answers in one piece when not asked
+to stream. The greeter's reply is four sentences, one of which the rule
+pre-screen cannot decide, so it costs an LLM guardrail call both as a chunk
+and as part of the whole reply.
+
+"blocking" is ``graph.ainvoke``, what ``/chat`` waits for; "stream" is
+``stream_turn``, what ``/chat/stream`` sends, timed to the first ``delta``
+and to ``done``.
+
+Usage:
+    python benchmarks/bench_streaming.py [--turns 20] [--first-token 0.3] [--per-token 0.02]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+REPLY = (
+    "Hello and welcome to DEUS Bank! "
+    "I am the assistant that helps you with your accounts today. "
+    "Please note that I cannot set interest rates, but our specialists can. "
+    "Could you give me your name and your phone number or IBAN?"
+)
+VERDICT = json.dumps({"is_safe": True, "violation_reason": None, "sanitized_content": None})
+
+
+def completion(content: str) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+    }).encode()
+
+
+def stream_chunk(delta: dict, finish_reason=None) -> bytes:
+    chunk = {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return b"data: " + json.dumps(chunk).encode() + b"\n\n"
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    """Chat completions: the guardrail gets a verdict, agents ``REPLY``, streamed when asked."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    first_token = 0.3
+    per_token = 0.02
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        content = VERDICT if "response_format" in body else REPLY
+        time.sleep(self.first_token)
+        if not body.get("stream"):
+            # A blocking call still waits for every token to be generated.
+            time.sleep(self.per_token * (len(content.split()) - 1))
+            payload = completion(content)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = [content] if content is VERDICT else content.split(" ")
+        parts = [stream_chunk({"role": "assistant", "content": ""})]
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.per_token)
+            parts.append(stream_chunk({"content": word if i == 0 else " " + word}))
+            self._write_chunk(b"".join(parts))
+            parts = []
+        self._write_chunk(stream_chunk({}, "stop") + b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+async def blocking_turn(graph) -> tuple:
+    from langchain_core.messages import HumanMessage
+
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    start = time.perf_counter()
+    await graph.ainvoke({"messages": [HumanMessage(content="Hi")]}, config=config)
+    total = time.perf_counter() - start
+    return total, total
+
+
+async def streamed_turn(graph) -> tuple:
+    from src.graph.streaming import stream_turn
+
+    start = time.perf_counter()
+    first = None
+    async for event, data in stream_turn(graph, "Hi", str(uuid.uuid4())):
+        if event == "delta" and first is None:
+            first = time.perf_counter() - start
+        if event == "done":
+            assert data["response"] == REPLY, data
+    return first, time.perf_counter() - start
+
+
+async def compare(graph, turns: int):
+    await blocking_turn(graph)  # build the models and open connections
+    for label, turn in (("blocking", blocking_turn), ("stream", streamed_turn)):
+        timings = [await turn(graph) for _ in range(turns)]
+        first = statistics.median(t[0] for t in timings)
+        total = statistics.median(t[1] for t in timings)
+        print(f"{label:>9} | first text p50 {first * 1000:6.0f} ms | total p50 {total * 1000:6.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--first-token", type=float, default=0.3, help="fake model latency to the first token (s)")
+    parser.add_argument("--per-token", type=float, default=0.02, help="fake model time per further token (s)")
+    args = parser.parse_args()
+
+    FakeOpenAI.first_token = args.first_token
+    FakeOpenAI.per_token = args.per_token
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["GUARDRAIL_CACHE_ENABLED"] = "false"
+
+    from src.graph.builder import build_graph
+
+    print(
+        f"fake model: first token {args.first_token * 1000:.0f} ms, "
+        f"{args.per_token * 1000:.0f} ms per further token, {len(REPLY.split())}-word reply"
+    )
+    asyncio.run(compare(build_graph(), args.turns))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Greeter verification: LLM calls per successful verification.
+
+Plays verification conversations through the real graph against a local
+fake OpenAI server that answers like the greeter would (asks for missing
+details, calls ``lookup_customer`` once it has two, asks the secret
+question, calls ``verify_answer`` with the answer) after ``--latency``
+seconds, with the greeter's fast path off (the LLM drives every step) and
+on (the state machine in src/graph/verification.py drives them):
+  - one message: all details at once, then the answer
+  - split details: a greeting, the name, the phone number, then the answer
+  - answer in a sentence: "It's <answer>"
+  - one wrong answer: a wrong one-word answer, then the right one
+
+Conversations use the customers in ``data/customers.json``. Every request
+to the fake server counts as an LLM call, guardrail calls included;
+"greeter" counts only the greeter's. Each conversation ends verified.
+
+Usage:
+    python benchmarks/bench_verification.py [--latency 0.3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+SCENARIOS = {
+    "one message": ["Hi, I'm {name}, my phone number is {phone}", "{answer}"],
+    "split details": ["Hello", "I'm {name}", "my phone number is {phone}", "{answer}"],
+    "answer in a sentence": ["Hi, I'm {name}, my phone number is {phone}", "It's {answer}"],
+    "one wrong answer": ["Hi, I'm {name}, my phone number is {phone}", "Nope", "{answer}"],
+}
+
+
+def completion(message: dict) -> bytes:
+    return json.dumps({
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", **message},
+            "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+        }],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 7, "total_tokens": 17},
+    }).encode()
+
+
+def tool_call(name: str, arguments: dict) -> dict:
+    call = {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)}}
+    return {"content": None, "tool_calls": [call]}
+
+
+def greeter_answer(messages: list) -> dict:
+    """What a well-behaved greeter LLM says next."""
+    from src.utils.entities import extract_identity
+
+    last = messages[-1]
+    if last["role"] == "tool":
+        if last["content"].startswith("Customer found"):
+            return {"content": f"Thanks! Please answer: {last['content'].split(': ', 1)[1]}"}
+        if last["content"] == "Incorrect answer":
+            return {"content": "That is not correct, please try again."}
+        return {"content": "I could not find you, could you check your details?"}
+
+    lookups = [
+        json.loads(call["function"]["arguments"])
+        for m in messages if m["role"] == "assistant"
+        for call in m.get("tool_calls") or [] if call["function"]["name"] == "lookup_customer"
+    ]
+    if any(m["role"] == "tool" and m["content"].startswith("Customer found") for m in messages):
+        answer = re.sub(r"^(?:it's|it is|my answer is)\s+", "", last["content"].strip(), flags=re.IGNORECASE)
+        return tool_call("verify_answer", {"answer": answer, **lookups[-1]})
+
+    identity = {}
+    for m in messages:
+        if m["role"] == "user":
+            identity.update({k: v for k, v in extract_identity(m["content"])._asdict().items() if v})
+    if len(identity) >= 2:
+        return tool_call("lookup_customer", identity)
+    return {"content": "Welcome to DEUS Bank! Could you give me your name and phone number or IBAN?"}
+
+
+class FakeOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.3
+    calls = 0
+    greeter_calls = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        FakeOpenAI.calls += 1
+        time.sleep(self.latency)
+        if "response_format" in body:
+            message = {"content": json.dumps({"is_safe": True, "violation_reason": None, "sanitized_content": None})}
+        elif "Greeter agent" in body["messages"][0]["content"]:
+            FakeOpenAI.greeter_calls += 1
+            message = greeter_answer(body["messages"])
+        else:
+            message = {"content": "Thank you for verifying. How can I help you today?"}
+        payload = completion(message)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+async def conversation(graph, turns: list) -> bool:
+    from langchain_core.messages import HumanMessage
+
+    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+    state = {}
+    for text in turns:
+        state = await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config=config)
+    return state.get("is_verified", False)
+
+
+async def compare(customers: list):
+    from src.agents import greeter
+    from src.graph.builder import build_graph
+
+    graph = build_graph()
+    await conversation(graph, ["Hi"])  # build the models and open connections
+    totals = {}
+    for scenario, template in SCENARIOS.items():
+        results = {}
+        for label, enabled in (("LLM steps", False), ("state machine", True)):
+            greeter.GREETER_FAST_PATH_ENABLED = enabled
+            calls, greeter_calls = FakeOpenAI.calls, FakeOpenAI.greeter_calls
+            start = time.perf_counter()
+            for customer in customers:
+                turns = [turn.format(**customer) for turn in template]
+                assert await conversation(graph, turns), (label, turns)
+            results[label] = (
+                (FakeOpenAI.greeter_calls - greeter_calls) / len(customers),
+                (FakeOpenAI.calls - calls) / len(customers),
+                (time.perf_counter() - start) / len(customers),
+            )
+            totals.setdefault(label, []).append(results[label])
+        (old_greeter, old_calls, old_time), (new_greeter, new_calls, new_time) = results.values()
+        print(
+            f"{scenario:>21} | greeter LLM calls {old_greeter:.2f} -> {new_greeter:.2f} | "
+            f"all LLM calls {old_calls:.2f} -> {new_calls:.2f} | {old_time * 1000:5.0f} ms -> {new_time * 1000:5.0f} ms"
+        )
+    (old, new) = ([sum(r[i] for r in totals[label]) / len(SCENARIOS) for i in range(3)] for label in totals)
+    print(
+        f"{'mean per verification':>21} | greeter LLM calls {old[0]:.2f} -> {new[0]:.2f} | "
+        f"all LLM calls {old[1]:.2f} -> {new[1]:.2f} | {old[2] * 1000:5.0f} ms -> {new[2] * 1000:5.0f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.3, help="fake model latency per call (s)")
+    args = parser.parse_args()
+
+    FakeOpenAI.latency = args.latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAI)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ["GUARDRAIL_CACHE_ENABLED"] = "false"
+
+    customers = json.loads((project_root / "data" / "customers.json").read_text())["customers"]
+    print(f"fake model latency {args.latency * 1000:.0f} ms, {len(customers)} customers per scenario")
+    asyncio.run(compare(customers))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
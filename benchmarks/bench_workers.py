@@ -0,0 +1,112 @@
+"""
+Total memory of N worker processes holding the customer index.
+
+"private" is every worker building its own in-memory store from JSON (what a
+multi-worker deployment does without snapshots); "shared" is every worker
+attaching to one snapshot published to /dev/shm. Each worker performs
+lookups over the whole key space so the index pages are actually touched,
+then the parent sums RSS and PSS (proportional set size: shared pages are
+divided among the processes mapping them) from /proc/<pid>/smaps_rollup.
+
+Usage:
+    python benchmarks/bench_workers.py [--records 200000] [--workers 1 4 16]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+
+LOOKUPS = 20_000
+
+
+def worker(mode, json_path, snapshot_path, records, ready, done):
+    from src.utils.data import CustomerStore
+    from src.utils.snapshot import attach_snapshot
+
+    if mode == "private":
+        store = CustomerStore.from_json(json_path)
+    elif mode == "shared":
+        store = attach_snapshot(snapshot_path, timeout=0)
+    else:
+        store = None
+
+    if store is not None:
+        rng = random.Random(os.getpid())
+        for _ in range(LOOKUPS):
+            customer = synthetic.customer(rng.randrange(records))
+            assert store.find_customer(name=customer["name"], phone=customer["phone"]) is not None
+            store.is_premium(customer["iban"])
+    ready.release()
+    done.wait()
+
+
+def memory_kb(pid: int) -> dict:
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Rss", "Pss"):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def measure(mode, workers, json_path, snapshot_path, records):
+    # spawn: every worker starts from a fresh interpreter, like uvicorn workers.
+    context = multiprocessing.get_context("spawn")
+    ready = context.Semaphore(0)
+    done = context.Event()
+    processes = [
+        context.Process(target=worker, args=(mode, json_path, snapshot_path, records, ready, done))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.acquire()
+
+    totals = {"Rss": 0, "Pss": 0}
+    for process in processes:
+        for key, value in memory_kb(process.pid).items():
+            totals[key] += value
+    done.set()
+    for process in processes:
+        process.join()
+    return totals["Rss"] / 1024, totals["Pss"] / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    from src.utils.snapshot import build_snapshot
+
+    shm = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory(dir=shm) as shared:
+        json_path = Path(tmp) / "customers.json"
+        snapshot_path = Path(shared) / "customers.snapshot"
+        synthetic.write_json(json_path, args.records)
+        build_snapshot(json_path, snapshot_path)
+        print(f"{args.records} customers, snapshot {snapshot_path.stat().st_size / 2**20:.0f} MB in {shared}")
+
+        print(f"{'mode':<10}{'workers':>8}{'total RSS MB':>14}{'total PSS MB':>14}{'PSS/worker':>12}")
+        for workers in args.workers:
+            for mode in ("baseline", "private", "shared"):
+                rss, pss = measure(mode, workers, json_path, snapshot_path, args.records)
+                print(f"{mode:<10}{workers:>8}{rss:>14.0f}{pss:>14.0f}{pss / workers:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Write-behind checkpoints: turn latency and database write rate.
+
+Plays ``--conversations`` five-turn conversations through the real graph
+(models stubbed, see bench_graph_topology.py), ``--concurrency`` at a time
+on one event loop like the API, against a SQLite checkpointer whose
+connections wait ``--db-latency`` ms on every statement and commit, like
+a database across the network:
+  - sql: SQLCheckpointSaver, each checkpoint and task's writes its own
+    transaction, under GRAPH_DURABILITY "sync" and "async"
+  - write-behind: the same saver behind WriteBehindSaver, flushed at the
+    end of every turn as the API does (CHECKPOINT_FLUSH_INTERVAL,
+    CHECKPOINT_FLUSH_BATCH)
+
+Per run: turn latency (the reply's wait, flush included), write
+transactions and statements per second of wall time and per turn, and the
+checkpoints left in the database.
+
+Usage:
+    python benchmarks/bench_write_behind.py [--conversations 60] [--concurrency 8] [--db-latency 1]
+"""
+
+import argparse
+import asyncio
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).resolve().parents[1]
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from benchmarks.bench_graph_topology import TURNS, stub_models  # noqa: E402
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+class Counts:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.transactions = 0
+        self.statements = 0
+
+
+class RemoteConnection:
+    """A SQLite connection that waits ``latency`` seconds per statement and commit, counting writes."""
+
+    def __init__(self, connection: sqlite3.Connection, latency: float, counts: Counts):
+        self._connection = connection
+        self._latency = latency
+        self._counts = counts
+        self._writes = 0
+
+    def cursor(self):
+        cursor = self._connection.cursor()
+        outer = self
+
+        class Cursor:
+            def execute(self, query, params=()):
+                outer._statement(query)
+                return cursor.execute(query, params)
+
+            def executemany(self, query, rows):
+                outer._statement(query)
+                return cursor.executemany(query, rows)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+        return Cursor()
+
+    def _statement(self, query: str) -> None:
+        time.sleep(self._latency)
+        if query.lstrip().upper().startswith(WRITES):
+            self._writes += 1
+
+    def commit(self):
+        time.sleep(self._latency)
+        self._connection.commit()
+        if self._writes:
+            with self._counts.lock:
+                self._counts.transactions += 1
+                self._counts.statements += self._writes
+        self._writes = 0
+
+    def rollback(self):
+        self._writes = 0
+        self._connection.rollback()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def open_saver(path: str, latency: float, counts: Counts):
+    from src.graph.checkpointer import SQLITE, ConnectionPool, SQLCheckpointSaver
+    from src.graph.config import CHECKPOINT_POOL_SIZE
+
+    def connect():
+        connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return RemoteConnection(connection, latency, counts)
+
+    return SQLCheckpointSaver(ConnectionPool(connect, CHECKPOINT_POOL_SIZE), SQLITE)
+
+
+async def conversation(graph, customer: dict, durability: str, times: list) -> None:
+    from langchain_core.messages import HumanMessage
+
+    from src.graph.checkpointer import aflush_checkpoints
+
+    thread_id = str(uuid.uuid4())
+    config = {"configurable": {"thread_id": thread_id}}
+    for turn in TURNS:
+        began = time.perf_counter()
+        await graph.ainvoke({"messages": [HumanMessage(content=turn.format(**customer))]}, config, durability=durability)
+        await aflush_checkpoints(graph.checkpointer, thread_id)
+        times.append(time.perf_counter() - began)
+
+
+async def play(graph, customers: list, durability: str, args, times: list) -> None:
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(n):
+        async with slots:
+            await conversation(graph, customers[n % len(customers)], durability, times)
+
+    await asyncio.gather(*(one(n) for n in range(args.conversations)))
+
+
+def run(label: str, durability: str, write_behind: bool, customers: list, args, directory: str) -> None:
+    from src.graph.builder import build_graph
+    from src.graph.checkpointer import WriteBehindSaver
+
+    path = str(Path(directory) / f"{label}-{durability}.db")
+    counts = Counts()
+    saver = open_saver(path, args.db_latency / 1e3, counts)
+    if write_behind:
+        saver = WriteBehindSaver(saver)
+    graph = build_graph(checkpointer=saver)
+    counts.transactions = counts.statements = 0  # not the schema
+
+    times: list = []
+    started = time.perf_counter()
+    asyncio.run(play(graph, customers, durability, args, times))
+    elapsed = time.perf_counter() - started
+    saver.close()
+
+    with sqlite3.connect(path) as connection:
+        stored = connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+    turns = len(times)
+    times.sort()
+    print(
+        f"{label:>12} {durability:>5} | turn p50 {statistics.median(times) * 1e3:6.2f} ms, "
+        f"p95 {times[int(turns * 0.95)] * 1e3:6.2f} ms | {counts.transactions / elapsed:6.0f} write tx/s "
+        f"({counts.transactions / turns:4.2f}/turn), {counts.statements / elapsed:6.0f} statements/s "
+        f"({counts.statements / turns:5.2f}/turn) | {turns / elapsed:5.0f} turns/s | {stored} checkpoints stored",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=8, help="conversations in flight at once")
+    parser.add_argument("--db-latency", type=float, default=1.0, help="ms per statement and per commit")
+    args = parser.parse_args()
+
+    stub_models()
+    customers = json.loads((project_root / "data" / "customers.json").read_text())["customers"]
+    print(
+        f"{args.conversations} conversations of {len(TURNS)} turns, {args.concurrency} at a time, "
+        f"{args.db_latency:g} ms per statement, models stubbed"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for label, durability, write_behind in (
+            ("sql", "sync", False),
+            ("sql", "async", False),
+            ("write-behind", "async", True),
+        ):
+            run(label, durability, write_behind, customers, args, directory)
+
+
+if __name__ == "__main__":
+    main()
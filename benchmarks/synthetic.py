@@ -0,0 +1,59 @@
+"""
+Synthetic customer data for benchmarks.
+
+Generates records shaped like ``data/customers.json`` at arbitrary scale,
+deterministically, so benchmark runs are comparable.
+"""
+
+import json
+import random
+
+SECRETS = [
+    ("What is the name of your pet?", ["Yoda", "Rex", "Bella", "Max", "Luna"]),
+    ("What city were you born in?", ["Berlin", "Madrid", "Paris", "Rome", "Lisbon"]),
+    ("What is your mother's maiden name?", ["Rodriguez", "Smith", "Muller", "Rossi", "Silva"]),
+]
+
+FIRST_NAMES = ["Lisa", "John", "Maria", "Ahmed", "Yuki", "Olga", "Pedro", "Chen", "Fatima", "Lars"]
+LAST_NAMES = ["Smith", "Garcia", "Muller", "Rossi", "Tanaka", "Novak", "Silva", "Wang", "Khan", "Berg"]
+
+
+def _iban(index: int) -> str:
+    """Build a valid German IBAN whose account number encodes ``index``."""
+    bban = f"37040044{index:010d}"
+    numeric = int(bban + "131400")  # "DE" -> 1314, check digits "00"
+    check = 98 - numeric % 97
+    return f"DE{check:02d}{bban}"
+
+
+def customer(index: int) -> dict:
+    """Deterministic customer record for ``index``."""
+    rng = random.Random(index)
+    secret, answers = SECRETS[index % len(SECRETS)]
+    return {
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}",
+        "phone": f"+{10_000_000_000 + index}",
+        "iban": _iban(index),
+        "secret": secret,
+        "answer": rng.choice(answers),
+    }
+
+
+def generate(count: int) -> dict:
+    """Customer/account data with ``count`` customers (every third one premium)."""
+    customers = [customer(i) for i in range(count)]
+    accounts = [{"iban": c["iban"], "premium": i % 3 == 0} for i, c in enumerate(customers)]
+    return {"customers": customers, "accounts": accounts}
+
+
+def write_json(path, count: int) -> None:
+    """Stream a ``count``-customer JSON file to ``path`` without holding it in memory."""
+    with open(path, "w") as f:
+        f.write('{\n  "customers": [\n')
+        for i in range(count):
+            f.write(("    " if i == 0 else ",\n    ") + json.dumps(customer(i)))
+        f.write('\n  ],\n  "accounts": [\n')
+        for i in range(count):
+            account = {"iban": _iban(i), "premium": i % 3 == 0}
+            f.write(("    " if i == 0 else ",\n    ") + json.dumps(account))
+        f.write("\n  ]\n}\n")
@@ -2,12 +2,17 @@
 Bouncer agent node.
 """
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+import re
+from typing import List, Optional, Tuple
 
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from src.graph.config import BOUNCER_FAST_PATH_ENABLED
 from src.graph.state import State
-from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+from src.graph.models import get_runnable
+from src.utils import metrics
 from src.tools.bouncer_tools import check_account_status, handoff_to_specialist
+from src.tools.inline_async import atool_exchange, tool_exchange
 from src.graph.summarization import build_invocation_messages
 
 SYSTEM_PROMPT = """You are the Bouncer agent for DEUS Bank.
@@ -35,22 +40,138 @@ If the status is 'Premium':
 Always be polite and professional.
 """
 
-def bouncer_node(state: State):
+# Fixed replies for the tiers whose answer does not depend on the conversation.
+NON_CLIENT_MESSAGE = (
+    "I'm sorry, you don't appear to be a client of DEUS Bank. "
+    "Please contact your bank's support department directly for assistance."
+)
+REGULAR_CLIENT_MESSAGE = (
+    "Thank you, you are a regular client of DEUS Bank. "
+    "Please call our support department at +11223344 for any requests."
+)
+PREMIUM_CLIENT_MESSAGE = "Thank you, you are a premium client of DEUS Bank. How can I help you today?"
+_TIER_MESSAGES = {"Non-Client": NON_CLIENT_MESSAGE, "Regular": REGULAR_CLIENT_MESSAGE}
+
+# Words that only greet or identify: a message of nothing else (and the
+# customer's own details and secret answer) makes no request. A filler
+# missing here only costs an LLM reply, never a wrong one.
+_IDENTIFYING_WORDS = frozenset("""
+hello hi hey hiya howdy greetings good morning afternoon evening day there dear how are you doing today
+yes yeah yep no ok okay k sure right alright fine great cool perfect nice lovely
+thanks thank thx ta cheers please here sorry oh well so just also too again
+i i'm im i’m am me my mine name called is it it's its it’s this that that's that’s was be of with from as
+and or the a an number phone mobile telephone cell iban account answer secret question
+""".split())
+_WORD = re.compile(r"[^\W\d_][\w'’]*")
+
+def _model():
+    return get_runnable(
+        "bouncer", lambda model: model.bind_tools([check_account_status, handoff_to_specialist])
+    )
+
+
+def _verified_iban(state: State) -> Optional[str]:
+    """IBAN key of the verified customer, as verification recorded it (see src/graph/verification.py)."""
+    if not state.get("is_verified"):
+        return None
+    return state.get("customer_key")
+
+
+def _resolved(exchange: List[BaseMessage]) -> Tuple[Optional[str], List[BaseMessage]]:
+    status = exchange[-1].content
+    if status not in ("Premium", "Regular", "Non-Client"):
+        return None, []
+    return status, exchange
+
+
+def _account_status(state: State) -> Tuple[Optional[str], List[BaseMessage]]:
+    """
+    The customer's account status, and the tool exchange to record if it was
+    resolved just now.
+
+    Right after verification the status is looked up in code, recorded as
+    the ``check_account_status`` call the LLM would have made, and kept in
+    the state. Returns (None, []) when it cannot be resolved this way.
+    """
+    status = state.get("account_status")
+    if status:
+        return status, []
+    iban = _verified_iban(state)
+    if iban is None:
+        return None, []
+    return _resolved(tool_exchange(check_account_status, {"iban": iban}))
+
+
+async def _aaccount_status(state: State) -> Tuple[Optional[str], List[BaseMessage]]:
+    """Async ``_account_status``, running the tool through its coroutine."""
+    status = state.get("account_status")
+    if status:
+        return status, []
+    iban = _verified_iban(state)
+    if iban is None:
+        return None, []
+    return _resolved(await atool_exchange(check_account_status, {"iban": iban}))
+
+
+def _states_request(state: State) -> bool:
     """
-    Bouncer node that invokes the LLM with the current state messages.
+    Whether the customer has said more than greetings, their details and
+    their secret answer so far: a request nobody has handled yet, since the
+    bouncer has only just taken over. A summarized conversation may hold
+    one too.
     """
-    model = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
-    model_with_tools = model.bind_tools([check_account_status, handoff_to_specialist])
-    
-    messages = state["messages"]
-    invocation_messages = build_invocation_messages(
-        SYSTEM_PROMPT,
-        messages,
-        state.get("summary"),
+    if state.get("summary"):
+        return True
+    known = set(_IDENTIFYING_WORDS)
+    for value in (state.get("identity") or {}).values():
+        known.update(_WORD.findall(str(value).casefold()))
+    for message in state["messages"]:
+        for call in getattr(message, "tool_calls", None) or []:
+            for value in call["args"].values():
+                known.update(_WORD.findall(str(value).casefold()))
+    return any(
+        set(_WORD.findall(message.content.casefold())) - known
+        for message in state["messages"]
+        if isinstance(message, HumanMessage) and isinstance(message.content, str)
     )
-    
-    response = model_with_tools.invoke(invocation_messages)
 
+
+def _fixed_reply(state: State, status: Optional[str], just_resolved: bool) -> Optional[str]:
+    """The templated reply for this status, or None if the LLM must answer."""
+    if status == "Premium":
+        # A premium customer is greeted once, unless they already asked for
+        # something; their request needs the LLM.
+        return PREMIUM_CLIENT_MESSAGE if just_resolved and not _states_request(state) else None
+    return _TIER_MESSAGES.get(status)
+
+
+def _settled(
+    state: State, status: Optional[str], exchange: List[BaseMessage],
+) -> Tuple[Optional[AIMessage], List[BaseMessage], Optional[str]]:
+    reply = _fixed_reply(state, status, bool(exchange))
+    if reply is None:
+        return None, exchange, status
+    metrics.increment("bouncer.fixed_replies")
+    return AIMessage(content=reply), exchange, status
+
+
+def _fast_path(state: State) -> Tuple[Optional[AIMessage], List[BaseMessage], Optional[str]]:
+    """
+    (fixed reply or None if the LLM must answer, tool exchange to record, account status).
+    """
+    if not BOUNCER_FAST_PATH_ENABLED:
+        return None, [], None
+    return _settled(state, *_account_status(state))
+
+
+async def _afast_path(state: State) -> Tuple[Optional[AIMessage], List[BaseMessage], Optional[str]]:
+    """Async ``_fast_path``."""
+    if not BOUNCER_FAST_PATH_ENABLED:
+        return None, [], None
+    return _settled(state, *await _aaccount_status(state))
+
+
+def _result(response, exchange: List[BaseMessage] = (), status: Optional[str] = None) -> dict:
     # When handing off to specialist, do NOT include any text—only the tool call.
     # Enforce this in code since the user should see either a response OR a transfer, not both.
     if isinstance(response, AIMessage) and getattr(response, "tool_calls", None):
@@ -64,10 +185,37 @@ def bouncer_node(state: State):
                 id=response.id,
             )
 
-    return {
-        "messages": [response],
+    result = {
+        "messages": [*exchange, response],
         "active_agent": "bouncer",
         "is_verified": True,
         "failed_verification_attempts": 0
     }
+    if status:
+        result["account_status"] = status
+    return result
+
 
+def _invocation_messages(state: State, exchange: List[BaseMessage]) -> List[BaseMessage]:
+    return build_invocation_messages(SYSTEM_PROMPT, [*state["messages"], *exchange], state.get("summary"))
+
+
+def bouncer_node(state: State):
+    """
+    Bouncer node: a fixed reply when the account status decides it,
+    otherwise the LLM with the current state messages.
+    """
+    response, exchange, status = _fast_path(state)
+    if response is None:
+        response = _model().invoke(_invocation_messages(state, exchange))
+    return _result(response, exchange, status)
+
+
+async def abouncer_node(state: State):
+    """
+    Async bouncer node, awaiting the LLM instead of blocking the event loop.
+    """
+    response, exchange, status = await _afast_path(state)
+    if response is None:
+        response = await _model().ainvoke(_invocation_messages(state, exchange))
+    return _result(response, exchange, status)
@@ -1,23 +1,33 @@
 """
 Greeter agent node.
 
+Verification progress lives in the state (see src/graph/verification.py).
+The steps the protocol fully decides run in code: looking up the customer
+once two details are collected, asking the secret question and checking a
+one-word answer. The LLM reads and phrases everything else.
 """
 
 import sys
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 from langchain_core.messages import (
+    BaseMessage,
     HumanMessage,
     AIMessage,
     ToolMessage,
 )
-from langchain_openai import ChatOpenAI
 
+from src.graph import verification
+from src.graph.config import GREETER_FAST_PATH_ENABLED
 from src.graph.state import State
-from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+from src.graph.models import get_runnable
 from src.tools.greeter_tools import lookup_customer, verify_answer
+from src.tools.inline_async import atool_exchange, tool_exchange
 from src.graph.summarization import build_invocation_messages
+from src.utils import metrics
+from src.utils.data import MIN_IDENTITY_DETAILS
+from src.utils.entities import extract_identity
 
 
 SYSTEM_PROMPT = """You are the Greeter agent for DEUS Bank.
@@ -39,50 +49,234 @@ Always use tools when eligible.
 Be polite and professional.
 """
 
-def greeter_node(state: State):
-    """
-    Greeter node that invokes the LLM with the current state messages.
-    """
-    model = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
-    tools = [lookup_customer, verify_answer]
-    model_with_tools = model.bind_tools(tools)
-    
-    messages = state["messages"]
-    invocation_messages = build_invocation_messages(
-        SYSTEM_PROMPT,
-        messages,
-        state.get("summary"),
-    )
-    
-    # Check for failed verification attempts
-    last_message = messages[-1]
-    current_failures = state.get("failed_verification_attempts", 0)
-    is_verified = state.get("is_verified", False)
-    
-    if isinstance(last_message, ToolMessage) and last_message.name == "verify_answer":
-        if "VERIFIED" not in last_message.content:
-            current_failures += 1
-        else:
-            current_failures = 0
-            is_verified = True
-
-    if current_failures >= 3:
-        standard_message = AIMessage(
-            content="I'm sorry, we were unable to verify your identity after several attempts. "
-            "Please visit your nearest branch or contact our customer service to complete the verification process."
+TOO_MANY_FAILURES_MESSAGE = (
+    "I'm sorry, we were unable to verify your identity after several attempts. "
+    "Please visit your nearest branch or contact our customer service to complete the verification process."
+)
+SECRET_QUESTION_MESSAGE = "Thank you. To verify your identity, please answer your secret question: {question}"
+WRONG_ANSWER_MESSAGE = "I'm sorry, that answer doesn't match our records. Please try again: {question}"
+# Stripped from a reply before it is checked as the answer.
+_ANSWER_PUNCTUATION = " \t\n.,!?;:\"'“”‘’"
+
+
+def _model():
+    return get_runnable("greeter", lambda model: model.bind_tools([lookup_customer, verify_answer]))
+
+
+def _system_prompt(state: State) -> str:
+    """The prompt, with the progress the state records (older messages may be summarized away)."""
+    notes = []
+    if state.get("identity"):
+        collected = ", ".join(f"{field}: {value}" for field, value in state["identity"].items())
+        notes.append(f"Details collected so far: {collected}.")
+    if state.get("pending_question"):
+        notes.append(
+            f"The secret question has been asked: {state['pending_question']} "
+            "The customer's next reply is their answer."
         )
-        return {
-            "messages": [standard_message],
-            "active_agent": "greeter",
-            "failed_verification_attempts": current_failures,
-            "is_verified": is_verified,
-            "conversation_ended": True,
-        }
-
-    response = model_with_tools.invoke(invocation_messages)
+    return "\n".join([SYSTEM_PROMPT, *notes])
+
+
+def _invocation_messages(state: State, updates: dict) -> List[BaseMessage]:
+    progress = {**state, **updates}
+    messages = [*state["messages"], *updates.get("messages", [])]
+    return build_invocation_messages(_system_prompt(progress), messages, state.get("summary"))
+
+
+def _too_many_failures(exchange: List[BaseMessage] = (), updates: Optional[dict] = None) -> dict:
+    standard_message = AIMessage(content=TOO_MANY_FAILURES_MESSAGE)
     return {
-        "messages": [response], 
+        **(updates or {}),
+        "messages": [*exchange, standard_message],
         "active_agent": "greeter",
-        "failed_verification_attempts": current_failures,
-        "is_verified": is_verified
+        "conversation_ended": True,
     }
+
+
+def _reply(text: str, exchange: List[BaseMessage] = (), updates: Optional[dict] = None) -> dict:
+    return {**(updates or {}), "messages": [*exchange, AIMessage(content=text)], "active_agent": "greeter"}
+
+
+def _result(response, updates: dict) -> dict:
+    return {**updates, "messages": [*updates.get("messages", []), response], "active_agent": "greeter"}
+
+
+def _record_extraction(hit: bool) -> None:
+    metrics.increment("greeter.extraction.hits" if hit else "greeter.extraction.misses")
+    counts = metrics.snapshot()
+    hits = counts.get("greeter.extraction.hits", 0)
+    metrics.set_gauge("greeter.extraction.hit_ratio", hits / (hits + counts.get("greeter.extraction.misses", 0)))
+
+
+def _identity_to_look_up(state: State, text: str) -> Tuple[Optional[dict], dict]:
+    """
+    Collect the details in the customer's message: (the identity to look up
+    once there are two, otherwise None; state updates).
+    """
+    identity = verification.collect(state, extract_identity(text)._asdict())
+    if identity is None:
+        return None, {}
+    if len(identity) < MIN_IDENTITY_DETAILS:
+        return None, {"identity": identity}
+    return identity, {}
+
+
+def _looked_up(identity: dict, exchange: List[BaseMessage]) -> Tuple[Optional[dict], dict]:
+    """The step after ``lookup_customer`` ran for ``identity`` as ``exchange``."""
+    result = exchange[-1]
+    updates = verification.after_lookup(identity, result.content, result.artifact)
+    _record_extraction(updates["pending_question"] is not None)
+    if updates["pending_question"] is None:
+        # The LLM explains what went wrong, or reads the details differently.
+        return None, {**updates, "messages": exchange}
+    return _reply(SECRET_QUESTION_MESSAGE.format(question=updates["pending_question"]), exchange, updates), {}
+
+
+def _lookup(state: State, text: str) -> Tuple[Optional[dict], dict]:
+    """
+    Collect the details in the customer's message; look the customer up once there are two.
+    """
+    identity, updates = _identity_to_look_up(state, text)
+    if identity is None:
+        return None, updates
+    return _looked_up(identity, tool_exchange(lookup_customer, identity))
+
+
+async def _alookup(state: State, text: str) -> Tuple[Optional[dict], dict]:
+    """Async ``_lookup``."""
+    identity, updates = _identity_to_look_up(state, text)
+    if identity is None:
+        return None, updates
+    return _looked_up(identity, await atool_exchange(lookup_customer, identity))
+
+
+def _answer_args(state: State, text: str) -> Optional[dict]:
+    """The ``verify_answer`` arguments for the customer's reply, or None if there is nothing to check."""
+    answer = text.strip(_ANSWER_PUNCTUATION)
+    identity = state.get("identity")
+    if not answer or not identity:
+        return None
+    return {"answer": answer, **identity}
+
+
+def _answer_checked(state: State, args: dict, exchange: List[BaseMessage]) -> Tuple[Optional[dict], dict]:
+    """
+    The step after ``verify_answer`` ran with ``args`` as ``exchange``.
+
+    A reply that is not the answer counts as a failed attempt only when it
+    is a single word; a sentence may hold the answer, and the LLM reads it.
+    """
+    updates = verification.after_verification(state, exchange[-1].content)
+    if not updates.get("is_verified") and len(args["answer"].split()) > 1:
+        return None, {}
+
+    metrics.increment("greeter.answers_checked")
+    if updates.get("is_verified"):
+        # No reply: the bouncer takes over in this turn.
+        return {**updates, "messages": exchange, "active_agent": "greeter"}, {}
+    if updates["failed_verification_attempts"] >= verification.MAX_VERIFICATION_ATTEMPTS:
+        return _too_many_failures(exchange, updates), {}
+    return _reply(WRONG_ANSWER_MESSAGE.format(question=state["pending_question"]), exchange, updates), {}
+
+
+def _check_answer(state: State, text: str) -> Tuple[Optional[dict], dict]:
+    """Check the customer's reply to the secret question as their answer."""
+    args = _answer_args(state, text)
+    if args is None:
+        return None, {}
+    return _answer_checked(state, args, tool_exchange(verify_answer, args))
+
+
+async def _acheck_answer(state: State, text: str) -> Tuple[Optional[dict], dict]:
+    """Async ``_check_answer``."""
+    args = _answer_args(state, text)
+    if args is None:
+        return None, {}
+    return _answer_checked(state, args, await atool_exchange(verify_answer, args))
+
+
+def _after_tools(state: State) -> Optional[dict]:
+    """The reply to the LLM's own lookup or answer check, once greeter_tools recorded it."""
+    question = state.get("pending_question")
+    if not question:
+        return None
+    name = state["messages"][-1].name
+    if name == "lookup_customer":
+        return _reply(SECRET_QUESTION_MESSAGE.format(question=question))
+    if name == "verify_answer":
+        return _reply(WRONG_ANSWER_MESSAGE.format(question=question))
+    return None
+
+
+def _customer_text(state: State) -> Optional[str]:
+    """The customer's latest message, when the fast path may act on it."""
+    if not GREETER_FAST_PATH_ENABLED or state.get("is_verified", False):
+        return None
+    last_message = state["messages"][-1]
+    if not isinstance(last_message, HumanMessage) or not isinstance(last_message.content, str):
+        return None
+    return last_message.content
+
+
+def _after_own_tools(state: State) -> bool:
+    """Whether this step follows greeter_tools, running a call the LLM made."""
+    return (
+        GREETER_FAST_PATH_ENABLED and not state.get("is_verified", False)
+        and isinstance(state["messages"][-1], ToolMessage)
+    )
+
+
+def _fast_path(state: State) -> Tuple[Optional[dict], dict]:
+    """
+    (node result if code settles this step, otherwise None; state updates to
+    keep alongside the LLM's reply).
+    """
+    if _after_own_tools(state):
+        return _after_tools(state), {}
+    text = _customer_text(state)
+    if text is None:
+        return None, {}
+    if state.get("pending_question"):
+        return _check_answer(state, text)
+    return _lookup(state, text)
+
+
+async def _afast_path(state: State) -> Tuple[Optional[dict], dict]:
+    """Async ``_fast_path``, running the tools through their coroutines."""
+    if _after_own_tools(state):
+        return _after_tools(state), {}
+    text = _customer_text(state)
+    if text is None:
+        return None, {}
+    if state.get("pending_question"):
+        return await _acheck_answer(state, text)
+    return await _alookup(state, text)
+
+
+def greeter_node(state: State):
+    """
+    Greeter node: the next verification step in code when the protocol
+    decides it, otherwise the LLM with the current state messages.
+    """
+    if state.get("failed_verification_attempts", 0) >= verification.MAX_VERIFICATION_ATTEMPTS:
+        return _too_many_failures()
+
+    result, updates = _fast_path(state)
+    if result is not None:
+        return result
+    response = _model().invoke(_invocation_messages(state, updates))
+    return _result(response, updates)
+
+
+async def agreeter_node(state: State):
+    """
+    Async greeter node, awaiting the LLM instead of blocking the event loop.
+    """
+    if state.get("failed_verification_attempts", 0) >= verification.MAX_VERIFICATION_ATTEMPTS:
+        return _too_many_failures()
+
+    result, updates = await _afast_path(state)
+    if result is not None:
+        return result
+    response = await _model().ainvoke(_invocation_messages(state, updates))
+    return _result(response, updates)
@@ -1,11 +1,28 @@
-from typing import Optional
-from langchain_openai import ChatOpenAI
+import asyncio
+import hashlib
+import re
+from typing import List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import AIMessage
+from langgraph.constants import TAG_NOSTREAM
 from pydantic import BaseModel, Field
 
-from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+from src.graph.config import (
+    AGENT_LLM_MODELS,
+    GUARDRAIL_CACHE_ENABLED,
+    GUARDRAIL_CACHE_PATH,
+    GUARDRAIL_CACHE_SIZE,
+    GUARDRAIL_CACHE_TTL,
+    GUARDRAIL_LEAK_SCAN_ENABLED,
+    GUARDRAIL_PRESCREEN_ENABLED,
+)
+from src.agents.bouncer import NON_CLIENT_MESSAGE, PREMIUM_CLIENT_MESSAGE, REGULAR_CLIENT_MESSAGE
+from src.agents.greeter import SECRET_QUESTION_MESSAGE, TOO_MANY_FAILURES_MESSAGE, WRONG_ANSWER_MESSAGE
+from src.graph.models import get_runnable
 from src.graph.state import State
+from src.utils import metrics
+from src.utils.leaks import NAME, Leak, get_leak_scanner, redact, scans_in_memory
+from src.utils.ttl_cache import TTLCache
 
 COMPANY_PHONE_NUMBERS = "+11223344, +9876543, +1999888, +888666, +99887766"
 
@@ -27,20 +44,7 @@ class SafetyAssessment(BaseModel):
     violation_reason: Optional[str] = Field(description="If unsafe, explain exactly which rule was broken.")
     sanitized_content: Optional[str] = Field(description="If the message was unsafe, provide a polite, corrected version that refuses the request (e.g., 'I cannot approve loans, but I can connect you to a specialist.').")
 
-def validate_response(response_text: str) -> SafetyAssessment:
-    """
-    Validates a response against the security policy using an LLM.
-    
-    Args:
-        response_text: The text to validate.
-        
-    Returns:
-        SafetyAssessment: The assessment result.
-    """
-    llm = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
-    structured_llm = llm.with_structured_output(SafetyAssessment)
-    
-    system_prompt = f"""You are a Guardrail Agent for a banking bot.
+SYSTEM_PROMPT = f"""You are a Guardrail Agent for a banking bot.
 Your goal is to act as a final firewall before sending any message to the customer.
 
 Start by reviewing the following security policy:
@@ -51,36 +55,278 @@ If it violates any rule, set is_safe to False, provide the reason, and a sanitiz
 If it is safe, set is_safe to True.
 """
 
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_prompt),
-        ("user", "Here is the response to validate:\n{response_text}")
-    ])
-    
-    chain = prompt | structured_llm
-    
-    return chain.invoke({"response_text": response_text})
+PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    ("user", "Here is the response to validate:\n{response_text}")
+])
 
-def guardrail_node(state: State):
+def _chain():
+    # A verdict is only usable whole: never stream it, nor show it in the
+    # graph's message stream. The copy shares the shared model's HTTP clients.
+    def build(llm):
+        llm = llm.model_copy(update={"disable_streaming": True})
+        return (PROMPT | llm.with_structured_output(SafetyAssessment)).with_config(tags=[TAG_NOSTREAM])
+    return get_runnable("guardrail", build)
+
+# 3. Cache verdicts for responses that only differ in ways the policy ignores.
+# The key covers the prompt (and with it SECURITY_POLICY) and the guardrail
+# model, so changing either starts from an empty cache.
+POLICY_HASH = hashlib.sha256(f"{AGENT_LLM_MODELS['guardrail']}\x1f{SYSTEM_PROMPT}".encode()).hexdigest()
+
+_WHITESPACE = re.compile(r"\s+")
+# A number, possibly written with spaces or dashes: "3", "+1 122 334 455".
+_NUMBER = re.compile(r"\+?\d(?:[\d \-]*\d)?")
+_COMPANY_PHONES = frozenset(COMPANY_PHONE_NUMBERS.split(", "))
+# Numbers this short are counts, amounts or times, never identifiers.
+_MAX_MASKED_DIGITS = 4
+
+_verdict_cache = None
+
+
+def _mask_number(match: re.Match) -> str:
+    number = match.group()
+    compact = number.replace(" ", "").replace("-", "")
+    if compact in _COMPANY_PHONES:
+        return "<company phone>"
+    if len(compact.lstrip("+")) <= _MAX_MASKED_DIGITS:
+        return "<n>"
+    # Anything longer may be PII and keeps its own verdict.
+    return number
+
+
+def normalize_response(response_text: str) -> str:
     """
-    Guardrail node that validates the last message in the state.
+    Form of a response under which equal texts get the same verdict.
+
+    Whitespace is collapsed and case folded. Company phone numbers, which the
+    policy allows, and short numbers are masked; longer numbers are kept.
+    """
+    text = _WHITESPACE.sub(" ", response_text).strip().casefold()
+    return _NUMBER.sub(_mask_number, text)
+
+
+def verdict_cache() -> Optional[TTLCache]:
+    """The process-wide verdict cache, or None when disabled."""
+    global _verdict_cache
+    if _verdict_cache is None and GUARDRAIL_CACHE_ENABLED:
+        _verdict_cache = TTLCache(GUARDRAIL_CACHE_SIZE, GUARDRAIL_CACHE_TTL, GUARDRAIL_CACHE_PATH or None)
+    return _verdict_cache
+
+
+def _cached(response_text: str) -> Tuple[Optional[str], Optional[SafetyAssessment]]:
+    cache = verdict_cache()
+    if cache is None:
+        return None, None
+    key = hashlib.sha256(f"{POLICY_HASH}\x1f{normalize_response(response_text)}".encode()).hexdigest()
+    verdict = cache.get(key)
+    metrics.set_gauge("guardrail.cache.hit_ratio", cache.hit_ratio)
+    if verdict is None:
+        return key, None
+    metrics.increment("guardrail.cache.llm_calls_saved")
+    if verdict["is_safe"]:
+        return key, SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+    # The cached sanitized text was written for another reply: this one's is its own redaction.
+    sanitized = _redact(response_text)
+    return key, SafetyAssessment(
+        is_safe=False,
+        violation_reason=verdict.get("violation_reason"),
+        sanitized_content=sanitized if sanitized != response_text else None,
+    )
+
+
+def _remember(key: Optional[str], assessment: SafetyAssessment) -> SafetyAssessment:
+    metrics.increment("guardrail.llm_calls")
+    if key is not None:
+        # Only the verdict: replies sharing a key differ in their masked numbers.
+        verdict_cache().put(key, {"is_safe": assessment.is_safe, "violation_reason": assessment.violation_reason})
+    return assessment
+
+# 4. Pre-screen with rules that decide the clear cases in microseconds.
+SAFE = "safe"
+UNSAFE = "unsafe"
+NEEDS_LLM = "needs_llm"
+
+# The secret questions the policy lets the bot ask.
+SECRET_QUESTIONS = (
+    "What is the name of your pet?",
+    "What city were you born in?",
+    "What is your mother's maiden name?",
+)
+
+# Fixed code-generated replies, compared in normalized form.
+SAFE_TEMPLATES = {
+    normalize_response(message)
+    for message in (
+        TOO_MANY_FAILURES_MESSAGE, NON_CLIENT_MESSAGE, REGULAR_CLIENT_MESSAGE, PREMIUM_CLIENT_MESSAGE,
+        *(template.format(question=question)
+          for template in (SECRET_QUESTION_MESSAGE, WRONG_ANSWER_MESSAGE) for question in SECRET_QUESTIONS),
+    )
+}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _sentences(normalized: str) -> List[str]:
+    return [sentence.rstrip(".!?") for sentence in _SENTENCE_END.split(normalized)]
+
+
+# Stock sentences of the bot's own, compared in normalized form: a short reply
+# made of nothing else can neither leak PII nor stray from the policy.
+SAFE_PHRASES = {
+    sentence
+    for phrase in (
+        "Hello!", "Hi!", "Welcome to DEUS Bank!", "Thank you!", "Thanks!", "Goodbye!", "Have a nice day!",
+        "Thank you for contacting DEUS Bank.",
+        "How can I help you today?", "How can I assist you today?", "How can I help you?",
+        "Could you please provide your name and either your phone number or IBAN?",
+        "Could you please provide your name and your phone number or IBAN?",
+        "Could you give me your name and phone number or IBAN?",
+        "To verify your identity, please answer your secret question.",
+        *SECRET_QUESTIONS,
+        "You are a regular client.", "You are a regular client of DEUS Bank.",
+        "You are a premium client.", "You are a premium client of DEUS Bank.",
+        "Please call our support department at +11223344.",
+        "Please call our support department at +11223344 for any requests.",
+    )
+    for sentence in _sentences(normalize_response(phrase))
+}
+# Longer replies go to the LLM even when every sentence is a stock one.
+_MAX_PHRASE_REPLY_CHARS = 300
+
+# Exposed PII the policy forbids outright; redacted in the sanitized reply.
+_PII_PATTERNS = (
+    (re.compile(r"\b[A-Z]{2}\d{2}(?: ?[A-Z0-9]){11,30}\b"), "Exposes an account number (IBAN)."),
+    (re.compile(r"\b\d{3}-\d{2}-\d{4}\b"), "Exposes a social security number."),
+)
+REDACTED = "[redacted]"
+# Shown instead of an unsafe reply the guardrail gave no sanitized version of.
+SANITIZED_FALLBACK = "I'm sorry, I cannot process that request due to safety policies."
+
+
+def prescreen(response_text: str) -> Tuple[str, Optional[str]]:
+    """
+    Decide a response by rules alone: SAFE, UNSAFE or NEEDS_LLM.
+
+    SAFE covers empty replies (tool calls only), known templates and short
+    replies made only of the bot's stock sentences (``SAFE_PHRASES``, company
+    phone numbers included). UNSAFE covers IBANs and social security
+    numbers. Everything else, any free text, needs the LLM guardrail.
+
+    Returns:
+        The decision and, for UNSAFE, the violation reason.
     """
+    if not response_text.strip():
+        return SAFE, None
+    for pattern, reason in _PII_PATTERNS:
+        if pattern.search(response_text):
+            return UNSAFE, reason
+    normalized = normalize_response(response_text)
+    if normalized in SAFE_TEMPLATES:
+        return SAFE, None
+    if len(normalized) <= _MAX_PHRASE_REPLY_CHARS and all(
+        sentence in SAFE_PHRASES for sentence in _sentences(normalized)
+    ):
+        return SAFE, None
+    return NEEDS_LLM, None
+
+
+def _redact(response_text: str) -> str:
+    for pattern, _ in _PII_PATTERNS:
+        response_text = pattern.sub(REDACTED, response_text)
+    return response_text
+
+
+def _leaks(response_text: str) -> List[Leak]:
+    if not GUARDRAIL_LEAK_SCAN_ENABLED or not response_text.strip():
+        return []
+    return get_leak_scanner().scan(response_text)
+
+
+async def _aleaks(response_text: str) -> List[Leak]:
+    if scans_in_memory():
+        return _leaks(response_text)
+    # Building the scanner, or scanning a store queried in place, would block the event loop.
+    return await asyncio.to_thread(_leaks, response_text)
+
+
+def _screened(response_text: str, leaks: List[Leak]) -> Optional[SafetyAssessment]:
+    """
+    The verdict of the leak scan and pre-screen, or None if the LLM must decide.
+
+    A reply quoting a customer's phone number or IBAN is unsafe whatever the
+    rules say; one naming a customer in full is never passed by rules alone.
+    """
+    if any(leak.kind != NAME for leak in leaks):
+        metrics.increment("guardrail.leaks.redacted")
+        return SafetyAssessment(
+            is_safe=False,
+            violation_reason="Exposes a customer's phone number or IBAN.",
+            sanitized_content=_redact(redact(response_text, leaks, REDACTED)),
+        )
+    if not GUARDRAIL_PRESCREEN_ENABLED:
+        return None
+    decision, reason = prescreen(response_text)
+    if leaks:
+        metrics.increment("guardrail.leaks.names_flagged")
+        if decision == SAFE:
+            decision = NEEDS_LLM
+    metrics.increment(f"guardrail.prescreen.{decision}")
+    if decision == SAFE:
+        return SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+    if decision == UNSAFE:
+        return SafetyAssessment(is_safe=False, violation_reason=reason, sanitized_content=_redact(response_text))
+    return None
+
+def validate_response(response_text: str) -> SafetyAssessment:
+    """
+    Validates a response against the security policy.
+
+    Replies quoting customer identifiers are caught by the leak scanner and
+    the rule-based pre-screen decides clear cases; the rest go to the LLM,
+    whose verdicts are cached so an equivalent response is only sent once.
+    
+    Args:
+        response_text: The text to validate.
+        
+    Returns:
+        SafetyAssessment: The assessment result.
+    """
+    assessment = _screened(response_text, _leaks(response_text))
+    if assessment is not None:
+        return assessment
+    key, assessment = _cached(response_text)
+    if assessment is not None:
+        return assessment
+    return _remember(key, _chain().invoke({"response_text": response_text}))
+
+async def avalidate_response(response_text: str) -> SafetyAssessment:
+    """Async version of ``validate_response``."""
+    assessment = _screened(response_text, await _aleaks(response_text))
+    if assessment is not None:
+        return assessment
+    key, assessment = _cached(response_text)
+    if assessment is not None:
+        return assessment
+    return _remember(key, await _chain().ainvoke({"response_text": response_text}))
+
+def _message_to_validate(state: State) -> Optional[AIMessage]:
     messages = state["messages"]
     if not messages:
-        return {}
+        return None
 
     last_message = messages[-1]
     
     # Only validate AIMessages
     if not isinstance(last_message, AIMessage):
-        return {}
-        
-    assessment = validate_response(last_message.content)
-    
+        return None
+    return last_message
+
+def _apply(last_message: AIMessage, assessment: SafetyAssessment) -> dict:
     if assessment.is_safe:
         return {}
         
     # Replace the unsafe message with the sanitized version
-    sanitized_content = assessment.sanitized_content or "I'm sorry, I cannot process that request due to safety policies."
+    sanitized_content = assessment.sanitized_content or SANITIZED_FALLBACK
     
     # If the original message has an ID, use it to update.
     # If not, we append the correction.
@@ -90,3 +336,20 @@ def guardrail_node(state: State):
     
     return {"messages": [new_message]}
 
+def guardrail_node(state: State):
+    """
+    Guardrail node that validates the last message in the state.
+    """
+    last_message = _message_to_validate(state)
+    if last_message is None:
+        return {}
+    return _apply(last_message, validate_response(last_message.content))
+
+async def aguardrail_node(state: State):
+    """
+    Async guardrail node, awaiting the LLM instead of blocking the event loop.
+    """
+    last_message = _message_to_validate(state)
+    if last_message is None:
+        return {}
+    return _apply(last_message, await avalidate_response(last_message.content))
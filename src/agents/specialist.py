@@ -8,9 +8,8 @@ Acts as an intelligent router for premium clients with high-value requests.
 Classifies the request and routes to the appropriate expert department.
 """
 
-from langchain_openai import ChatOpenAI
 from src.graph.state import State
-from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+from src.graph.models import get_runnable
 from src.tools.specialist_tools import route_to_expert
 from src.graph.summarization import build_invocation_messages
 
@@ -44,20 +43,23 @@ Guidelines:
 - Always add the phone number when routing to the expert department.
 """
 
+def _model():
+    return get_runnable("specialist", lambda model: model.bind_tools([route_to_expert]))
+
+
 def specialist_node(state: State):
     """
     Specialist node that classifies the request and routes to the right expert.
     """
-    model = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
-    model_with_tools = model.bind_tools([route_to_expert])
-    
-    messages = state["messages"]
-    invocation_messages = build_invocation_messages(
-        SYSTEM_PROMPT,
-        messages,
-        state.get("summary"),
-    )
-    
-    response = model_with_tools.invoke(invocation_messages)
+    invocation_messages = build_invocation_messages(SYSTEM_PROMPT, state["messages"], state.get("summary"))
+    response = _model().invoke(invocation_messages)
     return {"messages": [response], "active_agent": "specialist"}
 
+
+async def aspecialist_node(state: State):
+    """
+    Async specialist node, awaiting the LLM instead of blocking the event loop.
+    """
+    invocation_messages = build_invocation_messages(SYSTEM_PROMPT, state["messages"], state.get("summary"))
+    response = await _model().ainvoke(invocation_messages)
+    return {"messages": [response], "active_agent": "specialist"}
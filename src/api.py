@@ -1,12 +1,19 @@
 """
 FastAPI application for the DEUS Bank Customer Support Agent.
 Acts as a BFF (Backend for Frontend) proxying requests to the LangGraph API.
+
+One keep-alive HTTP client is shared by every request for the lifetime of
+the app, and each thread is created on the LangGraph server only the first
+time this process sees it.
 """
 
+import json
 import os
 import sys
 import uuid
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -14,15 +21,45 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 import httpx
 
-app = FastAPI(title="DEUS Bank Support Agent API")
+from src.utils.ttl_cache import TTLCache
 
 # Configuration
 LANGGRAPH_API_URL = os.getenv("LANGGRAPH_API_URL", "http://localhost:8123")
 ASSISTANT_ID = "agent"
+BFF_TIMEOUT = float(os.getenv("BFF_TIMEOUT", "60"))
+BFF_MAX_CONNECTIONS = int(os.getenv("BFF_MAX_CONNECTIONS", "100"))
+BFF_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("BFF_MAX_KEEPALIVE_CONNECTIONS", "20"))
+# Threads known to exist on the LangGraph server; a forgotten one is just created again.
+KNOWN_THREADS_SIZE = int(os.getenv("KNOWN_THREADS_SIZE", "100000"))
+KNOWN_THREADS_TTL = float(os.getenv("KNOWN_THREADS_TTL", "86400"))
+# Durability of the runs started here ("sync", "async" or "exit", as GRAPH_DURABILITY
+# in src/graph/config.py); unset leaves it to the LangGraph server
+GRAPH_DURABILITY = os.getenv("GRAPH_DURABILITY", "")
+
+# Nodes whose replies the customer sees; the guardrail node approves them.
+AGENT_NODES = ("greeter", "bouncer", "specialist")
+
+_known_threads = TTLCache(KNOWN_THREADS_SIZE, KNOWN_THREADS_TTL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.client = httpx.AsyncClient(
+        base_url=LANGGRAPH_API_URL,
+        timeout=httpx.Timeout(BFF_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=BFF_MAX_CONNECTIONS,
+            max_keepalive_connections=BFF_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    yield
+    await app.state.client.aclose()
+
+app = FastAPI(title="DEUS Bank Support Agent API", lifespan=lifespan)
 
 class ChatRequest(BaseModel):
     message: str
@@ -37,67 +74,160 @@ class ChatResponse(BaseModel):
 async def root():
     return FileResponse(project_root / 'static' / 'index.html')
 
+async def ensure_thread(client: httpx.AsyncClient, thread_id: str) -> None:
+    """Create ``thread_id`` on the LangGraph server unless this process already did."""
+    if _known_threads.get(thread_id):
+        return
+    response = await client.post("/threads", json={"thread_id": thread_id, "if_exists": "do_nothing"})
+    response.raise_for_status()
+    _known_threads.put(thread_id, True)
+
+async def start_run(client: httpx.AsyncClient, thread_id: str, send) -> httpx.Response:
+    """
+    ``await send()`` on ``thread_id``, creating the thread first if needed.
+
+    A thread the server no longer has (e.g. after its database was reset)
+    is created again and the request retried once.
+    """
+    await ensure_thread(client, thread_id)
+    response = await send()
+    if response.status_code == 404:
+        await response.aclose()
+        _known_threads.discard(thread_id)
+        await ensure_thread(client, thread_id)
+        response = await send()
+    return response
+
+def _run_payload(message: str, **options) -> dict:
+    return {
+        "assistant_id": ASSISTANT_ID,
+        "input": {"messages": [{"role": "user", "content": message}]},
+        **({"durability": GRAPH_DURABILITY} if GRAPH_DURABILITY else {}),
+        **options,
+    }
+
+def _last_ai_content(messages: list) -> str:
+    for msg in reversed(messages):
+        if msg.get("type") == "ai":
+            return msg.get("content", "")
+    return ""
+
+def _api_error(e: Exception) -> HTTPException:
+    if isinstance(e, httpx.RequestError):
+        return HTTPException(status_code=503, detail=f"Error communicating with LangGraph API: {str(e)}")
+    if isinstance(e, httpx.HTTPStatusError):
+        return HTTPException(status_code=e.response.status_code, detail=f"LangGraph API error: {e.response.text}")
+    return HTTPException(status_code=500, detail=str(e))
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     thread_id = request.thread_id or str(uuid.uuid4())
-    
-    async with httpx.AsyncClient(timeout=60.0) as client:
+    client = app.state.client
+    try:
+        # /runs/wait answers with the thread's final state values
+        run_response = await start_run(
+            client,
+            thread_id,
+            lambda: client.post(f"/threads/{thread_id}/runs/wait", json=_run_payload(request.message)),
+        )
+        run_response.raise_for_status()
+        values = run_response.json() or {}
+        return ChatResponse(
+            response=_last_ai_content(values.get("messages", [])),
+            thread_id=thread_id,
+            conversation_ended=values.get("conversation_ended", False),
+        )
+    except Exception as e:
+        raise _api_error(e)
+
+async def parse_sse(lines: AsyncIterator[str]) -> AsyncIterator[Tuple[str, object]]:
+    """Yield ``(event, data)`` for each server-sent event in a stream of lines."""
+    event, data = "message", []
+    async for line in lines:
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+    if data:
+        yield event, json.loads("\n".join(data))
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def relay_run(events: AsyncIterator[Tuple[str, object]], thread_id: str) -> AsyncIterator[str]:
+    """
+    Translate a LangGraph run stream (``updates`` and ``values`` modes) into
+    the page's events (see ``src.graph.streaming``), one event at a time.
+
+    An agent's reply is released as a ``delta`` as soon as the guardrail
+    node has passed (or replaced) it, without waiting for the rest of the run.
+    """
+    reply: Optional[dict] = None
+    values: dict = {}
+    async for event, data in events:
+        if event == "values":
+            values = data or {}
+        elif event == "updates":
+            for node, update in (data or {}).items():
+                if node == "guardrail" and not update:
+                    update = {}  # approved as it is: the guardrail returns no changes
+                if not isinstance(update, dict):
+                    continue  # e.g. "__interrupt__"
+                messages = [m for m in update.get("messages", []) if m.get("type") == "ai"]
+                if node in AGENT_NODES and messages:
+                    reply = messages[-1]
+                elif node == "guardrail" and reply is not None:
+                    approved = messages[-1] if messages else reply
+                    if approved.get("content"):
+                        yield _sse("delta", {"message_id": approved.get("id"), "text": approved["content"]})
+                    reply = None
+        elif event == "error":
+            yield _sse("error", {"detail": str(data.get("message", data) if isinstance(data, dict) else data)})
+            return
+    yield _sse("done", {
+        "response": _last_ai_content(values.get("messages", [])),
+        "thread_id": thread_id,
+        "conversation_ended": values.get("conversation_ended", False),
+    })
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """Same turn as ``/chat``, relayed from LangGraph's ``/runs/stream`` as server-sent events."""
+    thread_id = request.thread_id or str(uuid.uuid4())
+    client = app.state.client
+    try:
+        run_request = client.build_request(
+            "POST",
+            f"/threads/{thread_id}/runs/stream",
+            json=_run_payload(request.message, stream_mode=["updates", "values"]),
+        )
+        upstream = await start_run(client, thread_id, lambda: client.send(run_request, stream=True))
+        if upstream.is_error:
+            await upstream.aread()
+            await upstream.aclose()
+            upstream.raise_for_status()
+    except Exception as e:
+        raise _api_error(e)
+
+    async def events():
         try:
-            # 1. Create thread if it doesn't exist
-            # We try to create it blindly; if it exists, it might return 409 or 200 depending on API impl.
-            # But simpler is to just POST /threads with thread_id. 
-            # Most implementations are idempotent or return the existing one.
-            try:
-                await client.post(f"{LANGGRAPH_API_URL}/threads", json={"thread_id": thread_id})
-            except httpx.HTTPStatusError:
-                # If it fails, we assume it might exist or we'll find out in the next step
-                pass
-
-            # 2. Run the graph and wait for completion
-            run_url = f"{LANGGRAPH_API_URL}/threads/{thread_id}/runs/wait"
-            payload = {
-                "assistant_id": ASSISTANT_ID,
-                "input": {
-                    "messages": [{"role": "user", "content": request.message}]
-                }
-            }
-            
-            run_response = await client.post(run_url, json=payload)
-            run_response.raise_for_status()
-            
-            # 3. Get the final state to retrieve the response
-            # Note: /runs/wait might return the state, but fetching state explicitly is safer
-            state_url = f"{LANGGRAPH_API_URL}/threads/{thread_id}/state"
-            state_response = await client.get(state_url)
-            state_response.raise_for_status()
-            
-            state_data = state_response.json()
-            values = state_data.get("values", {})
-            messages = values.get("messages", [])
-            
-            last_response = ""
-            if messages:
-                # Find the last AIMessage
-                for msg in reversed(messages):
-                    # Check for "ai" type or "AIMessage" class name if serialized differently
-                    msg_type = msg.get("type")
-                    if msg_type == "ai":
-                        last_response = msg.get("content", "")
-                        break
-
-            conversation_ended = values.get("conversation_ended", False)
-            return ChatResponse(
-                response=last_response,
-                thread_id=thread_id,
-                conversation_ended=conversation_ended,
-            )
-
-        except httpx.RequestError as e:
-            raise HTTPException(status_code=503, detail=f"Error communicating with LangGraph API: {str(e)}")
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"LangGraph API error: {e.response.text}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            async for chunk in relay_run(parse_sse(upstream.aiter_lines()), thread_id):
+                yield chunk
+        except httpx.HTTPError as e:
+            # Headers are already sent: report the failure in the stream.
+            yield _sse("error", {"detail": f"Error communicating with LangGraph API: {str(e)}"})
+        finally:
+            await upstream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 if __name__ == "__main__":
     import uvicorn
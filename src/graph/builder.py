@@ -3,15 +3,22 @@ Graph builder for the DEUS Bank AI agent system.
 
 Constructs the LangGraph workflow that orchestrates the greeter, bouncer,
 and specialist agents with their respective tools and routing logic.
+
+A run is one customer turn: the message goes straight to the active agent
+(through its tools, possibly to the next agent), then the guardrail, then
+the run ends, summarizing the conversation first when it grew too long.
+Every hop is a node that does work, so each super-step (and checkpoint)
+is one the turn needs; how often checkpoints are written is up to the
+run's durability (GRAPH_DURABILITY).
 """
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
 
+from src.graph.checkpointer import open_checkpointer
 from src.graph.state import State
 from src.graph.routing import (
-    await_input_node,
-    route_after_await_input,
+    route_input,
     greeter_router,
     route_after_greeter_tools,
     route_after_bouncer,
@@ -19,36 +26,45 @@ from src.graph.routing import (
     route_after_specialist,
     route_after_guardrail,
 )
-from src.graph.summarization import summarize_conversation
-from src.agents.greeter import greeter_node
-from src.agents.bouncer import bouncer_node
-from src.agents.specialist import specialist_node
-from src.agents.guardrail import guardrail_node
+from src.graph.summarization import summarize_conversation, asummarize_conversation
+from src.graph.verification import tools_node
+from src.agents.greeter import greeter_node, agreeter_node
+from src.agents.bouncer import bouncer_node, abouncer_node
+from src.agents.specialist import specialist_node, aspecialist_node
+from src.agents.guardrail import guardrail_node, aguardrail_node
 from src.tools.greeter_tools import lookup_customer, verify_answer
 from src.tools.bouncer_tools import check_account_status, handoff_to_specialist
 from src.tools.specialist_tools import route_to_expert
 from langgraph.prebuilt import ToolNode
 
 
-def build_graph():
+def build_graph(checkpointer=None):
     """
     Build and compile the LangGraph workflow.
-    
+
+    Args:
+        checkpointer: Where conversation state is kept; defaults to the one
+            CHECKPOINTER_URL selects (see src/graph/checkpointer.py).
+
     Returns:
         Compiled LangGraph application ready for invocation.
     """
     builder = StateGraph(State)
 
     # ── Nodes ────────────────────────────────────────────────────────────
-    builder.add_node("await_input", await_input_node)
-    builder.add_node("greeter", greeter_node)
-    builder.add_node("bouncer", bouncer_node)
-    builder.add_node("specialist", specialist_node)
-    builder.add_node("guardrail", guardrail_node)
-    builder.add_node("summarize_conversation", summarize_conversation)
-
-    # Tool execution nodes
-    greeter_tools = ToolNode([lookup_customer, verify_answer])
+    # LLM nodes carry a sync and an async implementation: graph.invoke uses
+    # the first, graph.ainvoke awaits the second without blocking the loop.
+    builder.add_node("greeter", RunnableLambda(greeter_node, afunc=agreeter_node))
+    builder.add_node("bouncer", RunnableLambda(bouncer_node, afunc=abouncer_node))
+    builder.add_node("specialist", RunnableLambda(specialist_node, afunc=aspecialist_node))
+    builder.add_node("guardrail", RunnableLambda(guardrail_node, afunc=aguardrail_node))
+    builder.add_node(
+        "summarize_conversation",
+        RunnableLambda(summarize_conversation, afunc=asummarize_conversation),
+    )
+
+    # Tool execution nodes; the greeter's also record verification progress
+    greeter_tools = tools_node([lookup_customer, verify_answer])
     bouncer_tools = ToolNode([check_account_status, handoff_to_specialist])
     specialist_tools = ToolNode([route_to_expert])
 
@@ -56,13 +72,9 @@ def build_graph():
     builder.add_node("bouncer_tools", bouncer_tools)
     builder.add_node("specialist_tools", specialist_tools)
 
-    # ── Entry point ─────────────────────────────────────────────────────
-    builder.set_entry_point("await_input")
-
-    # ── Await input routing ─────────────────────────────────────────────
-    builder.add_conditional_edges(
-        "await_input",
-        route_after_await_input,
+    # ── Entry point: the customer's message goes to the active agent ────
+    builder.set_conditional_entry_point(
+        route_input,
         {
             "greeter": "greeter",
             "bouncer": "bouncer",
@@ -79,7 +91,7 @@ def build_graph():
         {
             "call_tool": "greeter_tools",
             "go_to_bouncer": "bouncer",
-            "continue_greeter": "guardrail",  # consume next user message
+            "continue_greeter": "guardrail",  # reply, then wait for the next turn
             "end_interaction": "guardrail",
         },
     )
@@ -100,7 +112,7 @@ def build_graph():
         route_after_bouncer,
         {
             "call_tool": "bouncer_tools",
-            "continue_bouncer": "guardrail",  # consume next user message
+            "continue_bouncer": "guardrail",  # reply, then wait for the next turn
             "end_interaction": END,
         },
     )
@@ -121,7 +133,7 @@ def build_graph():
         route_after_specialist,
         {
             "call_tool": "specialist_tools",
-            "continue_specialist": "guardrail",  # consume next user message
+            "continue_specialist": "guardrail",  # reply, then wait for the next turn
             "end_interaction": END,
         },
     )
@@ -130,20 +142,21 @@ def build_graph():
     builder.add_edge("specialist_tools", "specialist")
 
     # ── Guardrail edges ──────────────────────────────────────────────
+    # The turn ends here (after summarizing, if due)
     builder.add_conditional_edges(
         "guardrail",
         route_after_guardrail,
         {
-            "await_input": "await_input",
+            "summarize_conversation": "summarize_conversation",
             "__end__": END,
         },
     )
 
-    # After summarization, wait for more input
-    builder.add_edge("summarize_conversation", "await_input")
+    builder.add_edge("summarize_conversation", END)
 
     # ── Compile ───────────────────────────────────────────────────────
-    checkpointer = MemorySaver()
+    if checkpointer is None:
+        checkpointer = open_checkpointer()
     return builder.compile(checkpointer=checkpointer)
 
 graph = build_graph()
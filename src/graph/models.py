@@ -0,0 +1,128 @@
+"""
+Process-wide registry of chat models.
+
+Each agent's model, with its tools bound or structured output attached, is
+built once and reused for every turn. All models share one pair of pooled
+HTTP clients (sync and async), so connections, TLS sessions and DNS
+lookups to the LLM endpoint survive across turns and agents.
+
+Per-agent model names and temperatures come from ``AGENT_LLM_MODELS`` and
+``AGENT_LLM_TEMPERATURES`` in ``src.graph.config``.
+"""
+
+import logging
+import os
+import threading
+from typing import Callable, Dict, Tuple
+
+import httpx
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+from src.graph.config import (
+    AGENT_LLM_MODELS,
+    AGENT_LLM_TEMPERATURES,
+    LLM_KEEPALIVE_EXPIRY,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    LLM_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_http_client = None
+_http_async_client = None
+_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+_runnables: Dict[str, Runnable] = {}
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_TIMEOUT, connect=10.0)
+
+
+def http_clients() -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """The shared (sync, async) HTTP clients, created on first use."""
+    global _http_client, _http_async_client
+    if _http_client is None:
+        with _lock:
+            if _http_client is None:
+                _http_async_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+                _http_client = httpx.Client(limits=_limits(), timeout=_timeout())
+    return _http_client, _http_async_client
+
+
+def get_model(agent: str) -> ChatOpenAI:
+    """
+    The chat model configured for ``agent``.
+
+    Agents configured with the same model and temperature share one instance.
+    """
+    key = (AGENT_LLM_MODELS.get(agent, LLM_MODEL), AGENT_LLM_TEMPERATURES.get(agent, LLM_TEMPERATURE))
+    model = _models.get(key)
+    if model is None:
+        http_client, http_async_client = http_clients()
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                model = ChatOpenAI(
+                    model=key[0],
+                    temperature=key[1],
+                    http_client=http_client,
+                    http_async_client=http_async_client,
+                )
+                _models[key] = model
+    return model
+
+
+def get_runnable(agent: str, build: Callable[[ChatOpenAI], Runnable]) -> Runnable:
+    """
+    The runnable for ``agent``, built from its model by ``build`` on first use.
+
+    ``build`` is where tools are bound or structured output is attached, so
+    tool schemas are converted once per process instead of once per turn.
+    """
+    runnable = _runnables.get(agent)
+    if runnable is None:
+        model = get_model(agent)
+        with _lock:
+            runnable = _runnables.get(agent)
+            if runnable is None:
+                runnable = _runnables[agent] = build(model)
+    return runnable
+
+
+def warm_up() -> None:
+    """
+    Open a pooled connection to the LLM endpoint ahead of the first turn.
+
+    Sends one unauthenticated request to the API base URL; its status is
+    irrelevant, only the kept-alive connection (TCP + TLS) is.
+    """
+    http_client, _ = http_clients()
+    base_url = os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE") or "https://api.openai.com/v1"
+    try:
+        http_client.get(f"{base_url.rstrip('/')}/models")
+    except httpx.HTTPError:
+        logger.warning("Could not warm up LLM connections to %s", base_url, exc_info=True)
+
+
+def reset() -> None:
+    """Drop every cached model and close the shared clients (used by tests)."""
+    global _http_client, _http_async_client
+    with _lock:
+        _models.clear()
+        _runnables.clear()
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = _http_async_client = None
@@ -9,17 +9,13 @@ from langchain_core.messages import HumanMessage, ToolMessage
 from src.graph.config import SUMMARY_TRIGGER_MESSAGES
 from src.graph.state import State
 
-def await_input_node(state: State) -> dict:
-    """
-    Pass-through node that waits for new user input to arrive in state.
-    """
-    return {}
-
-def route_after_await_input(
+def route_input(
     state: State,
 ) -> Literal["greeter", "bouncer", "specialist", "summarize_conversation", "__end__"]:
     """
-    Route to the currently active agent once input is available.
+    Entry-point router: the customer's new message goes to the active agent.
+    Without one, a conversation that grew too long is summarized, otherwise
+    the run is over.
     """
     messages = state.get("messages", [])
     if not messages:
@@ -27,7 +23,7 @@ def route_after_await_input(
 
     last_message = messages[-1]
     if isinstance(last_message, HumanMessage):
-        return state.get("active_agent", "greeter")
+        return dispatcher(state)
 
     if len(messages) > SUMMARY_TRIGGER_MESSAGES:
         return "summarize_conversation"
@@ -71,14 +67,11 @@ def greeter_router(state: State) -> Literal["end_interaction", "call_tool", "go_
 def route_after_greeter_tools(state: State) -> Literal["go_to_bouncer", "return_to_greeter"]:
     """
     After greeter_tools executes, check whether the tool that just ran
-    verified the user successfully. If so, route to bouncer directly.
+    verified the user successfully (greeter_tools records it in the state).
+    If so, route to bouncer directly.
     """
-    messages = state["messages"]
-    last_message = messages[-1]
-
-    if isinstance(last_message, ToolMessage) and last_message.name == "verify_answer":
-        if "VERIFIED" in last_message.content:
-            return "go_to_bouncer"
+    if state.get("is_verified", False):
+        return "go_to_bouncer"
 
     return "return_to_greeter"
 
@@ -120,19 +113,20 @@ def route_after_specialist(state: State) -> Literal["call_tool", "continue_speci
     # Wait for user input or conversation ends naturally
     return "continue_specialist"
 
-def route_after_guardrail(state: State) -> Literal["await_input", "__end__"]:
+def route_after_guardrail(state: State) -> Literal["summarize_conversation", "__end__"]:
     """
-    Determine next step after guardrail.
-    Check if we should end the interaction based on the agent's logic.
+    Determine next step after guardrail: the end of the turn (summarizing
+    first if the conversation grew too long), unless the agent's logic ended
+    the interaction. The next agent only runs on the customer's next message.
     """
-    active_agent = state.get("active_agent")
-    messages = state["messages"]
-
-    if active_agent == "greeter":
+    if state.get("active_agent") == "greeter":
         # Check for failed verification attempts
         failed_attempts = state.get("failed_verification_attempts", 0)
-        
+
         if failed_attempts >= 3:
             return "__end__"
-            
-    return "await_input"
+
+    if len(state.get("messages", [])) > SUMMARY_TRIGGER_MESSAGES:
+        return "summarize_conversation"
+
+    return "__end__"
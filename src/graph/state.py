@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 
 from langgraph.graph import MessagesState
 
@@ -12,7 +12,13 @@ class State(MessagesState):
 
     active_agent: str = "greeter"
     summary: Optional[str] = None
+    # Verification progress (see src/graph/verification.py)
+    identity: Optional[Dict[str, str]] = None
+    customer_key: Optional[str] = None
+    pending_question: Optional[str] = None
     failed_verification_attempts: int = 0
     is_verified: bool = False
+    # "Premium", "Regular" or "Non-Client", resolved once the customer is verified
+    account_status: Optional[str] = None
     conversation_ended: bool = False
 
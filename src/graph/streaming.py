@@ -0,0 +1,163 @@
+"""
+Token streaming for one conversation turn, validated sentence by sentence.
+
+``stream_turn`` runs the graph with LangGraph's message streaming and
+forwards the tokens the customer-facing agents generate. Tokens are held
+until a sentence is complete; each sentence goes through the guardrail
+before it is released, so nothing reaches the customer unchecked while the
+first sentence shows up long before the whole turn is done. The guardrail
+node still checks the complete reply, and its verdict is what the final
+``done`` event carries.
+
+A message that hands off to the specialist is shown as the transfer only:
+the bouncer drops its text (see ``bouncer._result``), so the bouncer's text
+is held until its message is complete and released only without a handoff.
+
+Events, in order:
+  - ``delta``: ``{"message_id", "text"}``, validated text to append to the
+    message with that id (a new id starts a new message)
+  - ``done``: ``{"response", "thread_id", "conversation_ended"}``, the
+    same payload as the blocking ``/chat`` endpoint
+"""
+
+import asyncio
+import re
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
+
+from src.agents.guardrail import SANITIZED_FALLBACK, avalidate_response
+from src.graph.checkpointer import aflush_checkpoints
+from src.graph.config import GRAPH_DURABILITY
+
+# Nodes whose model output the customer sees; the guardrail and summarizer are internal.
+AGENT_NODES = ("greeter", "bouncer", "specialist")
+# Nodes that drop the text of a message calling HANDOFF_TOOL.
+HANDOFF_NODES = ("bouncer",)
+HANDOFF_TOOL = "handoff_to_specialist"
+
+# End of a sentence (with any closing quotes or brackets) followed by whitespace.
+_SENTENCE_END = re.compile(r"[.!?…][\"'”’)\]]*\s+|\n+")
+
+
+class SentenceBuffer:
+    """
+    Accumulates streamed text and releases it in whole sentences, or, when
+    ``whole``, only on ``flush``.
+    """
+
+    def __init__(self, whole: bool = False):
+        self._text = ""
+        self._whole = whole
+
+    def feed(self, text: str) -> str:
+        """Add ``text``; return every sentence completed so far (possibly "")."""
+        self._text += text
+        if self._whole:
+            return ""
+        end = 0
+        for match in _SENTENCE_END.finditer(self._text):
+            end = match.end()
+        released, self._text = self._text[:end], self._text[end:]
+        return released
+
+    def flush(self) -> str:
+        """Return and clear whatever is buffered."""
+        released, self._text = self._text, ""
+        return released
+
+
+def _hands_off(token: AIMessage) -> bool:
+    """Whether ``token`` (a whole message or a chunk of one) calls HANDOFF_TOOL."""
+    calls = [*token.tool_calls, *getattr(token, "tool_call_chunks", [])]
+    return any(call.get("name") == HANDOFF_TOOL for call in calls)
+
+
+async def validated(text: str) -> str:
+    """``text`` if the guardrail passes it, otherwise its sanitized version."""
+    assessment = await avalidate_response(text)
+    if assessment.is_safe:
+        return text
+    return assessment.sanitized_content or SANITIZED_FALLBACK
+
+
+def final_response(state: dict) -> str:
+    """Content of the last message of a turn's final state."""
+    messages = state.get("messages", [])
+    if not messages:
+        return ""
+    return str(messages[-1].content)
+
+
+async def stream_turn(graph, message: str, thread_id: str) -> AsyncIterator[Tuple[str, dict]]:
+    """
+    Run one turn of ``thread_id`` and yield ``(event, data)`` pairs (see module docstring).
+
+    The graph runs in a task of its own and each sentence's validation
+    starts as soon as the sentence is complete, so neither waits for the
+    other; events are still released in order.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+    # Validation tasks in release order, then None once the graph is done.
+    pending: "asyncio.Queue[Optional[asyncio.Future]]" = asyncio.Queue()
+
+    async def delta(message_id: str, text: str) -> Tuple[str, dict]:
+        return "delta", {"message_id": message_id, "text": await validated(text)}
+
+    handoffs: Set[str] = set()
+
+    def release(message_id: str, text: str) -> None:
+        if text.strip() and message_id not in handoffs:
+            pending.put_nowait(asyncio.ensure_future(delta(message_id, text)))
+
+    async def run() -> Tuple[str, dict]:
+        buffers: Dict[str, SentenceBuffer] = {}
+        final: dict = {}
+        try:
+            async for mode, chunk in graph.astream(
+                {"messages": [HumanMessage(content=message)]},
+                config=config,
+                stream_mode=["messages", "values"],
+                durability=GRAPH_DURABILITY,
+            ):
+                if mode == "values":
+                    final = chunk
+                    continue
+                token, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if node not in AGENT_NODES or not isinstance(token, AIMessage):
+                    continue
+                if _hands_off(token):
+                    handoffs.add(token.id)
+                buffer = buffers.setdefault(token.id, SentenceBuffer(whole=node in HANDOFF_NODES))
+                text = buffer.feed(token.content) if isinstance(token.content, str) else ""
+                # Replies built in code arrive whole, as a plain AIMessage.
+                if not isinstance(token, AIMessageChunk) or token.chunk_position == "last":
+                    text += buffer.flush()
+                release(token.id, text)
+
+            # Models that never mark their last chunk leave a tail behind.
+            for message_id, buffer in buffers.items():
+                release(message_id, buffer.flush())
+            # The turn is stored before the customer is told it is done.
+            await aflush_checkpoints(getattr(graph, "checkpointer", None), thread_id)
+        finally:
+            pending.put_nowait(None)
+        return "done", {
+            "response": final_response(final),
+            "thread_id": thread_id,
+            "conversation_ended": final.get("conversation_ended", False),
+        }
+
+    graph_task = asyncio.ensure_future(run())
+    try:
+        while (validation := await pending.get()) is not None:
+            yield await validation
+        yield await graph_task
+    finally:
+        # The client may have gone away: stop the turn and any checks still running.
+        graph_task.cancel()
+        while not pending.empty():
+            validation = pending.get_nowait()
+            if validation is not None:
+                validation.cancel()
@@ -12,9 +12,8 @@ from langchain_core.messages import (
     SystemMessage,
     ToolMessage,
 )
-from langchain_openai import ChatOpenAI
 
-from src.graph.config import LLM_MODEL, LLM_TEMPERATURE
+from src.graph.models import get_model
 from src.graph.state import State
 
 
@@ -37,11 +36,7 @@ def build_invocation_messages(
     return invocation_messages
 
 
-def summarize_conversation(state: State) -> dict:
-    """
-    Summarize conversation history and prune older messages.
-    """
-
+def _summary_request(state: State) -> List[BaseMessage]:
     summary = state.get("summary") or ""
     if summary:
         summary_message = (
@@ -50,11 +45,29 @@ def summarize_conversation(state: State) -> dict:
         )
     else:
         summary_message = "Create a summary of the conversation above:"
+    return state.get("messages", []) + [HumanMessage(content=summary_message)]
+
+
+def summarize_conversation(state: State) -> dict:
+    """
+    Summarize conversation history and prune older messages.
+    """
+
+    response = get_model("summarizer").invoke(_summary_request(state))
+    return _prune(state.get("messages", []), response.content)
+
+
+async def asummarize_conversation(state: State) -> dict:
+    """
+    Async version of ``summarize_conversation``.
+    """
+
+    response = await get_model("summarizer").ainvoke(_summary_request(state))
+    return _prune(state.get("messages", []), response.content)
 
-    messages = state.get("messages", [])
-    model = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
-    response = model.invoke(messages + [HumanMessage(content=summary_message)])
 
+def _prune(messages: List[BaseMessage], summary: str) -> dict:
+    """Store the new summary and delete all but the last messages (keeping tool call pairs intact)."""
     keep_count = min(2, len(messages))
     keep_indices = set(range(len(messages) - keep_count, len(messages)))
 
@@ -89,4 +102,4 @@ def summarize_conversation(state: State) -> dict:
         for index, message in enumerate(messages)
         if index not in keep_indices
     ]
-    return {"summary": response.content, "messages": delete_messages}
+    return {"summary": summary, "messages": delete_messages}
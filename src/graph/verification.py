@@ -0,0 +1,117 @@
+"""
+Identity verification progress, kept in the state.
+
+The greeter's protocol (two of name, phone and IBAN, a lookup, the secret
+question, then the answer) lives in explicit ``State`` fields rather than
+in the conversation text:
+  - ``identity``: the details collected so far
+  - ``customer_key``: IBAN key of the customer the details found
+  - ``pending_question``: the secret question awaiting an answer
+  - ``failed_verification_attempts`` and ``is_verified``
+
+Every lookup and answer check moves these fields forward the same way,
+whether the greeter ran the tool itself or the LLM asked for it through
+the ``greeter_tools`` node, and routing reads the fields instead of tool
+output.
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.prebuilt import ToolNode
+
+from src.tools.greeter_tools import CUSTOMER_FOUND
+from src.utils.data import iban_key
+
+MAX_VERIFICATION_ATTEMPTS = 3
+IDENTITY_FIELDS = ("name", "phone", "iban")
+
+
+def details(values: dict) -> Dict[str, str]:
+    """The identity details in ``values`` that are filled in."""
+    return {field: values[field] for field in IDENTITY_FIELDS if values.get(field)}
+
+
+def is_verified_result(result: str) -> bool:
+    """Whether a ``verify_answer`` result is a successful verification."""
+    try:
+        return json.loads(result).get("status") == "VERIFIED"
+    except (ValueError, AttributeError):
+        return False
+
+
+def after_lookup(args: dict, result: str, customer_key: Optional[str]) -> dict:
+    """
+    State updates after ``lookup_customer`` ran with ``args`` and returned
+    ``result``, with ``customer_key`` (its artifact) for the customer found.
+    """
+    identity = details(args)
+    if not result.startswith(CUSTOMER_FOUND):
+        return {"identity": identity, "customer_key": None, "pending_question": None}
+    return {
+        "identity": identity,
+        "customer_key": customer_key,
+        "pending_question": result[len(CUSTOMER_FOUND):],
+    }
+
+
+def after_verification(state: dict, result: str) -> dict:
+    """State updates after ``verify_answer`` returned ``result``."""
+    if not is_verified_result(result):
+        return {"failed_verification_attempts": state.get("failed_verification_attempts", 0) + 1}
+    customer = json.loads(result).get("user_data") or {}
+    return {
+        "is_verified": True,
+        "failed_verification_attempts": 0,
+        "pending_question": None,
+        "customer_key": iban_key(customer["iban"]) if customer.get("iban") else state.get("customer_key"),
+    }
+
+
+def tool_updates(state: dict, messages: Iterable[BaseMessage]) -> dict:
+    """State updates for the greeter tool results in ``messages``, applied in order."""
+    calls = {
+        call["id"]: call["args"]
+        for message in state.get("messages", [])[-1:]
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    }
+    updates: dict = {}
+    for message in messages:
+        if not isinstance(message, ToolMessage):
+            continue
+        if message.name == "lookup_customer":
+            updates.update(after_lookup(calls.get(message.tool_call_id, {}), message.content, message.artifact))
+        elif message.name == "verify_answer":
+            updates.update(after_verification({**state, **updates}, message.content))
+    return updates
+
+
+def tools_node(tools: List) -> RunnableLambda:
+    """A ``ToolNode`` for the greeter's tools that also records their outcome in the state."""
+    node = ToolNode(tools)
+
+    def run(state: dict, config) -> dict:
+        result = node.invoke(state, config)
+        return {**result, **tool_updates(state, result["messages"])}
+
+    async def arun(state: dict, config) -> dict:
+        result = await node.ainvoke(state, config)
+        return {**result, **tool_updates(state, result["messages"])}
+
+    return RunnableLambda(run, afunc=arun)
+
+
+def collect(state: dict, extracted: dict) -> Optional[Dict[str, str]]:
+    """
+    The state's identity with the details in ``extracted`` added (newer
+    values win), or None if they add nothing new.
+    """
+    identity = dict(state.get("identity") or {})
+    new = {field: value for field, value in details(extracted).items() if identity.get(field) != value}
+    if not new:
+        return None
+    identity.update(new)
+    return identity
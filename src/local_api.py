@@ -11,14 +11,46 @@ project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+import asyncio
+import json
+import secrets
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional
+from src.graph import models
 from src.graph.builder import build_graph
-from langchain_core.messages import HumanMessage, AIMessage
+from src.graph.checkpointer import aflush_checkpoints
+from src.graph.config import (
+    ADMIN_API_TOKEN,
+    GRAPH_DURABILITY,
+    GUARDRAIL_LEAK_SCAN_ENABLED,
+    LLM_WARMUP,
+    VERIFY_BATCH_MAX_IDENTITIES,
+)
+from src.graph.streaming import final_response, stream_turn
+from src.utils import metrics
+from src.utils.batch_verify import verify_batch
+from src.utils.data import get_customer_store
+from src.utils.leaks import get_leak_scanner
+from langchain_core.messages import HumanMessage
 import uuid
 
-app = FastAPI(title="DEUS Bank Support Agent API (Local)")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the customer data before serving, not inside the first turn on the event loop
+    await asyncio.to_thread(get_customer_store)
+    if GUARDRAIL_LEAK_SCAN_ENABLED:
+        await asyncio.to_thread(get_leak_scanner)
+    if LLM_WARMUP:
+        await asyncio.to_thread(models.warm_up)
+    yield
+    await aflush_checkpoints(graph.checkpointer)
+    models.reset()
+
+app = FastAPI(title="DEUS Bank Support Agent API (Local)", lifespan=lifespan)
 
 # Initialize the graph
 graph = build_graph()
@@ -32,10 +64,37 @@ class ChatResponse(BaseModel):
     thread_id: str
     conversation_ended: bool = False
 
+class Identity(BaseModel):
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    iban: Optional[str] = None
+
+class VerificationResult(BaseModel):
+    status: str
+    tier: Optional[str] = None
+
+def require_admin(authorization: Optional[str] = Header(None)):
+    """Admit requests bearing ADMIN_API_TOKEN; without a configured token admin endpoints are off."""
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_API_TOKEN is not set)")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), ADMIN_API_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
 @app.get("/")
 async def root():
     return FileResponse(project_root / 'static' / 'index.html')
 
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+async def get_metrics():
+    return metrics.snapshot()
+
+@app.post("/verify/batch", response_model=List[VerificationResult], dependencies=[Depends(require_admin)])
+def verify_identities(identities: Annotated[List[Identity], Field(max_length=VERIFY_BATCH_MAX_IDENTITIES)]):
+    """Pre-screen candidate identities with the greeter's matching rules, without the agents."""
+    results = verify_batch(get_customer_store(), [identity.model_dump() for identity in identities])
+    return [result._asdict() for result in results]
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     try:
@@ -44,26 +103,14 @@ async def chat(request: ChatRequest):
         
         messages = [HumanMessage(content=request.message)]
         
-        # Invoke the graph
-        final_state = graph.invoke({"messages": messages}, config=config)
-        
-        # Get the last AI message
-        state_messages = final_state.get("messages", [])
-        last_response = ""
+        # Run the graph without blocking other conversations on this worker
+        final_state = await graph.ainvoke({"messages": messages}, config=config, durability=GRAPH_DURABILITY)
+        # Stored before the reply goes out, when checkpoints are written behind
+        await aflush_checkpoints(graph.checkpointer, thread_id)
         
-        if state_messages:
-            # We want the last message that is NOT a HumanMessage (which we just sent)
-            # Actually, the graph execution adds messages.
-            # We want the last message in the history.
-            last_msg = state_messages[-1]
-            if isinstance(last_msg, AIMessage):
-                last_response = last_msg.content
-            elif hasattr(last_msg, "content"):
-                last_response = str(last_msg.content)
-            
         conversation_ended = final_state.get("conversation_ended", False)
         return ChatResponse(
-            response=last_response,
+            response=final_response(final_state),
             thread_id=thread_id,
             conversation_ended=conversation_ended,
         )
@@ -71,6 +118,31 @@ async def chat(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Same turn as ``/chat``, as server-sent events: guardrail-checked sentences
+    as ``delta`` events while the agents generate, then the ``done`` payload.
+    """
+    thread_id = request.thread_id or str(uuid.uuid4())
+
+    async def events():
+        try:
+            async for event, data in stream_turn(graph, request.message, thread_id):
+                yield _sse(event, data)
+        except Exception as e:
+            # Headers are already sent: report the failure in the stream.
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -15,6 +15,8 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.graph.builder import build_graph
+from src.graph.checkpointer import flush_checkpoints
+from src.graph.config import GRAPH_DURABILITY
 from langchain_core.messages import AIMessage, HumanMessage
 
 
@@ -54,7 +56,8 @@ def main():
                 first_run = False
             
             # Run the graph
-            final_state = app.invoke({"messages": messages}, config=config)
+            final_state = app.invoke({"messages": messages}, config=config, durability=GRAPH_DURABILITY)
+            flush_checkpoints(app.checkpointer, thread_id)
 
             # Get the last message from the agent
             state_messages = final_state.get("messages", [])
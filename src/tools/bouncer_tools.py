@@ -1,8 +1,8 @@
-import json
-from typing import Optional
 from langchain_core.tools import tool
-from src.utils.data import load_customers_data
+from src.tools.inline_async import inline_coroutine
+from src.utils.data import account_tier, get_customer_store
 
+@inline_coroutine
 @tool
 def check_account_status(iban: str) -> str:
     """
@@ -10,21 +10,11 @@ def check_account_status(iban: str) -> str:
     Returns: "Premium", "Regular", or "Non-Client".
     """
     try:
-        data = load_customers_data()
-        accounts = data.get("accounts", [])
-        
-        # clean the iban
-        clean_iban = iban.strip()
-        
-        for account in accounts:
-            if account.get("iban") == clean_iban:
-                is_premium = account.get("premium", False)
-                return "Premium" if is_premium else "Regular"
-                
-        return "Non-Client"
+        return account_tier(get_customer_store().is_premium(iban))
     except Exception as e:
         return f"Error checking account status: {str(e)}"
 
+@inline_coroutine
 @tool
 def handoff_to_specialist() -> str:
     """
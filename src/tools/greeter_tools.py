@@ -1,58 +1,58 @@
 import json
-import os
-from typing import Optional
+from typing import Optional, Tuple
 from langchain_core.tools import tool
-from src.graph.config import CUSTOMER_DATA_PATH
 
-from src.utils.data import load_customers_data
+from src.tools.inline_async import inline_coroutine
+from src.utils import metrics
+from src.utils.data import MIN_IDENTITY_DETAILS, get_customer_store, iban_key
+from src.utils.normalize import iban_checksum_valid
 
-def _find_customer(customers: list, name: Optional[str] = None, phone: Optional[str] = None, iban: Optional[str] = None):
-    """Helper to find a customer matching provided details. Requires at least one detail to match."""
-    # Note: validation of "at least two details provided" is done in the tool, 
-    # but here we ensure we find a unique customer matching ALL provided non-None details.
-    
-    for customer in customers:
-        is_match = True
-        
-        if name:
-            if customer.get("name", "").lower() != name.strip().lower():
-                is_match = False
-        
-        if phone and is_match:
-            if customer.get("phone", "") != phone.strip():
-                is_match = False
+INVALID_IBAN_MESSAGE = (
+    "Error: The IBAN is not valid (its checksum does not match). "
+    "Ask the customer to double-check it."
+)
+# Start of a successful lookup's result; the secret question follows.
+CUSTOMER_FOUND = "Customer found. Ask this secret question: "
 
-        if iban and is_match:
-            if customer.get("iban", "") != iban.strip():
-                is_match = False
-        
-        if is_match:
-            return customer
-            
-    return None
 
-@tool
-def lookup_customer(name: Optional[str] = None, phone: Optional[str] = None, iban: Optional[str] = None) -> str:
+def _invalid_iban(store, iban: Optional[str]) -> bool:
+    """
+    A malformed or checksum-failing IBAN, so a lookup could never match.
+
+    Legacy records on file with a bad checksum are still accepted; the store
+    lists them when it loads, so rejecting costs no lookup.
+    """
+    if not iban or iban_checksum_valid(iban_key(iban)) or store.has_legacy_iban(iban):
+        return False
+    metrics.increment("greeter.invalid_iban_rejected")
+    return True
+
+@inline_coroutine
+@tool(response_format="content_and_artifact")
+def lookup_customer(name: Optional[str] = None, phone: Optional[str] = None, iban: Optional[str] = None) -> Tuple[str, Optional[str]]:
     """
     Verifies the customer identity using at least two details (name, phone, IBAN).
     You must provide at least two arguments.
     If verified, returns the secret question.
     """
+    # The artifact, kept from the LLM, is the IBAN key of the customer found.
     provided_details = [d for d in [name, phone, iban] if d]
-    if len(provided_details) < 2:
-        return "Error: You must provide at least two details (Name, Phone, IBAN) to verify the customer."
+    if len(provided_details) < MIN_IDENTITY_DETAILS:
+        return "Error: You must provide at least two details (Name, Phone, IBAN) to verify the customer.", None
 
     try:
-        data = load_customers_data()
-        customers = data.get("customers", [])
-        customer = _find_customer(customers, name=name, phone=phone, iban=iban)
+        store = get_customer_store()
+        if _invalid_iban(store, iban):
+            return INVALID_IBAN_MESSAGE, None
+        customer = store.find_customer(name=name, phone=phone, iban=iban)
         
         if customer:
-            return f"Customer found. Ask this secret question: {customer.get('secret')}"
-        return "Customer not found. Please verify the provided details."
+            return f"{CUSTOMER_FOUND}{customer.get('secret')}", iban_key(customer["iban"])
+        return "Customer not found. Please verify the provided details.", None
     except Exception as e:
-        return f"Error looking up customer: {str(e)}"
+        return f"Error looking up customer: {str(e)}", None
 
+@inline_coroutine
 @tool
 def verify_answer(answer: str, name: Optional[str] = None, phone: Optional[str] = None, iban: Optional[str] = None) -> str:
     """
@@ -60,14 +60,14 @@ def verify_answer(answer: str, name: Optional[str] = None, phone: Optional[str]
     Provide the same name, phone, or IBAN used in lookup_customer.
     """
     try:
-        data = load_customers_data()
-        customers = data.get("customers", [])
-
         # We need at least one identifier to find the customer again
         if not any([name, phone, iban]):
              return "Error: Please provide customer details (Name, Phone, or IBAN) to verify the answer."
 
-        customer = _find_customer(customers, name=name, phone=phone, iban=iban)
+        store = get_customer_store()
+        if _invalid_iban(store, iban):
+            return INVALID_IBAN_MESSAGE
+        customer = store.find_customer(name=name, phone=phone, iban=iban)
         
         if not customer:
             return "Customer not found."
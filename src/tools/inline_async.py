@@ -0,0 +1,51 @@
+"""
+Native async support for the agents' tools.
+
+Without a coroutine, ``BaseTool.ainvoke`` hands the sync body to a thread
+pool. Against the in-memory (memory-mapped) customer store the tool bodies
+complete in microseconds, far less than the thread hop, so their
+coroutines run the body directly on the event loop. Until the store is
+open (the body opens, and may build, it first) and for the SQLite backend,
+whose queries wait on disk, the body still runs in a thread.
+
+``tool_exchange`` and ``atool_exchange`` run a tool from code, as the
+call the LLM would have made, for the agents' fast paths.
+"""
+
+import asyncio
+import uuid
+from typing import List
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.tools import BaseTool, StructuredTool
+
+from src.utils.data import customer_store_in_memory
+
+
+def inline_coroutine(tool: StructuredTool) -> StructuredTool:
+    """Give ``tool`` a coroutine that runs its sync body on the event loop when the store is in memory."""
+    func = tool.func
+
+    async def coroutine(*args, **kwargs):
+        if not customer_store_in_memory():
+            return await asyncio.to_thread(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    tool.coroutine = coroutine
+    return tool
+
+
+def _tool_call(tool: BaseTool, args: dict) -> dict:
+    return {"name": tool.name, "args": args, "id": f"call_{uuid.uuid4().hex}", "type": "tool_call"}
+
+
+def tool_exchange(tool: BaseTool, args: dict) -> List[BaseMessage]:
+    """A tool call run in code, recorded as the call the LLM would have made, and its result."""
+    call = _tool_call(tool, args)
+    return [AIMessage(content="", tool_calls=[call]), tool.invoke(call)]
+
+
+async def atool_exchange(tool: BaseTool, args: dict) -> List[BaseMessage]:
+    """Async ``tool_exchange``, through the tool's coroutine."""
+    call = _tool_call(tool, args)
+    return [AIMessage(content="", tool_calls=[call]), await tool.ainvoke(call)]
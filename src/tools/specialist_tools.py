@@ -1,6 +1,8 @@
 from typing import Literal
 from langchain_core.tools import tool
 
+from src.tools.inline_async import inline_coroutine
+
 VALID_CATEGORIES = ["yacht_insurance", "wealth_management", "real_estate", "general_premium"]
 
 EXPERT_CONTACT = {
@@ -10,6 +12,7 @@ EXPERT_CONTACT = {
     "general_premium": "Premium General Support department at +99887766",
 }
 
+@inline_coroutine
 @tool
 def route_to_expert(category: str) -> str:
     """
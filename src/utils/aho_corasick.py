@@ -0,0 +1,157 @@
+"""
+Aho-Corasick automaton over token sequences.
+
+Patterns and text are sequences of 32-bit token hashes (e.g. crc32 of a
+normalized word), so a million-pattern automaton has a few million nodes
+instead of one node per character. The goto function is an open-addressing
+table over (node, token) keys in plain integer arrays, like
+``src.utils.columnar.HashIndex``; failure and output links are per-node
+arrays. Scanning reads each text token once and follows failure links, so
+it is linear in the text length whatever the number of patterns.
+
+Token hashes can collide: callers confirm reported matches against the
+real values.
+"""
+
+from array import array
+from typing import Iterable, Iterator, Sequence, Tuple
+
+_EMPTY_KEY = 0xFFFFFFFFFFFFFFFF
+_NONE = 0xFFFFFFFF
+# Multiplier spreading node ids across slots (node ids are dense small ints).
+_NODE_MIX = 0x9E3779B1
+
+
+class TokenAutomaton:
+    """
+    Multi-pattern matcher for sequences of token hashes.
+
+    Every pattern carries a label (1-255) reported with its matches; the
+    first label given for a repeated pattern is kept.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[Sequence[int], int]]):
+        self._keys = array("Q", [_EMPTY_KEY]) * 1024
+        self._children = array("I", [_NONE]) * 1024
+        self._mask = 1023
+        self._edges = 0
+        self._labels = array("B", [0])
+        self._depths = array("B", [0])
+        self.patterns = 0
+
+        parents = array("I", [0])
+        tokens = array("I", [0])
+        for hashes, label in patterns:
+            node = 0
+            for token in hashes:
+                child = self._goto(node, token)
+                if child == _NONE:
+                    child = len(self._labels)
+                    self._labels.append(0)
+                    self._depths.append(self._depths[node] + 1)
+                    parents.append(node)
+                    tokens.append(token)
+                    self._add_edge(node, token, child)
+                node = child
+            if node and not self._labels[node]:
+                self._labels[node] = label
+                self.patterns += 1
+        self._link(parents, tokens)
+
+    def _goto(self, node: int, token: int) -> int:
+        keys, mask = self._keys, self._mask
+        key = (node << 32) | token
+        slot = (token ^ (node * _NODE_MIX)) & mask
+        while True:
+            found = keys[slot]
+            if found == key:
+                return self._children[slot]
+            if found == _EMPTY_KEY:
+                return _NONE
+            slot = (slot + 1) & mask
+
+    def _add_edge(self, node: int, token: int, child: int) -> None:
+        if 2 * (self._edges + 1) > len(self._keys):
+            self._grow()
+        keys, mask = self._keys, self._mask
+        slot = (token ^ (node * _NODE_MIX)) & mask
+        while keys[slot] != _EMPTY_KEY:
+            slot = (slot + 1) & mask
+        keys[slot] = (node << 32) | token
+        self._children[slot] = child
+        self._edges += 1
+
+    def _grow(self) -> None:
+        old_keys, old_children = self._keys, self._children
+        size = 2 * len(old_keys)
+        self._keys = array("Q", [_EMPTY_KEY]) * size
+        self._children = array("I", [_NONE]) * size
+        self._mask = size - 1
+        self._edges = 0
+        for key, child in zip(old_keys, old_children):
+            if key != _EMPTY_KEY:
+                self._add_edge(key >> 32, key & 0xFFFFFFFF, child)
+
+    def _link(self, parents: array, tokens: array) -> None:
+        """Compute failure and output links, shallowest nodes first."""
+        count = len(self._labels)
+        self._fail = array("I", bytes(4 * count))
+        # Nearest node on the failure chain that ends a pattern (0: none).
+        self._outputs = array("I", bytes(4 * count))
+        by_depth = sorted(range(1, count), key=self._depths.__getitem__)
+        fail, outputs, labels, depths = self._fail, self._outputs, self._labels, self._depths
+        for node in by_depth:
+            if depths[node] == 1:
+                continue
+            token = tokens[node]
+            state = fail[parents[node]]
+            while True:
+                target = self._goto(state, token)
+                if target != _NONE:
+                    break
+                if state == 0:
+                    target = 0
+                    break
+                state = fail[state]
+            fail[node] = target
+            outputs[node] = target if labels[target] else outputs[target]
+
+    def scan(self, hashes: Sequence[int]) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield ``(end, length, label)`` for every pattern occurring in ``hashes``.
+
+        ``end`` is the index of the pattern's last token and ``length`` its
+        number of tokens, so it spans ``hashes[end - length + 1:end + 1]``.
+        """
+        keys, children, mask = self._keys, self._children, self._mask
+        fail, outputs, labels, depths = self._fail, self._outputs, self._labels, self._depths
+        state = 0
+        for end, token in enumerate(hashes):
+            while True:
+                key = (state << 32) | token
+                slot = (token ^ (state * _NODE_MIX)) & mask
+                found = keys[slot]
+                while found != key and found != _EMPTY_KEY:
+                    slot = (slot + 1) & mask
+                    found = keys[slot]
+                if found == key:
+                    state = children[slot]
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            node = state if labels[state] else outputs[state]
+            while node:
+                yield end, depths[node], labels[node]
+                node = outputs[node]
+
+    def __len__(self) -> int:
+        """Number of nodes, the root included."""
+        return len(self._labels)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the goto table and per-node arrays."""
+        return sum(a.itemsize * len(a) for a in (
+            self._keys, self._children, self._labels, self._depths, self._fail, self._outputs,
+        ))
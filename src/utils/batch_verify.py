@@ -0,0 +1,135 @@
+"""
+Batch identity pre-screening.
+
+Checks many candidate identities (name / phone / IBAN) against the customer
+store without going through the agents, using the same rules as the
+greeter's ``lookup_customer``: at least two details must be given and the
+customer must match every detail given. Matched rows also get the account
+tier ``check_account_status`` would report.
+
+Run over a CSV (columns ``name``, ``phone``, ``iban``) or JSONL file with:
+    python -m src.utils.batch_verify calls.csv [-o results.csv]
+
+The output has the input columns plus ``status`` and ``tier``.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional
+
+from src.graph.config import CUSTOMER_DATA_PATH
+from src.utils import metrics
+from src.utils.data import MIN_IDENTITY_DETAILS, account_tier, open_customer_store
+
+MATCH = "MATCH"
+NO_MATCH = "NO_MATCH"
+INSUFFICIENT_DETAILS = "INSUFFICIENT_DETAILS"
+
+_CHUNK_SIZE = 10_000
+
+
+class Verification(NamedTuple):
+    status: str
+    # "Premium", "Regular" or "Non-Client" for matches, None otherwise.
+    tier: Optional[str]
+
+
+# Results are immutable, so every row shares one of these.
+_INSUFFICIENT = Verification(INSUFFICIENT_DETAILS, None)
+_NO_MATCH = Verification(NO_MATCH, None)
+_MATCHES = {premium: Verification(MATCH, account_tier(premium)) for premium in (True, False, None)}
+
+
+def verify_batch(store, identities: Iterable[dict]) -> List[Verification]:
+    """
+    Verify a batch of identities (dicts with optional name, phone and iban).
+
+    Rows with too few details are answered without touching the store; the
+    rest go through one ``match_many`` call.
+    """
+    results: List[Optional[Verification]] = []
+    queries, positions = [], []
+    for identity in identities:
+        details = (identity.get("name") or None, identity.get("phone") or None, identity.get("iban") or None)
+        if (details[0] is not None) + (details[1] is not None) + (details[2] is not None) < MIN_IDENTITY_DETAILS:
+            results.append(_INSUFFICIENT)
+            continue
+        positions.append(len(results))
+        results.append(None)
+        queries.append(details)
+
+    matches = 0
+    for position, (matched, premium) in zip(positions, store.match_many(queries)):
+        if matched:
+            results[position] = _MATCHES[premium]
+            matches += 1
+        else:
+            results[position] = _NO_MATCH
+
+    metrics.increment("batch_verify.rows", len(results))
+    metrics.increment("batch_verify.matches", matches)
+    return results
+
+
+def verify_stream(store, identities: Iterable[dict], chunk_size: int = _CHUNK_SIZE) -> Iterator[dict]:
+    """Verify identities in chunks, yielding each input row with ``status`` and ``tier`` added."""
+    identities = iter(identities)
+    while True:
+        chunk = list(islice(identities, chunk_size))
+        if not chunk:
+            return
+        for identity, result in zip(chunk, verify_batch(store, chunk)):
+            yield {**identity, "status": result.status, "tier": result.tier}
+
+
+def _read_rows(f, fmt: str) -> Iterator[dict]:
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+    else:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _write_rows(f, fmt: str, rows: Iterator[dict]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-screen a batch of candidate identities.")
+    parser.add_argument("input", help="CSV or JSONL file of name/phone/iban records")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the input suffix")
+    parser.add_argument("--data", default=CUSTOMER_DATA_PATH, help="customer data location (CUSTOMER_DATA_PATH)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    store = open_customer_store(args.data)
+    with open(args.input, newline="") as f_in:
+        rows = verify_stream(store, _read_rows(f_in, fmt))
+        if args.output:
+            with open(args.output, "w", newline="") as f_out:
+                count = _write_rows(f_out, fmt, rows)
+        else:
+            count = _write_rows(sys.stdout, fmt, rows)
+    print(f"Verified {count} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Bloom filter for fast negative membership answers.
+
+Used in front of the account index so IBANs that are certainly not DEUS
+accounts are rejected without touching the store. Bit positions come from
+double hashing two crc32 values of the key; the first one is the same
+``stable_hash`` the hash indexes use, so a lookup that goes on to the index
+does not hash the key twice.
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, Tuple
+from zlib import crc32
+
+
+def key_hashes(key: bytes) -> Tuple[int, int]:
+    """The two base hashes of ``key``: its crc32 and the crc32 of its reverse (made odd)."""
+    return crc32(key), crc32(key[::-1]) | 1
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over a bit array.
+
+    ``might_contain`` never returns False for a key that was added; it
+    returns True for a key that was not added with probability
+    ``false_positive_rate``.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits=None, count: int = 0):
+        self._num_bits = num_bits
+        self._num_hashes = num_hashes
+        self._bits = bytearray((num_bits + 7) // 8) if bits is None else bits
+        self._count = count
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """Size a filter for ``capacity`` keys at the target false-positive rate."""
+        capacity = max(capacity, 1)
+        num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    @classmethod
+    def from_hashes(cls, hashes: Iterable[Tuple[int, int]], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        """Build a filter from precomputed ``key_hashes`` pairs."""
+        bloom = cls.for_capacity(capacity, error_rate)
+        bits, num_bits, num_hashes = bloom._bits, bloom._num_bits, bloom._num_hashes
+        count = 0
+        for h1, h2 in hashes:
+            for i in range(num_hashes):
+                position = (h1 + i * h2) % num_bits
+                bits[position >> 3] |= 1 << (position & 7)
+            count += 1
+        bloom._count = count
+        return bloom
+
+    def add(self, hashes: Tuple[int, int]) -> None:
+        h1, h2 = hashes
+        for i in range(self._num_hashes):
+            position = (h1 + i * h2) % self._num_bits
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def might_contain(self, hashes: Tuple[int, int]) -> bool:
+        h1, h2 = hashes
+        bits, num_bits = self._bits, self._num_bits
+        for i in range(self._num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        """Number of keys added."""
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate for the keys added so far."""
+        return (1 - math.exp(-self._num_hashes * self._count / self._num_bits)) ** self._num_hashes
+
+    def buffers(self) -> Dict[str, object]:
+        return {"bits": self._bits, "params": array("Q", [self._num_bits, self._num_hashes, self._count])}
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, memoryview]) -> "BloomFilter":
+        num_bits, num_hashes, count = buffers["params"].cast("Q")
+        return cls(num_bits, num_hashes, buffers["bits"], count)
@@ -0,0 +1,335 @@
+"""
+Compact columnar storage primitives for large customer files.
+
+Strings are packed into one UTF-8 buffer addressed by integer offsets,
+low-cardinality strings are dictionary-encoded, and lookups go through
+open-addressing hash tables over plain integer arrays. Together with the
+streaming JSON reader this keeps per-record overhead to a few dozen bytes
+instead of a Python dict per record.
+"""
+
+import json
+import re
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+# Marks an unused slot in a HashIndex table.
+EMPTY = 0xFFFFFFFF
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def stable_hash(key: str) -> int:
+    """32-bit hash that is identical across processes (unlike ``hash``)."""
+    return zlib.crc32(key.encode("utf-8"))
+
+
+class StringColumn:
+    """
+    Append-only column of strings stored back to back in one buffer.
+
+    The buffers can also be read-only views (e.g. over an mmap'd snapshot),
+    in which case the column is only read from.
+    """
+
+    def __init__(self, data=None, offsets=None):
+        self._data = bytearray() if data is None else data
+        self._offsets = array("Q", [0]) if offsets is None else offsets
+
+    def append(self, value: str) -> None:
+        self._data += value.encode("utf-8")
+        self._offsets.append(len(self._data))
+
+    def extend(self, values: List[str]) -> None:
+        """Append a batch of strings with one buffer copy."""
+        encoded = [value.encode("utf-8") for value in values]
+        ends = accumulate(map(len, encoded), initial=len(self._data))
+        next(ends)
+        self._data += b"".join(encoded)
+        self._offsets.extend(ends)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> str:
+        offsets = self._offsets
+        return str(self._data[offsets[row]:offsets[row + 1]], "utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets = self._data, self._offsets
+        return (str(data[start:end], "utf-8") for start, end in zip(offsets, offsets[1:]))
+
+    def buffers(self) -> Dict[str, object]:
+        return {"data": self._data, "offsets": self._offsets}
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, memoryview]) -> "StringColumn":
+        return cls(buffers["data"], buffers["offsets"].cast("Q"))
+
+
+class CategoricalColumn:
+    """Dictionary-encoded column for values that repeat across many rows."""
+
+    def __init__(self):
+        self._values = []
+        self._codes_by_value = {}
+        self._codes = array("I")
+
+    def append(self, value: str) -> None:
+        code = self._codes_by_value.get(value)
+        if code is None:
+            code = len(self._values)
+            self._values.append(value)
+            self._codes_by_value[value] = code
+        self._codes.append(code)
+
+    def extend(self, values: List[str]) -> None:
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self._values[self._codes[row]]
+
+    def buffers(self) -> Dict[str, object]:
+        values = StringColumn()
+        values.extend(self._values)
+        return {**{f"values.{k}": v for k, v in values.buffers().items()}, "codes": self._codes}
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, memoryview]) -> "CategoricalColumn":
+        values = StringColumn.from_buffers({
+            "data": buffers["values.data"], "offsets": buffers["values.offsets"],
+        })
+        column = cls()
+        column._values = [values[i] for i in range(len(values))]
+        column._codes_by_value = {value: code for code, value in enumerate(column._values)}
+        column._codes = buffers["codes"].cast("I")
+        return column
+
+
+class HashIndex:
+    """
+    Open-addressing (linear probing) table from key hash to row ids.
+
+    Built in one pass from the per-row key hashes. Rows sharing a key are
+    returned in insertion order, so "first match in file order" still holds.
+    Callers must confirm candidates against the row data, since different
+    keys can share a 32-bit hash.
+    """
+
+    def __init__(self, hashes: array):
+        size = 8
+        while size < 2 * len(hashes):
+            size <<= 1
+        mask = size - 1
+
+        slots = array("I", [EMPTY]) * size
+        for row, key_hash in enumerate(hashes):
+            slot = key_hash & mask
+            while slots[slot] != EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = row
+
+        self._hashes = hashes
+        self._slots = slots
+        self._mask = mask
+
+    def buffers(self) -> Dict[str, object]:
+        return {"slots": self._slots, "hashes": self._hashes}
+
+    @classmethod
+    def from_buffers(cls, buffers: Dict[str, memoryview]) -> "HashIndex":
+        """Attach to a table built earlier, e.g. read from a snapshot."""
+        index = cls.__new__(cls)
+        index._slots = buffers["slots"].cast("I")
+        index._hashes = buffers["hashes"].cast("I")
+        index._mask = len(index._slots) - 1
+        return index
+
+    def rows(self, key_hash: int) -> Iterator[int]:
+        """Yield candidate rows whose key hash equals ``key_hash``."""
+        slots, hashes, mask = self._slots, self._hashes, self._mask
+        slot = key_hash & mask
+        row = slots[slot]
+        while row != EMPTY:
+            if hashes[row] == key_hash:
+                yield row
+            slot = (slot + 1) & mask
+            row = slots[slot]
+
+    def find(self, key_hash: int, accept: Callable[[int], bool]) -> int:
+        """First candidate row for ``key_hash`` that ``accept`` confirms, or EMPTY."""
+        slots, hashes, mask = self._slots, self._hashes, self._mask
+        slot = key_hash & mask
+        row = slots[slot]
+        while row != EMPTY:
+            if hashes[row] == key_hash and accept(row):
+                return row
+            slot = (slot + 1) & mask
+            row = slots[slot]
+        return EMPTY
+
+
+class _JsonStream:
+    """Incremental tokenizer over a text file, decoding one JSON value at a time."""
+
+    def __init__(self, f, chunk_size: int):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping the already-consumed prefix."""
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            buf = self._buf
+            pos = _WHITESPACE.match(buf, self._pos).end()
+            self._pos = pos
+            if pos < len(buf):
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A scalar ending exactly at the buffer edge may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array_items(self) -> Iterator[object]:
+        """
+        Yield the elements of the array whose opening '[' was just consumed.
+
+        This is the hot loop of the loader, so it works on the buffer
+        directly and decodes whole runs of elements per chunk when it can.
+        """
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        decode = self._decoder.raw_decode
+        skip = _WHITESPACE.match
+        failed_buf = None
+        while True:
+            buf = self._buf
+            pos = skip(buf, self._pos).end()
+
+            # Fast path: decode every complete object element in the buffer
+            # with a single call. A cut that lands inside a string, a nested
+            # value or past the end of the array cannot parse, so a failure
+            # falls through to the slow path until the next refill.
+            cut = buf.rfind("}", pos) + 1 if buf is not failed_buf else 0
+            if cut:
+                sep = skip(buf, cut).end()
+                if sep < len(buf) and buf[sep] in ",]":
+                    try:
+                        values = json.loads("[" + buf[pos:cut] + "]")
+                    except json.JSONDecodeError:
+                        values = None
+                        failed_buf = buf
+                    if values is not None:
+                        yield from values
+                        self._pos = sep + 1
+                        if buf[sep] == "]":
+                            return
+                        continue
+
+            # Slow path: one element at a time.
+            try:
+                value, end = decode(buf, pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # The separator must be in the buffer too; otherwise the value
+            # may be cut short (e.g. a number) or the file is truncated.
+            sep = skip(buf, end).end()
+            if sep >= len(buf):
+                self._pos = pos
+                if not self._fill():
+                    raise ValueError("Unterminated array in JSON stream")
+                continue
+
+            yield value
+            if buf[sep] == "]":
+                self._pos = sep + 1
+                return
+            if buf[sep] != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON stream, found {buf[sep]!r}")
+            self._pos = sep + 1
+
+
+def iter_json_arrays(
+    f,
+    keys: Iterable[str],
+    chunk_size: int = 1 << 20,
+) -> Iterator[Tuple[str, object]]:
+    """
+    Stream the elements of top-level arrays from a JSON object.
+
+    Only one element is materialized at a time; other top-level values are
+    decoded and discarded.
+
+    Args:
+        f: Text file positioned at the start of a JSON object.
+        keys: Top-level keys whose array elements should be yielded.
+        chunk_size: Number of characters read per chunk.
+
+    Yields:
+        (key, element) pairs in file order.
+    """
+    keys = set(keys)
+    stream = _JsonStream(f, chunk_size)
+
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key in keys and stream.peek() == "[":
+            stream.expect("[")
+            for item in stream.array_items():
+                yield key, item
+        else:
+            stream.value()
+
+        if stream.peek() != ",":
+            stream.expect("}")
+            return
+        stream.expect(",")
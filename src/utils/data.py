@@ -1,28 +1,680 @@
 """
 Customer data loading and management.
 
-Provides functions to load and access customer data from JSON files.
+Provides functions to load and access customer data from JSON files, and a
+hash-indexed ``CustomerStore`` so tools resolve customers and accounts in
+O(1) instead of scanning the full record lists on every call. The store is
+built by streaming the file into compact columns, so multi-GB exports never
+have to be held in memory as Python dicts.
 """
 
-import json
+import logging
+import os
+import threading
+import time
+from array import array
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from zlib import crc32
 
-from src.graph.config import CUSTOMER_DATA_PATH
-
-# Cache for loaded customer data
-_customers_data = None
-
-
-def load_customers_data() -> dict:
-    """Load customer data from JSON file."""
-    global _customers_data
-    if _customers_data is None:
-        data_path = Path(CUSTOMER_DATA_PATH)
-        if not data_path.is_absolute():
-            # Resolve relative to project root
-            project_root = Path(__file__).parent.parent.parent
-            data_path = project_root / data_path
-        
-        with open(data_path, "r") as f:
-            _customers_data = json.load(f)
-    return _customers_data
+from src.graph.config import (
+    CUSTOMER_DATA_PATH,
+    CUSTOMER_DATA_RELOAD_INTERVAL,
+    CUSTOMER_FUZZY_NAME_MIN_SIMILARITY,
+    CUSTOMER_SNAPSHOT_ATTACH_TIMEOUT,
+    CUSTOMER_SNAPSHOT_ENABLED,
+    CUSTOMER_SNAPSHOT_MODE,
+    CUSTOMER_SNAPSHOT_PATH,
+)
+from src.utils import metrics
+from src.utils.bloom import BloomFilter, key_hashes
+from src.utils.normalize import canonical_iban, canonical_phone, iban_checksum_valid
+from src.utils.trigram import TrigramIndex, similarity
+from src.utils.columnar import (
+    EMPTY,
+    CategoricalColumn,
+    HashIndex,
+    StringColumn,
+    iter_json_arrays,
+    stable_hash,
+)
+
+_reloader = None
+_reloader_lock = threading.Lock()
+_reload_listeners: List[Callable[[object], None]] = []
+
+logger = logging.getLogger(__name__)
+
+# Separator between the parts of a composite index key.
+_SEPARATOR = b"\x1f"
+_SEPARATOR_STR = _SEPARATOR.decode()
+
+_CUSTOMER_INDEXES = ("name", "phone", "iban", "name_phone", "name_iban", "phone_iban")
+_BUILD_BATCH_SIZE = 4096
+# Identity details (of name, phone, IBAN) a caller must give before we reveal
+# anything about a customer.
+MIN_IDENTITY_DETAILS = 2
+# Target false-positive rate of the account IBAN filter (~1.2 bytes per account).
+ACCOUNT_FILTER_ERROR_RATE = 0.01
+
+
+def name_key(name: str) -> str:
+    """Index key for a customer name (case-insensitive)."""
+    return name.strip().casefold()
+
+
+def phone_key(phone: str) -> str:
+    """Index key for a phone number: its canonical E.164-style form."""
+    return canonical_phone(phone)
+
+
+def iban_key(iban: str) -> str:
+    """Index key for an IBAN: its canonical electronic form."""
+    return canonical_iban(iban)
+
+
+def _composite(*keys: str) -> str:
+    """Join normalized keys into a single composite index key."""
+    return _SEPARATOR_STR.join(keys)
+
+
+def _records_from_dict(data: dict) -> Iterator[Tuple[str, dict]]:
+    for customer in data.get("customers", []):
+        yield "customers", customer
+    for account in data.get("accounts", []):
+        yield "accounts", account
+
+
+class CustomerStore:
+    """
+    Read-only, hash-indexed view over the customer and account records.
+
+    Records are kept in compact columns (see ``src.utils.columnar``) rather
+    than one dict per record. Indexes are built once at load time: by IBAN,
+    phone and name, and by the composite name+phone, name+IBAN and
+    phone+IBAN keys. Lookups return the first record (in file order) matching
+    every provided detail, which is the rule the tools always applied. A
+    Bloom filter over account IBANs answers most "not a DEUS account"
+    checks without probing the account index.
+
+    A misspelt name is tolerated only when the phone or IBAN matches
+    exactly: among the rows with that phone/IBAN, the most similar name
+    (by trigram similarity) is accepted.
+
+    IBANs on file that fail the checksum (records older than the check) are
+    listed at load time, so ``has_legacy_iban`` needs no lookup.
+    """
+
+    def __init__(self, data: dict):
+        self._build(_records_from_dict(data))
+
+    @classmethod
+    def from_json(cls, path) -> "CustomerStore":
+        """Build a store by streaming a customers JSON file, one record at a time."""
+        store = cls.__new__(cls)
+        with open(path, "r") as f:
+            store._build(iter_json_arrays(f, ("customers", "accounts")))
+        return store
+
+    def _build(self, records: Iterable[Tuple[str, dict]]) -> None:
+        self._names = StringColumn()
+        self._phones = StringColumn()
+        self._ibans = StringColumn()
+        self._secrets = CategoricalColumn()
+        self._answers = StringColumn()
+        self._legacy_ibans = StringColumn()
+        self._account_ibans = StringColumn()
+        self._premium = bytearray()
+
+        self._hashes = {index: array("I") for index in _CUSTOMER_INDEXES}
+        self._account_hashes = array("I")
+        self._account_second_hashes = array("I")
+
+        # Records are processed in batches so the per-field work runs in
+        # comprehensions and C-level extends rather than per-record calls.
+        customers, accounts = [], []
+        for kind, record in records:
+            if kind == "customers":
+                customers.append(record)
+                if len(customers) >= _BUILD_BATCH_SIZE:
+                    self._add_customers(customers)
+                    customers = []
+            elif kind == "accounts":
+                accounts.append(record)
+                if len(accounts) >= _BUILD_BATCH_SIZE:
+                    self._add_accounts(accounts)
+                    accounts = []
+        self._add_customers(customers)
+        self._add_accounts(accounts)
+
+        for index, hashes in self._hashes.items():
+            setattr(self, f"_by_{index}", HashIndex(hashes))
+        self._accounts_by_iban = HashIndex(self._account_hashes)
+        self._account_filter = BloomFilter.from_hashes(
+            zip(self._account_hashes, self._account_second_hashes),
+            len(self._account_hashes),
+            ACCOUNT_FILTER_ERROR_RATE,
+        )
+        del self._hashes, self._account_hashes, self._account_second_hashes
+        self._legacy_iban_keys = frozenset(self._legacy_ibans)
+
+    def _add_customers(self, batch: List[dict]) -> None:
+        names = [record.get("name", "") for record in batch]
+        phones = [record.get("phone", "") for record in batch]
+        ibans = [record.get("iban", "") for record in batch]
+        self._names.extend(names)
+        self._phones.extend(phones)
+        self._ibans.extend(ibans)
+        self._secrets.extend([record.get("secret", "") for record in batch])
+        self._answers.extend([record.get("answer", "") for record in batch])
+
+        name_keys = [name_key(name).encode("utf-8") for name in names]
+        phone_keys = [phone_key(phone).encode("utf-8") for phone in phones]
+        canonical_ibans = [iban_key(iban) for iban in ibans]
+        self._legacy_ibans.extend(
+            [iban for iban in canonical_ibans if iban and not iban_checksum_valid(iban)]
+        )
+        iban_keys = [iban.encode("utf-8") for iban in canonical_ibans]
+        name_hashes = list(map(crc32, name_keys))
+        phone_hashes = list(map(crc32, phone_keys))
+
+        # crc32 is incremental, so composite hashes extend the single-key
+        # ones instead of re-hashing the joined key.
+        suffixed_phones = [_SEPARATOR + phone for phone in phone_keys]
+        suffixed_ibans = [_SEPARATOR + iban for iban in iban_keys]
+        hashes = self._hashes
+        hashes["name"].extend(name_hashes)
+        hashes["phone"].extend(phone_hashes)
+        hashes["iban"].extend(map(crc32, iban_keys))
+        hashes["name_phone"].extend(map(crc32, suffixed_phones, name_hashes))
+        hashes["name_iban"].extend(map(crc32, suffixed_ibans, name_hashes))
+        hashes["phone_iban"].extend(map(crc32, suffixed_ibans, phone_hashes))
+
+    def _add_accounts(self, batch: List[dict]) -> None:
+        ibans = [iban_key(record.get("iban", "")) for record in batch]
+        self._account_ibans.extend(ibans)
+        self._premium.extend([bool(record.get("premium", False)) for record in batch])
+        hashes = [key_hashes(iban.encode("utf-8")) for iban in ibans]
+        self._account_hashes.extend([h1 for h1, _ in hashes])
+        self._account_second_hashes.extend([h2 for _, h2 in hashes])
+
+    def sections(self) -> Dict[str, object]:
+        """Flat name -> buffer mapping of every column and index table (see snapshot.py)."""
+        sections = {"premium": self._premium}
+        for name, part in self._parts():
+            for key, buffer in getattr(self, f"_{name}").buffers().items():
+                sections[f"{name}.{key}"] = buffer
+        return sections
+
+    @classmethod
+    def from_sections(cls, sections: Dict[str, memoryview]) -> "CustomerStore":
+        """Attach a store to buffers written by ``sections``, without copying them."""
+        store = cls.__new__(cls)
+        store._premium = sections["premium"]
+        for name, part in cls._parts():
+            prefix = f"{name}."
+            buffers = {key[len(prefix):]: view for key, view in sections.items() if key.startswith(prefix)}
+            setattr(store, f"_{name}", part.from_buffers(buffers))
+        store._legacy_iban_keys = frozenset(store._legacy_ibans)
+        return store
+
+    @staticmethod
+    def _parts():
+        for name in ("names", "phones", "ibans", "answers", "legacy_ibans", "account_ibans"):
+            yield name, StringColumn
+        yield "secrets", CategoricalColumn
+        for index in _CUSTOMER_INDEXES:
+            yield f"by_{index}", HashIndex
+        yield "accounts_by_iban", HashIndex
+        yield "account_filter", BloomFilter
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def account_filter(self) -> BloomFilter:
+        return self._account_filter
+
+    def identities(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (name, phone, IBAN) of every customer, in file order."""
+        return zip(self._names, self._phones, self._ibans)
+
+    def has_legacy_iban(self, iban: str) -> bool:
+        """Whether a customer on file has this IBAN although it fails the checksum."""
+        return iban_key(iban) in self._legacy_iban_keys
+
+    def _customer(self, row: int) -> dict:
+        return {
+            "name": self._names[row],
+            "phone": self._phones[row],
+            "iban": self._ibans[row],
+            "secret": self._secrets[row],
+            "answer": self._answers[row],
+        }
+
+    def _row_matches(self, row: int, name, phone, iban) -> bool:
+        return (
+            (name is None or name_key(self._names[row]) == name)
+            and (phone is None or phone_key(self._phones[row]) == phone)
+            and (iban is None or iban_key(self._ibans[row]) == iban)
+        )
+
+    def find_customer(
+        self,
+        name: Optional[str] = None,
+        phone: Optional[str] = None,
+        iban: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Find the customer matching ALL provided (non-empty) details.
+
+        Returns:
+            The customer record, or None if nothing matches or no detail was given.
+        """
+        row = self._match_row(name, phone, iban)
+        if row is None and name and (phone or iban):
+            row = self._fuzzy_name_row(name, phone, iban)
+        return None if row is None else self._customer(row)
+
+    def _fuzzy_name_row(self, name, phone, iban) -> Optional[int]:
+        """
+        Row whose phone/IBAN match exactly and whose name is the most similar
+        to ``name``, if it reaches CUSTOMER_FUZZY_NAME_MIN_SIMILARITY.
+        """
+        name = name_key(name)
+        phone = phone_key(phone) if phone else None
+        iban = iban_key(iban) if iban else None
+        if phone and iban:
+            index, key = self._by_phone_iban, _composite(phone, iban)
+        elif phone:
+            index, key = self._by_phone, phone
+        else:
+            index, key = self._by_iban, iban
+
+        best_row, best_score = None, CUSTOMER_FUZZY_NAME_MIN_SIMILARITY
+        for row in index.rows(stable_hash(key)):
+            if not self._row_matches(row, None, phone, iban):
+                continue
+            score = similarity(name, name_key(self._names[row]))
+            # Strictly better only, so ties go to the first row in file order.
+            if score > best_score or (best_row is None and score == best_score):
+                best_row, best_score = row, score
+        if best_row is not None:
+            metrics.increment("customer_data.fuzzy_name_matches")
+        return best_row
+
+    def search_names(self, name: str, limit: int = 5, min_similarity: float = 0.3) -> List[Tuple[float, dict]]:
+        """
+        Customers whose name is most similar to ``name``, best first.
+
+        Backed by a trigram index built on first use. Meant for back-office
+        tooling; identity checks never match on a name alone.
+        """
+        index = getattr(self, "_name_trigrams", None)
+        if index is None:
+            names = self._names
+            index = self._name_trigrams = TrigramIndex(name_key(names[row]) for row in range(len(names)))
+        results = index.search(name_key(name), lambda row: name_key(self._names[row]), limit, min_similarity)
+        return [(score, self._customer(row)) for score, row in results]
+
+    def _match_row(self, name, phone, iban) -> Optional[int]:
+        name = name_key(name) if name else None
+        phone = phone_key(phone) if phone else None
+        iban = iban_key(iban) if iban else None
+
+        if phone and iban:
+            index, key = self._by_phone_iban, _composite(phone, iban)
+        elif name and phone:
+            index, key = self._by_name_phone, _composite(name, phone)
+        elif name and iban:
+            index, key = self._by_name_iban, _composite(name, iban)
+        elif name:
+            index, key = self._by_name, name
+        elif phone:
+            index, key = self._by_phone, phone
+        elif iban:
+            index, key = self._by_iban, iban
+        else:
+            return None
+
+        for row in index.rows(stable_hash(key)):
+            if self._row_matches(row, name, phone, iban):
+                return row
+        return None
+
+    def _account_row(self, iban: str) -> Optional[int]:
+        """Row of the first account with this IBAN key, or None."""
+        hashes = key_hashes(iban.encode("utf-8"))
+        if not self._account_filter.might_contain(hashes):
+            return None
+        for row in self._accounts_by_iban.rows(hashes[0]):
+            if self._account_ibans[row] == iban:
+                return row
+        return None
+
+    def match_many(
+        self, queries: Iterable[Tuple[Optional[str], Optional[str], Optional[str]]],
+    ) -> Iterator[Tuple[bool, Optional[bool]]]:
+        """
+        Batch form of ``find_customer`` followed by ``is_premium``.
+
+        For each (name, phone, iban) query, yields whether a customer
+        matches every provided detail and, if so, the premium flag of that
+        customer's account (None when it has none). No record dicts are
+        built and no per-lookup metrics are recorded.
+        """
+        # Hot loop: indexes are probed directly rather than through
+        # _match_row/_account_row, and hashes are computed a batch at a time.
+        keyed = []
+        for name, phone, iban in queries:
+            # Same normalization as name_key/phone_key/iban_key.
+            name = name.strip().casefold() if name else None
+            phone = canonical_phone(phone) if phone else None
+            iban = canonical_iban(iban) if iban else None
+            if phone and iban:
+                index, key = self._by_phone_iban, phone + _SEPARATOR_STR + iban
+            elif name and phone:
+                index, key = self._by_name_phone, name + _SEPARATOR_STR + phone
+            elif name and iban:
+                index, key = self._by_name_iban, name + _SEPARATOR_STR + iban
+            elif name:
+                index, key = self._by_name, name
+            elif phone:
+                index, key = self._by_phone, phone
+            elif iban:
+                index, key = self._by_iban, iban
+            else:
+                index, key = None, ""
+            keyed.append((index, key, name, phone, iban))
+
+        names, phones, ibans, premium = self._names, self._phones, self._ibans, self._premium
+        accounts = self._accounts_by_iban
+        account_ibans = self._account_ibans
+        fuzzy_name_row = self._fuzzy_name_row
+
+        key_hashes_ = map(crc32, [key.encode("utf-8") for _, key, _, _, _ in keyed])
+        for (index, _, name, phone, iban), key_hash in zip(keyed, key_hashes_):
+            if index is None:
+                yield False, None
+                continue
+            row = index.find(key_hash, lambda row: (
+                (name is None or names[row].strip().casefold() == name)
+                and (phone is None or canonical_phone(phones[row]) == phone)
+                and (iban is None or canonical_iban(ibans[row]) == iban)
+            ))
+            if row == EMPTY and name and (phone or iban):
+                row = fuzzy_name_row(name, phone, iban)
+                if row is None:
+                    row = EMPTY
+            if row == EMPTY:
+                yield False, None
+                continue
+
+            account_iban = iban if iban is not None else canonical_iban(ibans[row])
+            account = accounts.find(
+                crc32(account_iban.encode("utf-8")), lambda account: account_ibans[account] == account_iban,
+            )
+            yield True, None if account == EMPTY else bool(premium[account])
+
+    def is_premium(self, iban: str) -> Optional[bool]:
+        """
+        Return the premium flag of the account with this IBAN.
+
+        Returns:
+            True/False for known accounts, None if the IBAN is not a DEUS account.
+        """
+        iban = iban_key(iban)
+        hashes = key_hashes(iban.encode("utf-8"))
+        if not self._account_filter.might_contain(hashes):
+            metrics.increment("account_filter.negatives")
+            return None
+        # First account wins, matching the previous linear scan.
+        for row in self._accounts_by_iban.rows(hashes[0]):
+            if self._account_ibans[row] == iban:
+                metrics.increment("account_filter.positives")
+                return bool(self._premium[row])
+        metrics.increment("account_filter.false_positives")
+        return None
+
+
+def account_tier(premium: Optional[bool]) -> str:
+    """Account tier reported to agents for an ``is_premium`` result."""
+    if premium is None:
+        return "Non-Client"
+    return "Premium" if premium else "Regular"
+
+
+def split_location(location: str) -> Tuple[str, Path]:
+    """
+    Split a CUSTOMER_DATA_PATH into its backend scheme and file path.
+
+    Plain paths are JSON files. URLs follow the SQLAlchemy convention:
+    ``sqlite:///data/customers.db`` is relative to the project root and
+    ``sqlite:////srv/customers.db`` is absolute.
+    """
+    scheme, separator, rest = location.partition("://")
+    if not separator:
+        scheme, rest = "json", location
+    elif rest.startswith("/"):
+        rest = rest[1:]
+
+    data_path = Path(rest)
+    if not data_path.is_absolute():
+        # Resolve relative to project root
+        project_root = Path(__file__).parent.parent.parent
+        data_path = project_root / data_path
+    return scheme, data_path
+
+
+def _resolve_data_path() -> Path:
+    scheme, data_path = split_location(CUSTOMER_DATA_PATH)
+    if scheme != "json":
+        raise ValueError(f"CUSTOMER_DATA_PATH is not a JSON file: {CUSTOMER_DATA_PATH}")
+    return data_path
+
+
+def _open_json(path: Path):
+    if not CUSTOMER_SNAPSHOT_ENABLED:
+        return CustomerStore.from_json(path)
+
+    from src.utils.snapshot import attach_snapshot, default_snapshot_path, open_or_build
+
+    snapshot_path = default_snapshot_path(path, CUSTOMER_SNAPSHOT_PATH)
+    if CUSTOMER_SNAPSHOT_MODE == "attach":
+        return attach_snapshot(snapshot_path, CUSTOMER_SNAPSHOT_ATTACH_TIMEOUT)
+    try:
+        return open_or_build(path, snapshot_path)
+    except OSError:
+        # e.g. a read-only data directory: still serve, just without the snapshot.
+        logger.warning("Could not use a customer snapshot for %s; loading the JSON directly", path, exc_info=True)
+        return CustomerStore.from_json(path)
+
+
+def _watched_path(location: str) -> Path:
+    """The file whose changes should trigger a reload of ``location``."""
+    scheme, path = split_location(location)
+    if scheme == "json" and CUSTOMER_SNAPSHOT_ENABLED and CUSTOMER_SNAPSHOT_MODE == "attach":
+        # The publisher owns the JSON; workers follow the snapshot it writes.
+        from src.utils.snapshot import default_snapshot_path
+
+        return default_snapshot_path(path, CUSTOMER_SNAPSHOT_PATH)
+    return path
+
+
+def _open_sqlite(path: Path):
+    from src.utils.sqlite_store import SqliteCustomerStore
+
+    return SqliteCustomerStore(path)
+
+
+# Storage backends by CUSTOMER_DATA_PATH scheme. Each opener takes the
+# resolved path and returns an object with the CustomerStore lookup API.
+BACKENDS = {
+    "json": _open_json,
+    "sqlite": _open_sqlite,
+}
+
+
+def open_customer_store(location: str):
+    """Open the customer store for a CUSTOMER_DATA_PATH-style location."""
+    scheme, data_path = split_location(location)
+    try:
+        opener = BACKENDS[scheme]
+    except KeyError:
+        raise ValueError(f"Unsupported customer data backend: {scheme!r}") from None
+    return opener(data_path)
+
+
+def _record_store_metrics(store) -> None:
+    account_filter = getattr(store, "account_filter", None)
+    if account_filter is not None:
+        metrics.set_gauge("account_filter.size_bytes", account_filter.size_bytes)
+        metrics.set_gauge("account_filter.false_positive_rate", account_filter.false_positive_rate)
+
+
+class CustomerDataReloader:
+    """
+    Holds the current customer store and swaps in a new one when the data changes.
+
+    A background thread polls the file's inode, mtime and size. When they
+    change and then stay the same for one more poll (so a file still being
+    written is not picked up), a new store is built on that thread and
+    published with a single reference assignment. Callers that already
+    hold the previous store keep reading that consistent snapshot.
+
+    Exposes ``customer_data.reload_count``, ``customer_data.last_reload_seconds``
+    and ``customer_data.snapshot_version`` through ``src.utils.metrics``.
+    """
+
+    def __init__(self, location: str, interval: float = 0):
+        self._location = location
+        self._path = _watched_path(location)
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._signature = self._stat()
+        self._pending = self._signature
+        self._store = open_customer_store(location)
+        self.version = 1
+        _record_store_metrics(self._store)
+        metrics.set_gauge("customer_data.snapshot_version", self.version)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def current(self):
+        """Return the current store snapshot."""
+        return self._store
+
+    def check_for_update(self) -> bool:
+        """
+        Poll the data file once and reload it if it changed and has settled.
+
+        Returns:
+            True if a new store was swapped in.
+        """
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            self._pending = signature
+            return False
+        if signature != self._pending:
+            # Changed since the last poll: wait until it is stable.
+            self._pending = signature
+            return False
+
+        # Remember the attempt either way, so a bad file is not retried every poll.
+        self._signature = signature
+        start = time.perf_counter()
+        try:
+            store = open_customer_store(self._location)
+        except Exception:
+            metrics.increment("customer_data.reload_errors")
+            logger.exception("Reloading customer data from %s failed; keeping the previous snapshot", self._path)
+            return False
+        duration = time.perf_counter() - start
+
+        self._store = store
+        self.version += 1
+        _record_store_metrics(store)
+        metrics.increment("customer_data.reload_count")
+        metrics.set_gauge("customer_data.last_reload_seconds", duration)
+        metrics.set_gauge("customer_data.snapshot_version", self.version)
+        logger.info("Reloaded customer data from %s in %.2fs (version %d)", self._path, duration, self.version)
+        for listener in list(_reload_listeners):
+            try:
+                listener(store)
+            except Exception:
+                logger.exception("Customer data reload listener %r failed", listener)
+        return True
+
+    def start(self) -> None:
+        """Start polling on a daemon thread (no-op when the interval is 0)."""
+        if self._interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="customer-data-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.check_for_update()
+
+
+def add_reload_listener(listener: Callable[[object], None]) -> None:
+    """
+    Call ``listener(store)`` after every customer data reload.
+
+    Listeners run on the reloader thread, after the new store is published,
+    so state derived from the data can be refreshed off the request path.
+    """
+    _reload_listeners.append(listener)
+
+
+def customer_store_in_memory() -> bool:
+    """
+    Whether the customer store is open and held in memory (or memory-mapped),
+    so its lookups return without loading the store or waiting on a database.
+    """
+    return _reloader is not None and isinstance(_reloader.current(), CustomerStore)
+
+
+def get_customer_store():
+    """
+    Return the current customer store snapshot, opening it on first use.
+
+    The backend is chosen by the scheme of CUSTOMER_DATA_PATH. JSON files are
+    served from a memory-mapped snapshot (see ``src.utils.snapshot``), built
+    by streaming the JSON into the columnar store whenever its checksum
+    changes; ``sqlite://`` databases are queried in place. The data
+    file is watched and reloaded every CUSTOMER_DATA_RELOAD_INTERVAL seconds.
+    Callers should fetch the store once per operation so every lookup in it
+    reads the same snapshot.
+    """
+    global _reloader
+    if _reloader is None:
+        with _reloader_lock:
+            if _reloader is None:
+                reloader = CustomerDataReloader(CUSTOMER_DATA_PATH, CUSTOMER_DATA_RELOAD_INTERVAL)
+                reloader.start()
+                _reloader = reloader
+    return _reloader.current()
+
+
+def load_customers_data():
+    """
+    Return the customer store, as ``get_customer_store`` does.
+
+    Kept as the original entry point to the customer data; it now returns
+    the indexed store rather than the raw JSON dict.
+    """
+    return get_customer_store()
@@ -0,0 +1,90 @@
+"""
+Identity details in free text: IBAN, phone number and name.
+
+``extract_identity`` pulls what a customer typically writes when asked to
+identify themselves ("Hi, I'm Lisa, my number is +1 122 334 455") out of a
+message with a few regular expressions, so the details can be looked up
+without asking the LLM to read them first. Values are returned as
+written; the customer indexes normalize them on lookup.
+
+Extraction only has to be right often, not always: a wrong candidate just
+fails the lookup, and the message then goes to the LLM as before.
+"""
+
+import re
+from typing import NamedTuple, Optional
+
+# Country code, check digits and 11-30 BBAN characters, written either in
+# one piece or in groups of four (after the first, groups must hold a digit,
+# so the words that follow are not taken for part of it).
+_IBAN = re.compile(
+    r"\b[A-Z]{2}\d{2}(?:[A-Z0-9]{11,30}"
+    r"| [A-Z0-9]{4}(?: (?=[A-Z0-9]{0,3}\d)[A-Z0-9]{4}){1,6}(?: \d[A-Z0-9]{0,3})?)\b",
+    re.IGNORECASE,
+)
+# An optional "+" or "00", then digits with the usual separators; 7-15 digits in all.
+_PHONE = re.compile(r"(?<![\w+])\+?\(?\d(?:[\d \-.()]*\d)?")
+_MIN_PHONE_DIGITS = 7
+_MAX_PHONE_DIGITS = 15
+
+# "my name is Lisa", "I'm John Smith", "name: Maria Garcia", "this is Lisa"
+_NAME_CUE = re.compile(r"\b(?:my name is|name is|name:|i am|i'm|i’m|this is|it's|it’s)\s+", re.IGNORECASE)
+_NAME_WORD = re.compile(r"[^\W\d_][\w'’-]*")
+_MAX_NAME_WORDS = 3
+# Words that end a name rather than continue it.
+_NOT_NAME = frozenset({
+    "and", "my", "with", "phone", "iban", "number", "here", "from", "calling", "a", "an", "the",
+    "your", "customer", "client", "looking", "trying", "not", "interested", "having", "writing",
+})
+
+
+class Identity(NamedTuple):
+    name: Optional[str] = None
+    phone: Optional[str] = None
+    iban: Optional[str] = None
+
+    @property
+    def details(self) -> int:
+        """Number of details found."""
+        return sum(value is not None for value in self)
+
+
+def _iban(text: str) -> Optional[str]:
+    match = _IBAN.search(text)
+    return match.group() if match else None
+
+
+def _phone(text: str) -> Optional[str]:
+    for match in _PHONE.finditer(text):
+        digits = sum(char.isdigit() for char in match.group())
+        if _MIN_PHONE_DIGITS <= digits <= _MAX_PHONE_DIGITS:
+            return match.group().strip(" -.(")
+    return None
+
+
+def _name(text: str) -> Optional[str]:
+    for cue in _NAME_CUE.finditer(text):
+        words = []
+        position = cue.end()
+        while len(words) < _MAX_NAME_WORDS:
+            match = _NAME_WORD.match(text, position)
+            if match is None or match.group().casefold() in _NOT_NAME:
+                break
+            words.append(match.group())
+            position = match.end()
+            # Only spaces join the words of a name; punctuation ends it.
+            spaces = len(text[position:]) - len(text[position:].lstrip(" "))
+            if spaces == 0:
+                break
+            position += spaces
+        if words:
+            return " ".join(words)
+    return None
+
+
+def extract_identity(text: str) -> Identity:
+    """The name, phone number and IBAN written in ``text``, where present."""
+    iban = _iban(text)
+    # An IBAN's digit groups look like a phone number: search the rest.
+    rest = text.replace(iban, " ") if iban else text
+    return Identity(name=_name(rest), phone=_phone(rest), iban=iban)
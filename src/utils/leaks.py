@@ -0,0 +1,303 @@
+"""
+Detection of customer identifiers in outgoing text.
+
+``LeakScanner`` holds an Aho-Corasick automaton (``src.utils.aho_corasick``)
+over every customer phone number, IBAN and full name, so a message is
+checked against all of them in one linear pass, without an LLM call.
+
+Text and patterns go through the same tokenizer: words are case folded,
+and runs of digit groups ("+1 (122) 334-455", "DE89 3704 0044 ...") become
+one token in the canonical key form, so formatting does not hide a number.
+Single-word names are not patterns: they are too common to mean a leak.
+Every candidate is confirmed against the store it was found for, which
+also discards identifiers removed from the data since the automaton was
+built.
+
+On a data reload the scanner is updated incrementally: identifiers added
+since the base automaton was built go into a small delta automaton, and
+the base is only rebuilt once the delta grows past ``REBUILD_FRACTION``
+of it.
+
+A store queried in place (``sqlite://``) is never read into memory for
+this: ``StoreLeakScanner`` asks it about each candidate in the text
+instead, every long number and every run of a few words.
+"""
+
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from zlib import crc32
+
+from src.utils import metrics
+from src.utils.aho_corasick import TokenAutomaton
+from src.utils.data import add_reload_listener, get_customer_store, iban_key, phone_key
+from src.utils.sqlite_store import SqliteCustomerStore
+
+PHONE = "phone"
+IBAN = "iban"
+NAME = "name"
+_KINDS = (NAME, PHONE, IBAN)
+_LABELS = {kind: label for label, kind in enumerate(_KINDS, start=1)}
+
+# Shorter numbers are counts and amounts, not identifiers.
+MIN_IDENTIFIER_LENGTH = 6
+MIN_NAME_TOKENS = 2
+# Longest run of words StoreLeakScanner asks the store about as a name.
+MAX_NAME_TOKENS = 4
+# Rebuild the base automaton once the delta holds this share of its patterns.
+REBUILD_FRACTION = 0.1
+
+# A run of digit-bearing groups joined by single separators, or a word.
+_TOKEN = re.compile(
+    r"(?P<number>\+?\(?[^\W_]*\d[^\W_]*\)?(?:[ \-./]?\(?[^\W_]*\d[^\W_]*\)?)*)"
+    r"|(?P<word>[^\W\d_]+(?:['’\-][^\W\d_]+)*)"
+)
+_NOT_ALNUM = re.compile(r"[\W_]+")
+
+
+class Leak(NamedTuple):
+    kind: str
+    start: int
+    end: int
+
+
+def _number_key(number: str) -> str:
+    """Digits and letters only, upper case, without an international "00" prefix."""
+    key = _NOT_ALNUM.sub("", number).upper()
+    return key[2:] if key.startswith("00") else key
+
+
+def _token_key(match: re.Match) -> str:
+    if match.lastgroup == "number":
+        return _number_key(match.group())
+    return match.group().casefold()
+
+
+def _token_hash(key: str) -> int:
+    return crc32(key.encode("utf-8"))
+
+
+def _pattern(kind: str, value: str) -> Optional[List[int]]:
+    """Token hashes to match for one identifier, or None if it is too generic."""
+    if kind == NAME:
+        tokens = [_token_hash(_token_key(match)) for match in _TOKEN.finditer(value)]
+        return tokens if len(tokens) >= MIN_NAME_TOKENS else None
+    key = _number_key(phone_key(value) if kind == PHONE else iban_key(value))
+    return [_token_hash(key)] if len(key) >= MIN_IDENTIFIER_LENGTH else None
+
+
+def _fingerprint(kind: str, value: str) -> int:
+    """64-bit hash of an identifier, to tell which ones an automaton already holds."""
+    return hash((kind, value)) & 0xFFFFFFFFFFFFFFFF
+
+
+def _identifiers(store) -> Iterator[Tuple[str, str]]:
+    for identity in store.identities():
+        yield from zip(_KINDS, identity)
+
+
+def _contains(fingerprints: array, fingerprint: int) -> bool:
+    position = bisect_left(fingerprints, fingerprint)
+    return position < len(fingerprints) and fingerprints[position] == fingerprint
+
+
+def _confirm(store, kind: str, tokens: List[re.Match]) -> Optional[str]:
+    """The kind of identifier ``tokens`` really are in ``store``, or None."""
+    find = store.find_customer
+    if kind == NAME:
+        return NAME if find(name=" ".join(token.group() for token in tokens)) else None
+    # A phone and an IBAN can share a token hash; only the first label is kept.
+    key = _number_key(tokens[0].group())
+    if find(iban=key):
+        return IBAN
+    # The "+" (or "00") of an international number is not part of the key.
+    if find(phone="+" + key) or find(phone=key):
+        return PHONE
+    return None
+
+
+def _automaton(identifiers: Iterable[Tuple[str, str]]) -> TokenAutomaton:
+    patterns = ((_pattern(kind, value), _LABELS[kind]) for kind, value in identifiers)
+    return TokenAutomaton(pattern for pattern in patterns if pattern[0])
+
+
+class LeakScanner:
+    """Finds customer phone numbers, IBANs and full names in text."""
+
+    def __init__(self, store, base: TokenAutomaton, fingerprints: array, added: Set[Tuple[str, str]]):
+        self.store = store
+        self._base = base
+        # Sorted fingerprints of the identifiers in ``base``.
+        self._fingerprints = fingerprints
+        self._added = added
+        self._delta = _automaton(added) if added else None
+
+    @classmethod
+    def build(cls, store) -> "LeakScanner":
+        """Scanner over every identifier in ``store``."""
+        fingerprints = set()
+
+        def identifiers():
+            for kind, value in _identifiers(store):
+                fingerprints.add(_fingerprint(kind, value))
+                yield kind, value
+
+        base = _automaton(identifiers())
+        return cls(store, base, array("Q", sorted(fingerprints)), set())
+
+    def updated(self, store) -> "LeakScanner":
+        """
+        Scanner for a reloaded ``store``, reusing this one's base automaton.
+
+        Only identifiers missing from the base are indexed, in a delta
+        automaton; removed ones stay in the base and are filtered out by the
+        confirmation against ``store``. Once the delta grows past
+        ``REBUILD_FRACTION`` of the base, everything is rebuilt instead.
+        """
+        limit = REBUILD_FRACTION * max(self._base.patterns, 1)
+        added = set()
+        for kind, value in _identifiers(store):
+            if not _contains(self._fingerprints, _fingerprint(kind, value)):
+                added.add((kind, value))
+                if len(added) > limit:
+                    return LeakScanner.build(store)
+        return LeakScanner(store, self._base, self._fingerprints, added)
+
+    @property
+    def patterns(self) -> int:
+        return self._base.patterns + self.delta_patterns
+
+    @property
+    def delta_patterns(self) -> int:
+        return self._delta.patterns if self._delta else 0
+
+    @property
+    def nbytes(self) -> int:
+        delta = self._delta.nbytes if self._delta else 0
+        return self._base.nbytes + delta + self._fingerprints.itemsize * len(self._fingerprints)
+
+    def scan(self, text: str) -> List[Leak]:
+        """Customer identifiers in ``text``, in order of their end position."""
+        matches = list(_TOKEN.finditer(text))
+        if not matches:
+            return []
+        hashes = [_token_hash(_token_key(match)) for match in matches]
+        found = set(self._base.scan(hashes))
+        if self._delta is not None:
+            found.update(self._delta.scan(hashes))
+
+        leaks = []
+        for end, length, label in sorted(found):
+            tokens = matches[end - length + 1:end + 1]
+            kind = self._confirmed(_KINDS[label - 1], tokens)
+            if kind is not None:
+                leaks.append(Leak(kind, tokens[0].start(), tokens[-1].end()))
+        return leaks
+
+    def _confirmed(self, kind: str, tokens: List[re.Match]) -> Optional[str]:
+        return _confirm(self.store, kind, tokens)
+
+
+class StoreLeakScanner:
+    """
+    Finds the identifiers ``LeakScanner`` finds by asking the store about
+    every candidate in the text, for stores queried in place: nothing is
+    held in memory, and each scan costs a few indexed queries.
+    """
+
+    patterns = delta_patterns = nbytes = 0
+
+    def __init__(self, store):
+        self.store = store
+
+    def updated(self, store) -> "StoreLeakScanner":
+        return StoreLeakScanner(store)
+
+    def scan(self, text: str) -> List[Leak]:
+        """Customer identifiers in ``text``, in order of their end position."""
+        matches = list(_TOKEN.finditer(text))
+        leaks = []
+        for position, match in enumerate(matches):
+            if match.lastgroup == "number":
+                if len(_number_key(match.group())) >= MIN_IDENTIFIER_LENGTH:
+                    kind = _confirm(self.store, PHONE, [match])
+                    if kind is not None:
+                        leaks.append(Leak(kind, match.start(), match.end()))
+                continue
+            for length in range(MIN_NAME_TOKENS, MAX_NAME_TOKENS + 1):
+                tokens = matches[position:position + length]
+                if len(tokens) < length:
+                    break
+                if _confirm(self.store, NAME, tokens):
+                    leaks.append(Leak(NAME, tokens[0].start(), tokens[-1].end()))
+        return sorted(leaks, key=lambda leak: leak.end)
+
+
+def redact(text: str, leaks: Iterable[Leak], replacement: str = "[redacted]") -> str:
+    """``text`` with every leaked span replaced."""
+    parts, position = [], 0
+    for leak in sorted(leaks, key=lambda leak: leak.start):
+        if leak.start < position:
+            continue
+        parts.append(text[position:leak.start])
+        parts.append(replacement)
+        position = leak.end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+_scanner = None
+_scanner_lock = threading.Lock()
+
+
+def _record_metrics(scanner: LeakScanner, seconds: float) -> None:
+    metrics.set_gauge("leak_scanner.patterns", scanner.patterns)
+    metrics.set_gauge("leak_scanner.delta_patterns", scanner.delta_patterns)
+    metrics.set_gauge("leak_scanner.size_bytes", scanner.nbytes)
+    metrics.set_gauge("leak_scanner.last_update_seconds", seconds)
+
+
+def _on_reload(store) -> None:
+    global _scanner
+    with _scanner_lock:
+        if _scanner is None or _scanner.store is store:
+            return
+        start = time.perf_counter()
+        _scanner = _scanner.updated(store)
+        _record_metrics(_scanner, time.perf_counter() - start)
+
+
+def _build(store):
+    if isinstance(store, SqliteCustomerStore):
+        return StoreLeakScanner(store)
+    return LeakScanner.build(store)
+
+
+def scans_in_memory() -> bool:
+    """
+    Whether the scanner is built and scans without touching the store, so
+    an async caller may scan on the event loop (otherwise: in a thread).
+    """
+    return isinstance(_scanner, LeakScanner)
+
+
+def get_leak_scanner():
+    """
+    The scanner for the current customer data, built on first use: a
+    ``LeakScanner``, or a ``StoreLeakScanner`` over a SQLite store.
+
+    Afterwards it is updated on the reloader thread whenever the data is
+    reloaded (see ``add_reload_listener``).
+    """
+    global _scanner
+    if _scanner is None:
+        with _scanner_lock:
+            if _scanner is None:
+                start = time.perf_counter()
+                _scanner = _build(get_customer_store())
+                _record_metrics(_scanner, time.perf_counter() - start)
+                add_reload_listener(_on_reload)
+    return _scanner
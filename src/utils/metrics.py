@@ -0,0 +1,38 @@
+"""
+Process-wide counters and gauges.
+
+Components record values under dotted names and the API exposes a
+snapshot. Counters only go up; gauges hold the latest value.
+"""
+
+import threading
+from typing import Dict, Union
+
+Number = Union[int, float]
+
+_lock = threading.Lock()
+_values: Dict[str, Number] = {}
+
+
+def increment(name: str, amount: Number = 1) -> None:
+    """Add ``amount`` to the counter ``name``."""
+    with _lock:
+        _values[name] = _values.get(name, 0) + amount
+
+
+def set_gauge(name: str, value: Number) -> None:
+    """Set the gauge ``name`` to ``value``."""
+    with _lock:
+        _values[name] = value
+
+
+def snapshot() -> Dict[str, Number]:
+    """Return a copy of every recorded value."""
+    with _lock:
+        return dict(_values)
+
+
+def reset() -> None:
+    """Clear all values (used by tests)."""
+    with _lock:
+        _values.clear()
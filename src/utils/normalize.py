@@ -0,0 +1,48 @@
+"""
+Canonical forms for phone numbers and IBANs.
+
+Customers type the same identifier many ways ("+1 122 334 455",
+"001122334455", "de89 3704 0044 0532 0130 00"). The customer indexes are
+keyed on the canonical forms produced here, so every spelling of an
+identifier finds the same record on the first lookup.
+"""
+
+import re
+import string
+
+_PHONE_SEPARATORS = str.maketrans("", "", " \t-.()/")
+# ISO 13616: letters count as 10 (A) to 35 (Z) in the checksum.
+_IBAN_LETTER_VALUES = str.maketrans({letter: str(int(letter, 36)) for letter in string.ascii_uppercase})
+# Two-letter country code, two check digits, 11-30 alphanumeric BBAN characters.
+_IBAN_SHAPE = re.compile(r"[A-Z]{2}[0-9]{2}[A-Z0-9]{11,30}")
+
+
+def canonical_phone(phone: str) -> str:
+    """
+    E.164-style canonical phone number.
+
+    Spacing and punctuation are dropped and the international "00" prefix
+    becomes "+", so "+1 (122) 334-455" and "001122334455" both become
+    "+1122334455". Numbers without an international prefix keep their
+    digits as given: their country is unknown.
+    """
+    phone = phone.strip().translate(_PHONE_SEPARATORS)
+    if phone.startswith("00"):
+        return "+" + phone[2:]
+    return phone
+
+
+def canonical_iban(iban: str) -> str:
+    """IBAN without whitespace, in upper case (the electronic format)."""
+    return "".join(iban.split()).upper()
+
+
+def iban_checksum_valid(iban: str) -> bool:
+    """
+    Whether a canonical IBAN is well-formed and passes the ISO 13616 mod-97 check.
+
+    Costs a regex match and one big-integer modulo, with no lookup.
+    """
+    if not _IBAN_SHAPE.fullmatch(iban):
+        return False
+    return int((iban[4:] + iban[:4]).translate(_IBAN_LETTER_VALUES)) % 97 == 1
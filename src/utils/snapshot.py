@@ -0,0 +1,275 @@
+"""
+Binary, memory-mappable snapshots of the indexed customer store.
+
+A snapshot holds every column and hash table of a ``CustomerStore`` as raw
+arrays, so opening one is an mmap plus a header parse: no JSON decoding and
+no index building. The header records the SHA-256, size and mtime of the
+source JSON; ``open_or_build`` only rebuilds when the checksum changes.
+
+Build a snapshot offline with:
+    python -m src.utils.snapshot data/customers.json [data/customers.snapshot]
+
+Because the file is mapped read-only and shared, every worker process that
+attaches to the same snapshot shares one copy of the index in the page
+cache. To publish it from a single loader process into shared memory and
+have workers only attach:
+    python -m src.utils.snapshot data/customers.json /dev/shm/customers.snapshot --watch 30
+    CUSTOMER_SNAPSHOT_PATH=/dev/shm/customers.snapshot CUSTOMER_SNAPSHOT_MODE=attach \
+        uvicorn src.local_api:app --workers 4
+"""
+
+import argparse
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from src.utils.data import CustomerStore
+
+MAGIC = b"DEUSSNAP"
+# Bump whenever the section layout or index hashing changes.
+FORMAT_VERSION = 4
+
+# magic, format version, byte order, source sha256, source size, source mtime_ns, section count
+_HEADER = struct.Struct("<8sII32sQqI")
+# section name, offset, length
+_SECTION = struct.Struct("<40sQQ")
+_ALIGN = 8
+_LITTLE_ENDIAN = 1 if sys.byteorder == "little" else 0
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, corrupt or from another format version."""
+
+
+class SourceInfo(NamedTuple):
+    """Identity of the JSON file a snapshot was built from."""
+
+    sha256: bytes
+    size: int
+    mtime_ns: int
+
+
+def file_checksum(path) -> bytes:
+    """SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def source_info(path) -> SourceInfo:
+    stat = os.stat(path)
+    return SourceInfo(file_checksum(path), stat.st_size, stat.st_mtime_ns)
+
+
+def write_snapshot(store: CustomerStore, path, source: SourceInfo) -> None:
+    """Write ``store`` to ``path`` atomically (temporary file + rename)."""
+    path = Path(path)
+    sections = store.sections()
+    names = sorted(sections)
+
+    table_size = _HEADER.size + _SECTION.size * len(names)
+    offset = _align(table_size)
+    entries = []
+    for name in names:
+        length = memoryview(sections[name]).nbytes
+        entries.append((name, offset, length))
+        offset = _align(offset + length)
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(
+                MAGIC, FORMAT_VERSION, _LITTLE_ENDIAN,
+                source.sha256, source.size, source.mtime_ns, len(names),
+            ))
+            for name, section_offset, length in entries:
+                f.write(_SECTION.pack(name.encode("ascii"), section_offset, length))
+            for name, section_offset, length in entries:
+                f.write(b"\0" * (section_offset - f.tell()))
+                f.write(sections[name])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def read_source_info(path) -> SourceInfo:
+    """Read only the header of a snapshot."""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+    except FileNotFoundError:
+        raise SnapshotError(f"Snapshot not found: {path}") from None
+    return _parse_header(header)[0]
+
+
+def _parse_header(header: bytes):
+    if len(header) < _HEADER.size:
+        raise SnapshotError("Snapshot header is truncated")
+    magic, version, byteorder, sha256, size, mtime_ns, count = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise SnapshotError("Not a customer snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Snapshot format {version} does not match {FORMAT_VERSION}")
+    if byteorder != _LITTLE_ENDIAN:
+        raise SnapshotError("Snapshot was written on a machine with a different byte order")
+    return SourceInfo(sha256, size, mtime_ns), count
+
+
+def open_snapshot(path) -> CustomerStore:
+    """
+    Memory-map a snapshot read-only and attach a store to it.
+
+    Pages are loaded lazily by the OS and shared with every other process
+    that maps the same file.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise SnapshotError(f"Snapshot not found: {path}") from None
+    except ValueError:
+        raise SnapshotError(f"Snapshot is empty: {path}") from None
+
+    view = memoryview(mapped)
+    _, count = _parse_header(view[:_HEADER.size])
+    sections: Dict[str, memoryview] = {}
+    for i in range(count):
+        raw_name, offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+        if offset + length > len(view):
+            raise SnapshotError("Snapshot is truncated")
+        sections[raw_name.rstrip(b"\0").decode("ascii")] = view[offset:offset + length]
+
+    try:
+        return CustomerStore.from_sections(sections)
+    except KeyError as e:
+        raise SnapshotError(f"Snapshot is missing section {e}") from None
+
+
+def build_snapshot(json_path, snapshot_path) -> CustomerStore:
+    """Build the store from JSON, write it as a snapshot and return the mapped snapshot."""
+    source = source_info(json_path)
+    write_snapshot(CustomerStore.from_json(json_path), snapshot_path, source)
+    return open_snapshot(snapshot_path)
+
+
+def is_current(json_path, snapshot_path) -> bool:
+    """
+    Whether the snapshot was built from the current contents of ``json_path``.
+
+    Matching size and mtime are trusted without hashing, so the common
+    restart is a stat call; otherwise the source checksum decides.
+    """
+    try:
+        recorded = read_source_info(snapshot_path)
+    except SnapshotError:
+        return False
+    stat = os.stat(json_path)
+    if (stat.st_size, stat.st_mtime_ns) == (recorded.size, recorded.mtime_ns):
+        return True
+    return stat.st_size == recorded.size and file_checksum(json_path) == recorded.sha256
+
+
+@contextmanager
+def _build_lock(snapshot_path):
+    """Exclusive cross-process lock, so concurrently starting workers build once."""
+    lock_path = Path(f"{snapshot_path}.lock")
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def open_or_build(json_path, snapshot_path) -> CustomerStore:
+    """
+    Open the snapshot if it matches ``json_path``, rebuilding it first if not.
+
+    Rebuilds happen under a file lock: the first process builds and
+    publishes, the others wait and then attach to what it published.
+    """
+    if is_current(json_path, snapshot_path):
+        try:
+            return open_snapshot(snapshot_path)
+        except SnapshotError:
+            pass
+    with _build_lock(snapshot_path):
+        if is_current(json_path, snapshot_path):
+            try:
+                return open_snapshot(snapshot_path)
+            except SnapshotError:
+                pass
+        return build_snapshot(json_path, snapshot_path)
+
+
+def attach_snapshot(snapshot_path, timeout: float = 300, poll_interval: float = 0.5) -> CustomerStore:
+    """
+    Attach read-only to a snapshot published by another process.
+
+    Never builds: waits up to ``timeout`` seconds for the publisher to
+    write a valid snapshot.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return open_snapshot(snapshot_path)
+        except SnapshotError:
+            if time.monotonic() >= deadline:
+                raise
+        time.sleep(poll_interval)
+
+
+def publish(json_path, snapshot_path, interval: float) -> None:
+    """Keep ``snapshot_path`` current with ``json_path``, checking every ``interval`` seconds."""
+    while True:
+        if not is_current(json_path, snapshot_path):
+            with _build_lock(snapshot_path):
+                start = time.perf_counter()
+                store = build_snapshot(json_path, snapshot_path)
+                print(f"Published {len(store)} customers to {snapshot_path} in {time.perf_counter() - start:.1f}s")
+        time.sleep(interval)
+
+
+def default_snapshot_path(json_path, configured: Optional[str] = None) -> Path:
+    """The configured snapshot path, or ``<json name>.snapshot`` next to the JSON file."""
+    if configured:
+        return Path(configured)
+    json_path = Path(json_path)
+    return json_path.with_suffix(".snapshot")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a binary customer snapshot from JSON.")
+    parser.add_argument("json_path")
+    parser.add_argument("snapshot_path", nargs="?")
+    parser.add_argument(
+        "--watch", type=float, metavar="SECONDS",
+        help="keep running and republish whenever the JSON changes",
+    )
+    args = parser.parse_args(argv)
+
+    snapshot_path = default_snapshot_path(args.json_path, args.snapshot_path)
+    if args.watch:
+        publish(args.json_path, snapshot_path, args.watch)
+        return
+    store = build_snapshot(args.json_path, snapshot_path)
+    print(f"Wrote {len(store)} customers to {snapshot_path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""
+SQLite-backed customer store.
+
+Keeps the customer base in an indexed SQLite file instead of process memory.
+Every lookup is a point query on an index over the normalized name, phone and
+IBAN keys, issued from a small pool of read-only connections. A Bloom filter
+over account IBANs, written at import time, is loaded into memory so checks
+for IBANs that are not DEUS accounts never reach the database. So is the
+short list of IBANs on file that fail the checksum.
+
+Build a database from the JSON export with:
+    python -m src.utils.sqlite_store data/customers.json data/customers.db
+"""
+
+import argparse
+import queue
+import sqlite3
+import sys
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import FrozenSet, Iterator, Optional, Tuple
+
+from src.graph.config import CUSTOMER_FUZZY_NAME_MIN_SIMILARITY
+from src.utils import metrics
+from src.utils.bloom import BloomFilter, key_hashes
+from src.utils.columnar import iter_json_arrays
+from src.utils.data import ACCOUNT_FILTER_ERROR_RATE, iban_key, name_key, phone_key
+from src.utils.normalize import iban_checksum_valid
+from src.utils.trigram import similarity
+
+SCHEMA = """
+CREATE TABLE customers (
+    row INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    iban TEXT NOT NULL,
+    secret TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    phone_key TEXT NOT NULL,
+    iban_key TEXT NOT NULL
+);
+CREATE TABLE accounts (
+    row INTEGER PRIMARY KEY,
+    iban_key TEXT NOT NULL,
+    premium INTEGER NOT NULL
+);
+CREATE TABLE account_filter (
+    num_bits INTEGER NOT NULL,
+    num_hashes INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+CREATE TABLE legacy_ibans (
+    iban_key TEXT NOT NULL
+);
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row.
+INDEXES = """
+CREATE INDEX customers_name ON customers (name_key);
+CREATE INDEX customers_phone ON customers (phone_key);
+CREATE INDEX customers_iban ON customers (iban_key);
+CREATE INDEX customers_name_phone ON customers (name_key, phone_key);
+CREATE INDEX customers_name_iban ON customers (name_key, iban_key);
+CREATE INDEX customers_phone_iban ON customers (phone_key, iban_key);
+CREATE INDEX accounts_iban ON accounts (iban_key);
+"""
+
+_CUSTOMER_COLUMNS = "name, phone, iban, secret, answer"
+
+# One fixed statement per combination of provided details, so each
+# connection's statement cache holds them prepared. With equality on every
+# index column SQLite returns rows in rowid (file) order without sorting.
+_FIND_WHERE = {
+    (True, True, True): "WHERE phone_key = ? AND iban_key = ? AND name_key = ?",
+    (False, True, True): "WHERE phone_key = ? AND iban_key = ?",
+    (True, True, False): "WHERE name_key = ? AND phone_key = ?",
+    (True, False, True): "WHERE name_key = ? AND iban_key = ?",
+    (True, False, False): "WHERE name_key = ?",
+    (False, True, False): "WHERE phone_key = ?",
+    (False, False, True): "WHERE iban_key = ?",
+}
+_FIND_QUERIES = {
+    provided: f"SELECT {_CUSTOMER_COLUMNS} FROM customers {where} ORDER BY row LIMIT 1"
+    for provided, where in _FIND_WHERE.items()
+}
+# Rows sharing the exact phone and/or IBAN, for the fuzzy name fallback.
+_FUZZY_QUERIES = {
+    (True, True): "SELECT name, phone, iban, secret, answer FROM customers "
+                  "WHERE phone_key = ? AND iban_key = ? ORDER BY row",
+    (True, False): "SELECT name, phone, iban, secret, answer FROM customers WHERE phone_key = ? ORDER BY row",
+    (False, True): "SELECT name, phone, iban, secret, answer FROM customers WHERE iban_key = ? ORDER BY row",
+}
+_MATCH_QUERIES = {
+    provided: f"SELECT iban FROM customers {where} ORDER BY row LIMIT 1"
+    for provided, where in _FIND_WHERE.items()
+}
+_PREMIUM_QUERY = "SELECT premium FROM accounts WHERE iban_key = ? ORDER BY row LIMIT 1"
+_COUNT_QUERY = "SELECT COUNT(*) FROM customers"
+_FILTER_QUERY = "SELECT num_bits, num_hashes, count, bits FROM account_filter"
+_LEGACY_IBANS_QUERY = "SELECT iban_key FROM legacy_ibans"
+_HAS_IBAN_QUERY = "SELECT 1 FROM customers WHERE iban_key = ? LIMIT 1"
+
+_BATCH_SIZE = 10_000
+# Stored as PRAGMA user_version. Bump whenever name_key/phone_key/iban_key
+# change, since the key columns were computed at import time.
+KEY_VERSION = 1
+
+
+class SqliteCustomerStore:
+    """
+    Customer store backed by a read-only SQLite database.
+
+    Exposes the same lookup API as ``CustomerStore``. Connections are opened
+    read-only and shared through a fixed-size pool, so concurrent tool calls
+    from worker threads never contend on a single connection.
+    """
+
+    def __init__(self, path, pool_size: int = 4):
+        self._path = Path(path)
+        if not self._path.exists():
+            raise FileNotFoundError(f"Customer database not found: {self._path}")
+
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != KEY_VERSION:
+            self.close()
+            raise ValueError(
+                f"{self._path} was imported with key version {version}, expected {KEY_VERSION}; "
+                "re-run python -m src.utils.sqlite_store to rebuild it"
+            )
+        self._account_filter = self._load_account_filter()
+        self._legacy_ibans = self._load_legacy_ibans()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            f"{self._path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=2 * len(_FIND_QUERIES) + len(_FUZZY_QUERIES) + 2,
+        )
+        connection.execute("PRAGMA query_only = ON")
+        return connection
+
+    def _load_account_filter(self) -> Optional[BloomFilter]:
+        with self._connection() as connection:
+            try:
+                row = connection.execute(_FILTER_QUERY).fetchone()
+            except sqlite3.OperationalError:
+                # Imported before the filter existed.
+                return None
+        if row is None:
+            return None
+        num_bits, num_hashes, count, bits = row
+        return BloomFilter(num_bits, num_hashes, bytearray(bits), count)
+
+    def _load_legacy_ibans(self) -> Optional[FrozenSet[str]]:
+        with self._connection() as connection:
+            try:
+                return frozenset(row[0] for row in connection.execute(_LEGACY_IBANS_QUERY))
+            except sqlite3.OperationalError:
+                # Imported before the list existed.
+                return None
+
+    @property
+    def account_filter(self) -> Optional[BloomFilter]:
+        return self._account_filter
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    def __len__(self) -> int:
+        with self._connection() as connection:
+            return connection.execute(_COUNT_QUERY).fetchone()[0]
+
+    def identities(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (name, phone, IBAN) of every customer, in file order."""
+        # A connection of its own, so a long scan never holds a pool slot.
+        connection = self._connect()
+        try:
+            yield from connection.execute("SELECT name, phone, iban FROM customers ORDER BY row")
+        finally:
+            connection.close()
+
+    def find_customer(
+        self,
+        name: Optional[str] = None,
+        phone: Optional[str] = None,
+        iban: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Find the customer matching ALL provided (non-empty) details.
+
+        Returns:
+            The customer record, or None if nothing matches or no detail was given.
+        """
+        query = _query(_FIND_QUERIES, name, phone, iban)
+        if query is None:
+            return None
+        with self._connection() as connection:
+            row = connection.execute(*query).fetchone()
+            if row is None and name and (phone or iban):
+                row = self._fuzzy_name_row(connection, name, phone, iban)
+        if row is None:
+            return None
+        return dict(zip(("name", "phone", "iban", "secret", "answer"), row))
+
+    def _fuzzy_name_row(self, connection, name, phone, iban) -> Optional[tuple]:
+        """Same fallback as ``CustomerStore._fuzzy_name_row``, over the rows sharing the phone/IBAN."""
+        params = tuple(key(value) for key, value in ((phone_key, phone), (iban_key, iban)) if value)
+        rows = connection.execute(_FUZZY_QUERIES[(bool(phone), bool(iban))], params).fetchall()
+        name = name_key(name)
+        best_row, best_score = None, CUSTOMER_FUZZY_NAME_MIN_SIMILARITY
+        for row in rows:
+            score = similarity(name, name_key(row[0]))
+            if score > best_score or (best_row is None and score == best_score):
+                best_row, best_score = row, score
+        if best_row is not None:
+            metrics.increment("customer_data.fuzzy_name_matches")
+        return best_row
+
+    def match_many(self, queries) -> Iterator[Tuple[bool, Optional[bool]]]:
+        """
+        Batch form of ``find_customer`` followed by ``is_premium``.
+
+        Same contract as ``CustomerStore.match_many``. The whole batch runs
+        on one pooled connection with its prepared statements.
+        """
+        account_filter = self._account_filter
+        with self._connection() as connection:
+            execute = connection.execute
+            for name, phone, iban in queries:
+                query = _query(_MATCH_QUERIES, name, phone, iban)
+                row = None if query is None else execute(*query).fetchone()
+                if row is None and name and (phone or iban):
+                    fuzzy = self._fuzzy_name_row(connection, name, phone, iban)
+                    row = None if fuzzy is None else (fuzzy[2],)
+                if row is None:
+                    yield False, None
+                    continue
+                account_iban = iban_key(row[0])
+                if account_filter is not None and not account_filter.might_contain(
+                    key_hashes(account_iban.encode("utf-8"))
+                ):
+                    yield True, None
+                    continue
+                account = execute(_PREMIUM_QUERY, (account_iban,)).fetchone()
+                yield True, None if account is None else bool(account[0])
+
+    def has_legacy_iban(self, iban: str) -> bool:
+        """Whether a customer on file has this IBAN although it fails the checksum."""
+        iban = iban_key(iban)
+        if self._legacy_ibans is not None:
+            return iban in self._legacy_ibans
+        with self._connection() as connection:
+            return connection.execute(_HAS_IBAN_QUERY, (iban,)).fetchone() is not None
+
+    def is_premium(self, iban: str) -> Optional[bool]:
+        """
+        Return the premium flag of the account with this IBAN.
+
+        Returns:
+            True/False for known accounts, None if the IBAN is not a DEUS account.
+        """
+        iban = iban_key(iban)
+        account_filter = self._account_filter
+        if account_filter is not None and not account_filter.might_contain(key_hashes(iban.encode("utf-8"))):
+            metrics.increment("account_filter.negatives")
+            return None
+        with self._connection() as connection:
+            row = connection.execute(_PREMIUM_QUERY, (iban,)).fetchone()
+        if account_filter is not None:
+            metrics.increment("account_filter.false_positives" if row is None else "account_filter.positives")
+        return None if row is None else bool(row[0])
+
+
+def _query(queries: dict, name, phone, iban) -> Optional[Tuple[str, tuple]]:
+    """The statement and parameters matching every provided detail, or None if none is."""
+    provided = (bool(name), bool(phone), bool(iban))
+    if not any(provided):
+        return None
+
+    # Parameter order follows the WHERE clauses above.
+    if all(provided):
+        params = (phone_key(phone), iban_key(iban), name_key(name))
+    else:
+        params = tuple(
+            key(value)
+            for key, value in ((name_key, name), (phone_key, phone), (iban_key, iban))
+            if value
+        )
+    return queries[provided], params
+
+
+def import_json(json_path, db_path) -> int:
+    """
+    One-shot import of a customers JSON export into a new SQLite database.
+
+    The JSON file is streamed, so exports larger than memory are fine. The
+    database is written to a temporary file and renamed into place, so
+    readers never see a half-built database.
+
+    Returns:
+        Number of customers imported.
+    """
+    db_path = Path(db_path)
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(SCHEMA)
+
+        customers, accounts, legacy_ibans, count = [], [], [], 0
+        account_hashes, account_second_hashes = array("I"), array("I")
+        with open(json_path, "r") as f:
+            for kind, record in iter_json_arrays(f, ("customers", "accounts")):
+                if kind == "customers":
+                    name = record.get("name", "")
+                    phone = record.get("phone", "")
+                    iban = record.get("iban", "")
+                    customers.append((
+                        name, phone, iban,
+                        record.get("secret", ""), record.get("answer", ""),
+                        name_key(name), phone_key(phone), iban_key(iban),
+                    ))
+                    if iban and not iban_checksum_valid(iban_key(iban)):
+                        legacy_ibans.append((iban_key(iban),))
+                    count += 1
+                else:
+                    iban = iban_key(record.get("iban", ""))
+                    accounts.append((iban, int(bool(record.get("premium", False)))))
+                    h1, h2 = key_hashes(iban.encode("utf-8"))
+                    account_hashes.append(h1)
+                    account_second_hashes.append(h2)
+
+                if len(customers) >= _BATCH_SIZE:
+                    _insert_customers(connection, customers)
+                    customers = []
+                if len(accounts) >= _BATCH_SIZE:
+                    _insert_accounts(connection, accounts)
+                    accounts = []
+
+        _insert_customers(connection, customers)
+        _insert_accounts(connection, accounts)
+        connection.executemany("INSERT INTO legacy_ibans (iban_key) VALUES (?)", legacy_ibans)
+        _insert_account_filter(connection, BloomFilter.from_hashes(
+            zip(account_hashes, account_second_hashes), len(account_hashes), ACCOUNT_FILTER_ERROR_RATE,
+        ))
+        connection.executescript(INDEXES)
+        connection.execute("ANALYZE")
+        connection.execute(f"PRAGMA user_version = {KEY_VERSION}")
+        connection.commit()
+    finally:
+        connection.close()
+
+    tmp_path.replace(db_path)
+    return count
+
+
+def _insert_customers(connection: sqlite3.Connection, rows: list) -> None:
+    connection.executemany(
+        f"INSERT INTO customers ({_CUSTOMER_COLUMNS}, name_key, phone_key, iban_key) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+def _insert_accounts(connection: sqlite3.Connection, rows: list) -> None:
+    connection.executemany("INSERT INTO accounts (iban_key, premium) VALUES (?, ?)", rows)
+
+
+def _insert_account_filter(connection: sqlite3.Connection, account_filter: BloomFilter) -> None:
+    buffers = account_filter.buffers()
+    num_bits, num_hashes, count = buffers["params"]
+    connection.execute(
+        "INSERT INTO account_filter (num_bits, num_hashes, count, bits) VALUES (?, ?, ?, ?)",
+        (num_bits, num_hashes, count, bytes(buffers["bits"])),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a customers JSON export into SQLite.")
+    parser.add_argument("json_path")
+    parser.add_argument("db_path")
+    args = parser.parse_args(argv)
+
+    count = import_json(args.json_path, args.db_path)
+    print(f"Imported {count} customers into {args.db_path}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+Trigram similarity and a trigram inverted index over customer names.
+
+Similarity follows pg_trgm: each word is padded ("  jon "), split into
+three-character grams, and two strings are compared by the Jaccard index
+of their gram sets. "jon smith" vs "john smith" scores 0.62, unrelated
+names score near 0.
+
+``TrigramIndex`` maps every gram to the rows containing it (CSR layout
+over integer arrays), so ranked candidates for a misspelt name are found
+by counting shared grams instead of comparing against every name.
+"""
+
+import math
+from array import array
+from collections import Counter
+from typing import Callable, Dict, FrozenSet, Iterable, List, Tuple
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """pg_trgm-style trigrams of an already normalized string."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of the trigram sets of ``a`` and ``b`` (0.0 to 1.0)."""
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+class TrigramIndex:
+    """
+    Inverted index from trigram to the rows whose name contains it.
+
+    Built once over normalized names; ``search`` returns the best-scoring
+    rows. Postings are read rarest-first, only as many lists as needed to
+    reach ``min_similarity`` (prefix filtering) and at most ``scan_budget``
+    entries in total. Within the budget the result is exact; past it the
+    rarest grams decide which rows are scored, which keeps latency bounded
+    for names made only of very common grams.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        ids: Dict[str, int] = {}
+        row_grams = array("I")
+        gram_counts = array("I")
+        for name in names:
+            grams = trigrams(name)
+            row_grams.extend([ids.setdefault(gram, len(ids)) for gram in grams])
+            gram_counts.append(len(grams))
+
+        # Counting sort of (gram, row) pairs into one postings array.
+        sizes = array("Q", bytes(8 * (len(ids) + 1)))
+        for gram_id in row_grams:
+            sizes[gram_id + 1] += 1
+        offsets = array("Q", [0]) * (len(ids) + 1)
+        total = 0
+        for gram_id in range(len(ids)):
+            total += sizes[gram_id + 1]
+            offsets[gram_id + 1] = total
+        cursor = array("Q", offsets[:-1]) if ids else array("Q")
+        postings = array("I", bytes(4 * len(row_grams)))
+        position = 0
+        for row, count in enumerate(gram_counts):
+            for gram_id in row_grams[position:position + count]:
+                postings[cursor[gram_id]] = row
+                cursor[gram_id] += 1
+            position += count
+
+        self._ids = ids
+        self._offsets = offsets
+        self._postings = postings
+        self._gram_counts = gram_counts
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index (arrays plus gram dictionary)."""
+        arrays = sum(a.itemsize * len(a) for a in (self._offsets, self._postings, self._gram_counts))
+        # dict slot + key string object per distinct gram
+        return arrays + len(self._ids) * (100 + 56)
+
+    def search(
+        self,
+        query: str,
+        name_of: Callable[[int], str],
+        limit: int = 5,
+        min_similarity: float = 0.3,
+        scan_budget: int = 30_000,
+    ) -> List[Tuple[float, int]]:
+        """
+        Rank rows by trigram similarity to a normalized ``query``.
+
+        Args:
+            query: Normalized name to look for.
+            name_of: Returns the normalized name of a row, used to score candidates exactly.
+            limit: Maximum number of results.
+            min_similarity: Rows scoring below this are not returned.
+            scan_budget: Maximum postings entries read.
+
+        Returns:
+            Up to ``limit`` (similarity, row) pairs, best first.
+        """
+        grams = trigrams(query)
+        if not grams:
+            return []
+        postings = []
+        for gram in grams:
+            gram_id = self._ids.get(gram)
+            if gram_id is None:
+                postings.append((0, 0))
+            else:
+                postings.append((self._offsets[gram_id], self._offsets[gram_id + 1]))
+        postings.sort(key=lambda span: span[1] - span[0])
+
+        # A row scoring >= min_similarity shares at least `needed` grams with
+        # the query, so it must appear in one of the len - needed + 1 rarest lists.
+        needed = max(1, math.ceil(min_similarity * len(grams)))
+        counts = Counter()
+        scanned = 0
+        for start, end in postings[:len(postings) - needed + 1]:
+            if scanned and scanned + end - start > scan_budget:
+                break
+            # Even the rarest list is cut at the budget: a name made only of
+            # very common grams then ranks a sample of its many look-alikes.
+            end = min(end, start + scan_budget)
+            counts.update(self._postings[start:end])
+            scanned += end - start
+
+        results = []
+        # Rows sharing the most rare grams first; scored exactly on their name.
+        for row, _ in counts.most_common(limit * 4):
+            row_grams = trigrams(name_of(row))
+            shared = len(grams & row_grams)
+            score = shared / (len(grams) + len(row_grams) - shared)
+            if score >= min_similarity:
+                results.append((score, row))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results[:limit]
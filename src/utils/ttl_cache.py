@@ -0,0 +1,133 @@
+"""
+Bounded LRU cache with per-entry expiry and an optional SQLite tier.
+
+Entries live for ``ttl`` seconds after they are stored. The in-memory tier
+holds at most ``maxsize`` entries and evicts the least recently used one.
+With a ``path``, every entry is also written to a SQLite file and memory
+misses fall back to it, so the cache survives restarts; values must then
+be JSON-serializable. Expired rows are deleted on open and every
+``prune_every`` puts, so the file holds little more than the live entries.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires REAL NOT NULL
+)
+"""
+
+
+class TTLCache:
+    """LRU + TTL mapping from string keys to values."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        prune_every: int = 1000,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self._puts = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._db = None
+        self.hits = 0
+        self.misses = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(SCHEMA)
+            self._prune(clock())
+
+    def get(self, key: str) -> Optional[Any]:
+        """The live value stored under ``key``, or None."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires FROM entries WHERE key = ? AND expires > ?", (key, now)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        now = self._clock()
+        expires = now + self.ttl
+        with self._lock:
+            self._remember(key, expires, value)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires),
+                )
+                self._puts += 1
+                if self._puts >= self.prune_every:
+                    self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        """Delete the SQLite tier's expired rows."""
+        self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+        self._puts = 0
+
+    def discard(self, key: str) -> None:
+        """Forget ``key`` in both tiers, if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _remember(self, key: str, expires: float, value: Any) -> None:
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of ``get`` calls that found a live value."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        """Entries held in memory (expired ones included until touched or evicted)."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
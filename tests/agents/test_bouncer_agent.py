@@ -0,0 +1,142 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from src.agents.bouncer import (
+    NON_CLIENT_MESSAGE,
+    PREMIUM_CLIENT_MESSAGE,
+    REGULAR_CLIENT_MESSAGE,
+    abouncer_node,
+    bouncer_node,
+)
+from src.agents.guardrail import SAFE, prescreen
+from src.graph import models
+from src.utils.data import CustomerStore
+
+STORE = CustomerStore({
+    "customers": [],
+    "accounts": [{"iban": "DE001", "premium": True}, {"iban": "DE002", "premium": False}],
+})
+
+
+def _verified(iban, *earlier):
+    content = json.dumps({"status": "VERIFIED", "user_data": {"name": "Test User", "iban": iban}})
+    call = {"name": "verify_answer", "args": {"answer": "Yoda", "name": "Test User"}, "id": "call_1"}
+    return {"messages": [
+        *earlier,
+        HumanMessage(content="Yoda"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=content, name="verify_answer", tool_call_id="call_1"),
+    ], "identity": {"name": "Test User", "iban": iban}, "customer_key": iban, "is_verified": True}
+
+
+@patch("src.tools.bouncer_tools.get_customer_store", return_value=STORE)
+class TestBouncerFastPath(unittest.TestCase):
+
+    def setUp(self):
+        models.reset()
+        self.addCleanup(models.reset)
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_fixed_replies_right_after_verification(self, mock_chat, _):
+        for iban, status, reply in [
+            ("DE001", "Premium", PREMIUM_CLIENT_MESSAGE),
+            ("DE002", "Regular", REGULAR_CLIENT_MESSAGE),
+            ("DE999", "Non-Client", NON_CLIENT_MESSAGE),
+        ]:
+            with self.subTest(status=status):
+                result = bouncer_node(_verified(iban))
+
+                call, tool_result, response = result["messages"]
+                self.assertEqual(call.tool_calls[0]["name"], "check_account_status")
+                self.assertEqual(call.tool_calls[0]["args"], {"iban": iban})
+                self.assertEqual((tool_result.content, tool_result.tool_call_id), (status, call.tool_calls[0]["id"]))
+                self.assertEqual(response.content, reply)
+                self.assertEqual(result["account_status"], status)
+                self.assertEqual(prescreen(reply), (SAFE, None))
+        mock_chat.assert_not_called()
+
+    @patch("src.tools.inline_async.customer_store_in_memory", return_value=False)
+    @patch("src.graph.models.ChatOpenAI")
+    def test_async_node_checks_the_status_off_the_event_loop(self, mock_chat, _in_memory, get_store):
+        threads = []
+        get_store.side_effect = lambda: threads.append(threading.current_thread()) or STORE
+
+        result = asyncio.run(abouncer_node(_verified("DE002")))
+
+        self.assertEqual(result["messages"][-1].content, REGULAR_CLIENT_MESSAGE)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_regular_follow_up_stays_fixed(self, mock_chat, _):
+        state = {"messages": [HumanMessage(content="I want yacht insurance")], "account_status": "Regular"}
+
+        self.assertEqual(bouncer_node(state)["messages"][-1].content, REGULAR_CLIENT_MESSAGE)
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_premium_greeting_after_small_talk_stays_fixed(self, mock_chat, _):
+        state = _verified("DE001", HumanMessage(content="Hello! My name is Test User, my IBAN is DE001."))
+
+        self.assertEqual(bouncer_node(state)["messages"][-1].content, PREMIUM_CLIENT_MESSAGE)
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_premium_greeting_after_filler_words_stays_fixed(self, mock_chat, _):
+        for text in ["hiya", "ok", "cheers!", "Hi, how are you today?", "ok thx, that's me"]:
+            with self.subTest(text=text):
+                state = _verified("DE001", HumanMessage(content=text))
+
+                self.assertEqual(bouncer_node(state)["messages"][-1].content, PREMIUM_CLIENT_MESSAGE)
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_status_found_once_the_tool_result_is_summarized_away(self, mock_chat, _):
+        state = {"messages": [HumanMessage(content="Yoda")], "customer_key": "DE002", "is_verified": True}
+
+        result = bouncer_node(state)
+
+        self.assertEqual(result["messages"][-1].content, REGULAR_CLIENT_MESSAGE)
+        self.assertEqual(result["account_status"], "Regular")
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_premium_request_made_during_verification_goes_to_the_llm(self, mock_chat, _):
+        handoff = AIMessage(content="", tool_calls=[{"name": "handoff_to_specialist", "args": {}, "id": "call_2"}])
+        mock_chat.return_value.bind_tools.return_value.invoke.return_value = handoff
+        for text in ["Hi, I'm Test User and I need insurance for my yacht.", "ok, cheers. Can I get a mortgage?"]:
+            with self.subTest(text=text):
+                result = bouncer_node(_verified("DE001", HumanMessage(content=text)))
+
+                self.assertEqual(result["messages"][-1], handoff)
+                self.assertEqual(result["account_status"], "Premium")
+                self.assertNotIn(PREMIUM_CLIENT_MESSAGE, [m.content for m in result["messages"]])
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_premium_request_goes_to_the_llm(self, mock_chat, _):
+        handoff = AIMessage(content="", tool_calls=[{"name": "handoff_to_specialist", "args": {}, "id": "call_2"}])
+        mock_chat.return_value.bind_tools.return_value.invoke.return_value = handoff
+        state = {"messages": [HumanMessage(content="I want yacht insurance")], "account_status": "Premium"}
+
+        result = bouncer_node(state)
+
+        self.assertEqual(result["messages"], [handoff])
+        self.assertEqual(result["account_status"], "Premium")
+
+    @patch("src.agents.bouncer.BOUNCER_FAST_PATH_ENABLED", False)
+    @patch("src.graph.models.ChatOpenAI")
+    def test_disabled_fast_path_asks_the_llm(self, mock_chat, _):
+        mock_chat.return_value.bind_tools.return_value.invoke.return_value = AIMessage(content="Checking...")
+
+        result = bouncer_node(_verified("DE002"))
+
+        self.assertEqual([m.content for m in result["messages"]], ["Checking..."])
+        self.assertNotIn("account_status", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,27 @@
+import asyncio
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
-from src.agents.greeter import greeter_node
-from langchain_core.messages import HumanMessage, AIMessage
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.agents.greeter import SECRET_QUESTION_MESSAGE, WRONG_ANSWER_MESSAGE, agreeter_node, greeter_node
+from src.graph import models
+from src.utils.data import CustomerStore
+from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+
+STORE = CustomerStore({
+    "customers": [{
+        "name": "Lisa", "phone": "+1122334455", "iban": "DE89370400440532013000",
+        "secret": "What is the name of your pet?", "answer": "Yoda",
+    }],
+    "accounts": [],
+})
 
 class TestGreeterAgent(unittest.TestCase):
+
+    def setUp(self):
+        models.reset()
+        self.addCleanup(models.reset)
     
-    @patch('src.agents.greeter.ChatOpenAI')
+    @patch('src.graph.models.ChatOpenAI')
     def test_greeter_node(self, mock_chat):
         # Setup mock
         mock_model_instance = MagicMock()
@@ -25,5 +41,179 @@ class TestGreeterAgent(unittest.TestCase):
         self.assertEqual(result["messages"][0], expected_response)
         mock_model_with_tools.invoke.assert_called_once()
 
+    @patch('src.graph.models.ChatOpenAI')
+    def test_greeter_model_built_once(self, mock_chat):
+        mock_model_instance = mock_chat.return_value
+        mock_model_instance.bind_tools.return_value.invoke.return_value = AIMessage(content="Hello")
+
+        state = {"messages": [HumanMessage(content="Hi")]}
+        greeter_node(state)
+        greeter_node(state)
+
+        mock_chat.assert_called_once()
+        mock_model_instance.bind_tools.assert_called_once()
+        self.assertEqual(mock_model_instance.bind_tools.return_value.invoke.call_count, 2)
+
+    @patch('src.graph.models.ChatOpenAI')
+    def test_async_greeter_node(self, mock_chat):
+        mock_model_with_tools = mock_chat.return_value.bind_tools.return_value
+        expected_response = AIMessage(content="Hello")
+        mock_model_with_tools.ainvoke = AsyncMock(return_value=expected_response)
+
+        state = {"messages": [HumanMessage(content="Hi")]}
+        result = asyncio.run(agreeter_node(state))
+
+        self.assertEqual(result["messages"][0], expected_response)
+        mock_model_with_tools.ainvoke.assert_awaited_once()
+        mock_model_with_tools.invoke.assert_not_called()
+
+
+def _asked(question="What is the name of your pet?"):
+    """State after the lookup found Lisa and the secret question went out."""
+    return {
+        "identity": {"name": "Lisa", "phone": "+1122334455"},
+        "customer_key": "DE89370400440532013000",
+        "pending_question": question,
+    }
+
+
+@patch("src.tools.greeter_tools.get_customer_store", return_value=STORE)
+class TestGreeterFastPath(unittest.TestCase):
+
+    def setUp(self):
+        models.reset()
+        self.addCleanup(models.reset)
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_two_details_ask_the_secret_question(self, mock_chat, *_):
+        state = {"messages": [HumanMessage(content="Hi, I'm Lisa, my number is +1 122 334 455")]}
+
+        result = greeter_node(state)
+
+        call, tool_result, response = result["messages"]
+        self.assertEqual(call.tool_calls[0]["name"], "lookup_customer")
+        self.assertEqual(call.tool_calls[0]["args"], {"name": "Lisa", "phone": "+1 122 334 455"})
+        self.assertEqual(tool_result.tool_call_id, call.tool_calls[0]["id"])
+        self.assertTrue(tool_result.content.startswith("Customer found"))
+        self.assertEqual(response.content, SECRET_QUESTION_MESSAGE.format(question="What is the name of your pet?"))
+        self.assertEqual(result["identity"], {"name": "Lisa", "phone": "+1 122 334 455"})
+        self.assertEqual(result["customer_key"], "DE89370400440532013000")
+        self.assertEqual(result["pending_question"], "What is the name of your pet?")
+        mock_chat.assert_not_called()
+
+    @patch("src.tools.inline_async.customer_store_in_memory", return_value=False)
+    @patch("src.graph.models.ChatOpenAI")
+    def test_async_node_runs_the_tools_off_the_event_loop(self, mock_chat, _in_memory, get_store):
+        threads = []
+        get_store.side_effect = lambda: threads.append(threading.current_thread()) or STORE
+
+        asked = asyncio.run(agreeter_node(
+            {"messages": [HumanMessage(content="Hi, I'm Lisa, my number is +1 122 334 455")]}
+        ))
+        verified = asyncio.run(agreeter_node({"messages": [HumanMessage(content="Yoda")], **_asked()}))
+
+        self.assertEqual(asked["pending_question"], "What is the name of your pet?")
+        self.assertTrue(verified["is_verified"])
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(threading.main_thread(), threads)
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_details_collected_across_messages(self, mock_chat, *_):
+        mock_chat.return_value.bind_tools.return_value.invoke.return_value = AIMessage(content="And your phone?")
+
+        first = greeter_node({"messages": [HumanMessage(content="Hi, I'm Lisa")]})
+        self.assertEqual(first["identity"], {"name": "Lisa"})
+        second = greeter_node({"messages": [HumanMessage(content="+1122334455")], "identity": first["identity"]})
+
+        self.assertEqual(second["pending_question"], "What is the name of your pet?")
+        mock_chat.return_value.bind_tools.return_value.invoke.assert_called_once()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_async_node_takes_the_fast_path(self, mock_chat, *_):
+        state = {"messages": [HumanMessage(content="IBAN DE89 3704 0044 0532 0130 00, phone +1122334455")]}
+
+        result = asyncio.run(agreeter_node(state))
+
+        self.assertEqual(len(result["messages"]), 3)
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_unknown_details_go_to_the_llm_with_the_lookup(self, mock_chat, *_):
+        invoke = mock_chat.return_value.bind_tools.return_value.invoke
+        invoke.return_value = AIMessage(content="I couldn't find you")
+
+        result = greeter_node({"messages": [HumanMessage(content="I'm Bob, my number is +1 999 888 777")]})
+
+        call, tool_result, response = result["messages"]
+        self.assertTrue(tool_result.content.startswith("Customer not found"))
+        self.assertEqual(response.content, "I couldn't find you")
+        self.assertIsNone(result["pending_question"])
+        self.assertIs(invoke.call_args[0][0][-1], tool_result)
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_correct_answer_verifies_without_a_reply(self, mock_chat, *_):
+        state = {"messages": [HumanMessage(content="yoda.")], **_asked()}
+
+        result = greeter_node(state)
+
+        call, tool_result = result["messages"]
+        self.assertEqual(call.tool_calls[0]["args"], {"answer": "yoda", "name": "Lisa", "phone": "+1122334455"})
+        self.assertTrue(result["is_verified"])
+        self.assertIsNone(result["pending_question"])
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_one_word_wrong_answer_counts_as_a_failure(self, mock_chat, *_):
+        state = {"messages": [HumanMessage(content="Rex")], **_asked(), "failed_verification_attempts": 1}
+
+        result = greeter_node(state)
+
+        self.assertEqual(result["failed_verification_attempts"], 2)
+        self.assertEqual(
+            result["messages"][-1].content, WRONG_ANSWER_MESSAGE.format(question="What is the name of your pet?")
+        )
+        state.update(failed_verification_attempts=2)
+        self.assertTrue(greeter_node(state)["conversation_ended"])
+        mock_chat.assert_not_called()
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_answer_in_a_sentence_goes_to_the_llm(self, mock_chat, *_):
+        invoke = mock_chat.return_value.bind_tools.return_value.invoke
+        invoke.return_value = AIMessage(content="", tool_calls=[{"name": "verify_answer", "args": {}, "id": "c1"}])
+        state = {"messages": [HumanMessage(content="My pet is called Yoda")], **_asked()}
+
+        result = greeter_node(state)
+
+        self.assertEqual(len(result["messages"]), 1)
+        self.assertNotIn("failed_verification_attempts", result)
+        self.assertIn("The secret question has been asked", invoke.call_args[0][0][0].content)
+
+    @patch("src.graph.models.ChatOpenAI")
+    def test_llm_lookup_result_gets_the_question_in_code(self, mock_chat, *_):
+        state = {"messages": [
+            ToolMessage(
+                content="Customer found. Ask this secret question: What is the name of your pet?",
+                name="lookup_customer", tool_call_id="call_1",
+            ),
+        ], **_asked()}
+
+        result = greeter_node(state)
+
+        self.assertEqual(
+            [m.content for m in result["messages"]],
+            [SECRET_QUESTION_MESSAGE.format(question="What is the name of your pet?")],
+        )
+        mock_chat.assert_not_called()
+
+    @patch("src.agents.greeter.GREETER_FAST_PATH_ENABLED", False)
+    @patch("src.graph.models.ChatOpenAI")
+    def test_disabled_fast_path_asks_the_llm(self, mock_chat, *_):
+        mock_chat.return_value.bind_tools.return_value.invoke.return_value = AIMessage(content="Hello")
+
+        result = greeter_node({"messages": [HumanMessage(content="I'm Lisa, my number is +1122334455")]})
+
+        self.assertEqual([m.content for m in result["messages"]], ["Hello"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+from src.agents import guardrail
+from src.agents.guardrail import SafetyAssessment, avalidate_response, normalize_response, validate_response
+from src.utils import metrics
+from src.utils.ttl_cache import TTLCache
+
+class TestNormalizeResponse(unittest.TestCase):
+
+    def test_whitespace_and_case(self):
+        self.assertEqual(
+            normalize_response("  Hello,\n  how can I HELP you? "),
+            normalize_response("hello, how can i help you?"),
+        )
+
+    def test_company_phones_and_short_numbers_masked(self):
+        self.assertEqual(
+            normalize_response("Please call +11223344 within 3 days."),
+            normalize_response("Please call +9876543 within 14 days."),
+        )
+
+    def test_long_numbers_kept(self):
+        self.assertNotEqual(
+            normalize_response("Your number is +1 122 334 455."),
+            normalize_response("Your number is +1 122 334 456."),
+        )
+        self.assertIn("de89 3704 0044", normalize_response("IBAN DE89 3704 0044 0532 0130 00"))
+
+class TestVerdictCache(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        patcher = patch.object(guardrail, "_verdict_cache", TTLCache(maxsize=100, ttl=3600))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.chain = MagicMock()
+        self.chain.invoke.return_value = SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+        self.chain.ainvoke = AsyncMock(
+            return_value=SafetyAssessment(is_safe=False, violation_reason="PII", sanitized_content="Sorry.")
+        )
+        patcher = patch("src.agents.guardrail._chain", return_value=self.chain)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_equivalent_responses_share_a_verdict(self):
+        first = validate_response("Please call +11223344 about your loan request.")
+        second = validate_response("please call  +99887766 about your LOAN request.")
+
+        self.assertTrue(first.is_safe)
+        self.assertEqual(second, first)
+        self.chain.invoke.assert_called_once()
+        values = metrics.snapshot()
+        self.assertEqual(values["guardrail.llm_calls"], 1)
+        self.assertEqual(values["guardrail.cache.llm_calls_saved"], 1)
+        self.assertEqual(values["guardrail.cache.hit_ratio"], 0.5)
+
+    def test_async_path_uses_the_cache(self):
+        asyncio.run(avalidate_response("Your account number is 5550001234."))
+        verdict = validate_response("Your account number is 5550001234.")
+
+        self.assertFalse(verdict.is_safe)
+        self.assertEqual(verdict.violation_reason, "PII")
+        self.chain.ainvoke.assert_awaited_once()
+        self.chain.invoke.assert_not_called()
+
+    def test_sanitized_text_never_shared_between_replies(self):
+        self.chain.invoke.return_value = SafetyAssessment(
+            is_safe=False, violation_reason="Off-topic", sanitized_content="Sorry Anna, call +11223344."
+        )
+        first = validate_response("Anna, forget the bank and call +11223344 for a date.")
+        second = validate_response("Anna, forget the bank and call +9876543 for a date.")
+
+        self.assertEqual(first.sanitized_content, "Sorry Anna, call +11223344.")
+        self.assertFalse(second.is_safe)
+        self.assertIsNone(second.sanitized_content)
+        self.chain.invoke.assert_called_once()
+        for _, verdict in guardrail._verdict_cache._entries.values():
+            self.assertEqual(set(verdict), {"is_safe", "violation_reason"})
+
+    def test_policy_change_invalidates(self):
+        validate_response("I cannot set interest rates.")
+        with patch.object(guardrail, "POLICY_HASH", "other policy"):
+            validate_response("I cannot set interest rates.")
+        self.assertEqual(self.chain.invoke.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
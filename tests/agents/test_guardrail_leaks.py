@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.agents.guardrail import SafetyAssessment, avalidate_response, validate_response
+from src.utils import metrics
+from src.utils.data import CustomerStore
+from src.utils.leaks import LeakScanner
+
+STORE = CustomerStore({
+    "customers": [{"name": "John Smith", "phone": "+1234567890", "iban": "DE89370400440532013001",
+                   "secret": "Secret?", "answer": "Answer"}],
+    "accounts": [],
+})
+
+
+@patch("src.agents.guardrail.get_leak_scanner", return_value=LeakScanner.build(STORE))
+class TestGuardrailLeakScan(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    @patch("src.agents.guardrail._chain")
+    def test_customer_phone_is_redacted_without_the_llm(self, mock_chain, _):
+        assessment = validate_response("Sure, I will call you back on 1 234 567 890 today.")
+
+        self.assertFalse(assessment.is_safe)
+        self.assertEqual(assessment.sanitized_content, "Sure, I will call you back on [redacted] today.")
+        self.assertEqual(metrics.snapshot()["guardrail.leaks.redacted"], 1)
+        mock_chain.assert_not_called()
+
+    @patch("src.agents.guardrail.verdict_cache", return_value=None)
+    @patch("src.agents.guardrail._chain")
+    def test_full_name_goes_to_the_llm(self, mock_chain, _cache, _scanner):
+        verdict = SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+        mock_chain.return_value = MagicMock(invoke=MagicMock(return_value=verdict))
+
+        self.assertTrue(validate_response("Thank you, John Smith. How can I help?").is_safe)
+        mock_chain.assert_called_once()
+        self.assertEqual(metrics.snapshot()["guardrail.leaks.names_flagged"], 1)
+
+    @patch("src.agents.guardrail._chain")
+    def test_other_numbers_are_left_to_the_rules(self, mock_chain, _):
+        self.assertTrue(validate_response("Please call our support department at +11223344.").is_safe)
+        mock_chain.assert_not_called()
+
+    @patch("src.agents.guardrail.scans_in_memory", return_value=False)
+    def test_async_scan_waits_for_the_scanner_in_a_thread(self, _ready, scanner):
+        built = LeakScanner.build(STORE)
+        threads = []
+        scanner.side_effect = lambda: threads.append(threading.current_thread()) or built
+
+        assessment = asyncio.run(avalidate_response("Your IBAN is DE89 3704 0044 0532 0130 01."))
+
+        self.assertFalse(assessment.is_safe)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
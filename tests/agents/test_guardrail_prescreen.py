@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch
+from src.agents.greeter import TOO_MANY_FAILURES_MESSAGE
+from src.agents.guardrail import NEEDS_LLM, SAFE, UNSAFE, prescreen, validate_response
+
+class TestPrescreen(unittest.TestCase):
+
+    def test_safe(self):
+        for text in [
+            "",
+            TOO_MANY_FAILURES_MESSAGE,
+            "Hello! Welcome to DEUS Bank. How can I assist you today?",
+            "You are a regular client. Please call our support department at +11223344.",
+            "Could you please provide your name and either your phone number or IBAN?",
+            "Thank you.  what city were you born in?",
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(prescreen(text), (SAFE, None))
+
+    def test_unsafe(self):
+        for text in [
+            "The account DE89 3704 0044 0532 0130 00 belongs to John.",
+            "Your Social Security Number is 123-45-6789.",
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(prescreen(text)[0], UNSAFE)
+
+    def test_needs_llm(self):
+        for text in [
+            "You can reach our support department at +1112112112.",
+            "Your account number is 9876543210.",
+            "I've approved your loan at a 3.5% interest rate.",
+            "I cannot approve mortgages, but a specialist can help.",
+            "You should vote for the opposition.",
+            # Free text without numbers or risky words: tone, topic and PII only the LLM can judge.
+            "Your secret answer was Fluffy, by the way.",
+            "Thank you! Anna Schmidt is also one of our premium clients.",
+            "Honestly, that is a pretty stupid question.",
+            "The weather in Lisbon is lovely this time of year.",
+            " ".join(["Thank you!"] * 40),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(prescreen(text), (NEEDS_LLM, None))
+
+    @patch("src.agents.guardrail._chain")
+    def test_decided_responses_skip_the_llm(self, mock_chain):
+        safe = validate_response("Thank you! What is the name of your pet?")
+        unsafe = validate_response("Your IBAN is DE89370400440532013000, Lisa.")
+
+        self.assertTrue(safe.is_safe)
+        self.assertFalse(unsafe.is_safe)
+        self.assertEqual(unsafe.sanitized_content, "Your IBAN is [redacted], Lisa.")
+        mock_chain.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import unittest
+import httpx
+from fastapi.testclient import TestClient
+from src import api
+from src.utils.ttl_cache import TTLCache
+
+APPROVED_RUN_EVENTS = [
+    ("metadata", {"run_id": "r1"}),
+    ("updates", {"greeter": {"messages": [{"type": "ai", "id": "m1", "content": "Welcome to DEUS Bank!"}]}}),
+    ("updates", {"guardrail": None}),
+    ("values", {"messages": [{"type": "human", "content": "Hi"},
+                             {"type": "ai", "id": "m1", "content": "Welcome to DEUS Bank!"}],
+                "conversation_ended": False}),
+]
+
+RUN_EVENTS = [
+    ("metadata", {"run_id": "r1"}),
+    ("updates", {"greeter": {"messages": [{"type": "ai", "id": "m1", "content": "Your IBAN is DE89."}]}}),
+    ("updates", {"guardrail": {"messages": [{"type": "ai", "id": "m1", "content": "[redacted]"}]}}),
+    ("values", {"messages": [{"type": "human", "content": "Hi"}, {"type": "ai", "id": "m1", "content": "[redacted]"}],
+                "conversation_ended": False}),
+]
+
+
+def _sse_body(events):
+    return "".join(f"event: {event}\ndata: {json.dumps(data)}\n\n" for event, data in events).encode()
+
+
+class FakeLangGraph:
+    """Records requests and answers like the LangGraph API."""
+
+    def __init__(self, events=RUN_EVENTS):
+        self.events = events
+        self.requests = []
+        self.threads = set()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, request.url.path))
+        path = request.url.path
+        if path == "/threads":
+            self.threads.add(json.loads(request.content)["thread_id"])
+            return httpx.Response(200, json={})
+        thread_id = path.split("/")[2]
+        if thread_id not in self.threads:
+            return httpx.Response(404, json={"detail": "Thread not found"})
+        if path.endswith("/runs/wait"):
+            return httpx.Response(200, json=self.events[-1][1])
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=_sse_body(self.events))
+
+
+class TestBFF(unittest.TestCase):
+
+    def setUp(self):
+        api._known_threads = TTLCache(100, 60)
+        self.server = FakeLangGraph()
+        self.client = TestClient(api.app).__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+        api.app.state.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self.server), base_url="http://langgraph"
+        )
+
+    def test_thread_created_once(self):
+        for _ in range(3):
+            response = self.client.post("/chat", json={"message": "Hi", "thread_id": "t1"})
+            self.assertEqual(response.json()["response"], "[redacted]")
+
+        self.assertEqual(
+            self.server.requests,
+            [("POST", "/threads")] + [("POST", "/threads/t1/runs/wait")] * 3,
+        )
+
+    def test_lost_thread_is_created_again(self):
+        api._known_threads.put("t1", True)
+
+        response = self.client.post("/chat", json={"message": "Hi", "thread_id": "t1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, [
+            ("POST", "/threads/t1/runs/wait"), ("POST", "/threads"), ("POST", "/threads/t1/runs/wait"),
+        ])
+
+    def test_stream_releases_replies_the_guardrail_approves(self):
+        self.server.events = APPROVED_RUN_EVENTS
+
+        response = self.client.post("/chat/stream", json={"message": "Hi", "thread_id": "t1"})
+
+        self.assertEqual(response.text, _sse_body([
+            ("delta", {"message_id": "m1", "text": "Welcome to DEUS Bank!"}),
+            ("done", {"response": "Welcome to DEUS Bank!", "thread_id": "t1", "conversation_ended": False}),
+        ]).decode())
+
+    def test_stream_releases_guardrail_sanitized_replies(self):
+        response = self.client.post("/chat/stream", json={"message": "Hi", "thread_id": "t1"})
+
+        self.assertEqual(response.headers["content-type"], "text/event-stream; charset=utf-8")
+        self.assertEqual(response.text, _sse_body([
+            ("delta", {"message_id": "m1", "text": "[redacted]"}),
+            ("done", {"response": "[redacted]", "thread_id": "t1", "conversation_ended": False}),
+        ]).decode())
+
+    def test_upstream_errors_keep_their_status(self):
+        def unavailable(request):
+            return httpx.Response(502, text="bad gateway")
+        api.app.state.client = httpx.AsyncClient(transport=httpx.MockTransport(unavailable), base_url="http://lg")
+
+        response = self.client.post("/chat/stream", json={"message": "Hi"})
+
+        self.assertEqual(response.status_code, 502)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src import local_api
+from src.graph.config import VERIFY_BATCH_MAX_IDENTITIES
+from src.utils.data import CustomerStore
+
+STORE = CustomerStore({
+    "customers": [{"name": "Test User", "phone": "+123456789", "iban": "DE123456789",
+                   "secret": "Secret?", "answer": "Answer"}],
+    "accounts": [{"iban": "DE123456789", "premium": True}],
+})
+ADMIN = {"Authorization": "Bearer s3cret"}
+
+
+@patch("src.local_api.get_customer_store", return_value=STORE)
+class TestAdminEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        # No lifespan: the tests must not load the real customer data
+        self.client = TestClient(local_api.app)
+
+    @patch("src.local_api.ADMIN_API_TOKEN", "s3cret")
+    def test_verify_batch_with_token(self, _):
+        response = self.client.post("/verify/batch", headers=ADMIN, json=[
+            {"name": "Test User", "iban": "DE123456789"}, {"phone": "+000"},
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [
+            {"status": "MATCH", "tier": "Premium"}, {"status": "INSUFFICIENT_DETAILS", "tier": None},
+        ])
+
+    @patch("src.local_api.ADMIN_API_TOKEN", "s3cret")
+    def test_wrong_or_missing_token_rejected(self, _):
+        for headers in ({}, {"Authorization": "Bearer wrong"}, {"Authorization": "s3cret"}):
+            self.assertEqual(self.client.post("/verify/batch", headers=headers, json=[]).status_code, 401)
+            self.assertEqual(self.client.get("/metrics", headers=headers).status_code, 401)
+        self.assertEqual(self.client.get("/metrics", headers=ADMIN).status_code, 200)
+
+    @patch("src.local_api.ADMIN_API_TOKEN", "")
+    def test_disabled_without_a_token(self, _):
+        self.assertEqual(self.client.post("/verify/batch", headers=ADMIN, json=[]).status_code, 403)
+        self.assertEqual(self.client.get("/metrics", headers=ADMIN).status_code, 403)
+
+    @patch("src.local_api.ADMIN_API_TOKEN", "s3cret")
+    def test_batch_size_capped(self, store):
+        identities = [{"phone": "+123456789"}] * (VERIFY_BATCH_MAX_IDENTITIES + 1)
+
+        response = self.client.post("/verify/batch", headers=ADMIN, json=identities)
+
+        self.assertEqual(response.status_code, 422)
+        store.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
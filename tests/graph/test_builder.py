@@ -0,0 +1,51 @@
+import unittest
+import uuid
+
+from langchain_core.messages import HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.graph.builder import build_graph
+
+
+class _CountingSaver(MemorySaver):
+    def __init__(self):
+        super().__init__()
+        self.puts = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.puts += 1
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+class TestTurnTopology(unittest.TestCase):
+    """A turn the greeter's fast path settles: no model is called."""
+
+    MESSAGE = "Hi, I'm Lisa, my phone number is +1122334455"
+
+    def _turn(self, durability):
+        saver = _CountingSaver()
+        graph = build_graph(checkpointer=saver)
+        config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        steps = [
+            node
+            for update in graph.stream(
+                {"messages": [HumanMessage(content=self.MESSAGE)]}, config, stream_mode="updates", durability=durability
+            )
+            for node in update
+        ]
+        return steps, saver.puts, graph.get_state(config)
+
+    def test_turn_goes_straight_to_the_agent_and_ends_after_the_guardrail(self):
+        steps, puts, state = self._turn("async")
+
+        self.assertEqual(steps, ["greeter", "guardrail"])
+        # The input, LangGraph's __start__ step, then one per node.
+        self.assertEqual(puts, 4)
+        self.assertIn("What is the name of your pet?", state.values["messages"][-1].content)
+
+    def test_exit_durability_writes_once_per_turn(self):
+        steps, puts, state = self._turn("exit")
+
+        self.assertEqual(steps, ["greeter", "guardrail"])
+        self.assertEqual(puts, 1)
+        self.assertEqual(state.values["pending_question"], "What is the name of your pet?")
@@ -0,0 +1,492 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from importlib.util import find_spec
+from pathlib import Path
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from src.graph.checkpointer import (
+    POSTGRES,
+    BoundedMemorySaver,
+    ConnectionPool,
+    SQLCheckpointSaver,
+    WriteBehindSaver,
+    flush_checkpoints,
+    open_checkpointer,
+)
+from src.utils import metrics
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+
+class _PostgresStandIn:
+    """
+    A SQLite connection that takes psycopg's "%s" placeholders, to run the
+    Postgres statements; SQLite's own "?" is refused, as psycopg would.
+    """
+
+    def __init__(self, path):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+    def cursor(self):
+        cursor = self._connection.cursor()
+        execute, executemany = cursor.execute, cursor.executemany
+
+        def sqlite(query):
+            if "?" in query:
+                raise sqlite3.ProgrammingError(f"not a Postgres placeholder: {query}")
+            return query.replace("%s", "?")
+
+        class Cursor:
+            def execute(self, query, params=()):
+                return execute(sqlite(query), params)
+
+            def executemany(self, query, rows):
+                return executemany(sqlite(query), rows)
+
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+        return Cursor()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+class _State(MessagesState):
+    conversation_ended: bool
+
+
+def _echo(state):
+    text = state["messages"][-1].content
+    return {"messages": [AIMessage(content=f"echo: {text}")], "conversation_ended": text == "bye"}
+
+
+def _graph(checkpointer):
+    """Echoes each message, ending the conversation on "bye"; enough to give a thread checkpoints and writes."""
+    builder = StateGraph(_State)
+    builder.add_node("echo", _echo)
+    builder.add_edge(START, "echo")
+    builder.add_edge("echo", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+class _CheckpointerContract:
+    """Behaviour every backend must share; subclasses provide ``open()``."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = Path(self.directory.name) / "checkpoints.db"
+
+    def _turns(self, graph, thread_id, *texts):
+        config = {"configurable": {"thread_id": thread_id}}
+        for text in texts:
+            state = graph.invoke({"messages": [HumanMessage(content=text)]}, config)
+        return state
+
+    def test_conversation_state_round_trips(self):
+        graph = _graph(self.open())
+        self._turns(graph, "t1", "hi", "again")
+        self._turns(graph, "t2", "other")
+
+        state = graph.get_state({"configurable": {"thread_id": "t1"}})
+
+        self.assertEqual([m.content for m in state.values["messages"]], ["hi", "echo: hi", "again", "echo: again"])
+        self.assertEqual(len(graph.get_state({"configurable": {"thread_id": "t2"}}).values["messages"]), 2)
+
+    def test_history_lists_newest_first(self):
+        graph = _graph(self.open())
+        self._turns(graph, "t1", "hi", "again")
+        config = {"configurable": {"thread_id": "t1"}}
+
+        history = list(graph.get_state_history(config))
+        steps = [snapshot.metadata["step"] for snapshot in history]
+
+        self.assertEqual(steps, sorted(steps, reverse=True))
+        self.assertEqual(len(list(graph.get_state_history(config, limit=2))), 2)
+        before = list(graph.get_state_history(config, before=history[1].config))
+        self.assertEqual(len(before), len(history) - 2)
+        self.assertEqual(len(list(graph.get_state_history(config, filter={"source": "input"}))), 2)
+        # An older checkpoint still reads its own values.
+        self.assertEqual(len(history[-2].values["messages"]), 1)
+
+    def test_async_turns(self):
+        graph = _graph(self.open())
+
+        async def turns():
+            config = {"configurable": {"thread_id": "t1"}}
+            await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+            await graph.ainvoke({"messages": [HumanMessage(content="again")]}, config)
+            return await graph.aget_state(config)
+
+        self.assertEqual(len(asyncio.run(turns()).values["messages"]), 4)
+
+    def test_delete_thread(self):
+        saver = self.open()
+        graph = _graph(saver)
+        self._turns(graph, "t1", "hi")
+        self._turns(graph, "t2", "hi")
+
+        saver.delete_thread("t1")
+
+        self.assertIsNone(saver.get_tuple({"configurable": {"thread_id": "t1"}}))
+        self.assertIsNotNone(saver.get_tuple({"configurable": {"thread_id": "t2"}}))
+
+    def _compaction_turns(self, graph, thread_id):
+        config = {"configurable": {"thread_id": thread_id}}
+        self._turns(graph, thread_id, *(f"turn {n}" for n in range(6)))
+        # Like summarization: the list shrinks, so the next version cannot be a delta.
+        old = graph.get_state(config).values["messages"][:4]
+        graph.update_state(config, {"messages": [RemoveMessage(id=m.id) for m in old]})
+        self._turns(graph, thread_id, *(f"turn {n}" for n in range(6, 12)))
+        return graph.get_state(config)
+
+    def test_compacted_state_reads_like_the_full_one(self):
+        full = self._compaction_turns(_graph(self.open(history=0, delta_tail=0)), "full")
+        compacted = self._compaction_turns(_graph(self.open(history=3, delta_tail=2)), "compacted")
+
+        self.assertEqual(
+            [m.content for m in compacted.values["messages"]], [m.content for m in full.values["messages"]]
+        )
+        self.assertEqual(len(compacted.values["messages"]), 20)
+
+    def test_history_pruned_to_recent_checkpoints(self):
+        graph = _graph(self.open(history=3))
+        self._compaction_turns(graph, "t1")
+
+        history = list(graph.get_state_history({"configurable": {"thread_id": "t1"}}))
+
+        self.assertGreaterEqual(len(history), 3)
+        self.assertLess(len(history), 6)
+        # The oldest kept checkpoint still reads its values.
+        self.assertTrue(history[-1].values["messages"])
+
+
+class TestMemoryCheckpointer(_CheckpointerContract, unittest.TestCase):
+
+    def open(self, **options):
+        return BoundedMemorySaver(**options)
+
+
+class TestSqliteCheckpointer(_CheckpointerContract, unittest.TestCase):
+
+    def open(self, **options):
+        if options:
+            saver = SQLCheckpointSaver.sqlite(self.path, **options)
+        else:
+            saver = open_checkpointer(f"sqlite:///{self.path}")
+        self.addCleanup(saver.close)
+        return saver
+
+    def test_survives_a_restart(self):
+        self._turns(_graph(self.open()), "t1", "hi")
+
+        state = _graph(self.open()).get_state({"configurable": {"thread_id": "t1"}})
+
+        self.assertEqual(len(state.values["messages"]), 2)
+
+    def test_wal_mode(self):
+        self.open()
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_channel_values_stored_once_per_version(self):
+        self._turns(_graph(self.open()), "t1", "hi", "again")
+        with sqlite3.connect(self.path) as connection:
+            checkpoints = connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+            versions = connection.execute(
+                "SELECT COUNT(*) FROM checkpoint_blobs WHERE channel = 'messages'"
+            ).fetchone()[0]
+        # Each turn stores the input, then the reply: not one copy per checkpoint.
+        self.assertEqual(versions, 4)
+        self.assertGreater(checkpoints, versions)
+
+    def test_message_versions_stored_as_deltas(self):
+        self._turns(_graph(self.open(delta_tail=2)), "t1", "hi", "again", "and again")
+        with sqlite3.connect(self.path) as connection:
+            types = [row[0] for row in connection.execute(
+                "SELECT type FROM checkpoint_blobs WHERE channel = 'messages' ORDER BY version"
+            )]
+        # A full copy, two appended messages on it, then a new full copy.
+        self.assertEqual([t.startswith("delta+") for t in types], [False, True, True, False, True, True])
+
+
+class TestPostgresCheckpointer(_CheckpointerContract, unittest.TestCase):
+    """The Postgres dialect's statements, run on a SQLite stand-in."""
+
+    def open(self, **options):
+        saver = SQLCheckpointSaver(ConnectionPool(lambda: _PostgresStandIn(self.path), 2), POSTGRES, **options)
+        self.addCleanup(saver.close)
+        return saver
+
+
+@unittest.skipUnless(DATABASE_URL and find_spec("psycopg"), "needs DATABASE_URL and psycopg (uv sync --extra postgres)")
+class TestPostgresServer(_CheckpointerContract, unittest.TestCase):
+    """The contract on the Postgres database at DATABASE_URL; its checkpoint tables are written to."""
+
+    THREADS = ("t1", "t2", "full", "compacted")
+
+    def setUp(self):
+        super().setUp()
+        saver = self.open()
+        for thread_id in self.THREADS:
+            saver.delete_thread(thread_id)
+
+    def open(self, **options):
+        saver = SQLCheckpointSaver.postgres(DATABASE_URL, **options)
+        self.addCleanup(saver.close)
+        return saver
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedMemorySaver(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        self.clock = _Clock()
+
+    def _saver(self, **limits):
+        options = dict(max_threads=0, max_bytes=0, idle_ttl=0, ended_ttl=None, clock=self.clock)
+        return BoundedMemorySaver(**{**options, **limits})
+
+    def _chat(self, graph, thread_id, text="hi"):
+        graph.invoke({"messages": [HumanMessage(content=text)]}, {"configurable": {"thread_id": thread_id}})
+
+    def _held(self, saver):
+        return {t for t in ("t1", "t2", "t3") if saver.get_tuple({"configurable": {"thread_id": t}})}
+
+    def test_least_recently_used_thread_evicted_past_max_threads(self):
+        saver = self._saver(max_threads=2)
+        graph = _graph(saver)
+        self._chat(graph, "t1")
+        self._chat(graph, "t2")
+        graph.get_state({"configurable": {"thread_id": "t1"}})  # t1 is now the most recent
+
+        self._chat(graph, "t3")
+
+        self.assertEqual(self._held(saver), {"t1", "t3"})
+        self.assertEqual(saver.evictions["capacity"], 1)
+        self.assertEqual(metrics.snapshot()["checkpointer.evictions.capacity"], 1)
+
+    def test_bytes_limit(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        self._chat(graph, "t1")
+        one_thread = saver.bytes
+        self.assertGreater(one_thread, 0)
+        saver.max_bytes = int(one_thread * 1.5)
+
+        self._chat(graph, "t2")
+
+        self.assertEqual(self._held(saver), {"t2"})
+        self.assertEqual(saver.threads, 1)
+        self.assertEqual(metrics.snapshot()["checkpointer.bytes"], saver.bytes)
+
+    def test_idle_threads_evicted(self):
+        saver = self._saver(idle_ttl=60)
+        graph = _graph(saver)
+        self._chat(graph, "t1")
+        self.clock.now += 30
+        self._chat(graph, "t2")
+        self.clock.now += 31
+
+        self._chat(graph, "t3")
+
+        self.assertEqual(self._held(saver), {"t2", "t3"})
+        self.assertEqual(saver.evictions["idle"], 1)
+
+    def test_ended_conversations_evicted_sooner(self):
+        saver = self._saver(idle_ttl=3600, ended_ttl=60)
+        graph = _graph(saver)
+        self._chat(graph, "t1", "bye")
+        self._chat(graph, "t2")
+        self.clock.now += 61
+
+        self._chat(graph, "t3")
+
+        self.assertEqual(self._held(saver), {"t2", "t3"})
+        self.assertEqual(saver.evictions["ended"], 1)
+
+    def test_delete_and_unknown_reads_keep_accounts_straight(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        self._chat(graph, "t1")
+
+        self.assertIsNone(saver.get_tuple({"configurable": {"thread_id": "unknown"}}))
+        self.assertEqual(list(saver.list({"configurable": {"thread_id": "unknown"}})), [])
+        saver.delete_thread("t1")
+
+        self.assertEqual((saver.threads, saver.bytes), (0, 0))
+        self.assertEqual((len(saver.storage), len(saver.blobs), len(saver.writes)), (0, 0, 0))
+
+
+class TestWriteBehindSaver(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "checkpoints.db"
+
+    def _saver(self, interval=3600, batch=64):
+        saver = WriteBehindSaver(SQLCheckpointSaver.sqlite(self.path), interval=interval, batch=batch)
+        self.addCleanup(saver.close)
+        return saver
+
+    def _chat(self, graph, thread_id, *texts):
+        for text in texts:
+            graph.invoke({"messages": [HumanMessage(content=text)]}, {"configurable": {"thread_id": thread_id}})
+
+    def _stored(self):
+        with sqlite3.connect(self.path) as connection:
+            return connection.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0]
+
+    def _reopened(self, thread_id):
+        saver = SQLCheckpointSaver.sqlite(self.path)
+        self.addCleanup(saver.close)
+        return [m.content for m in _graph(saver).get_state({"configurable": {"thread_id": thread_id}}).values["messages"]]
+
+    def test_pending_turns_read_back_before_they_are_stored(self):
+        graph = _graph(self._saver())
+        self._chat(graph, "t1", "hi", "again")
+
+        state = graph.get_state({"configurable": {"thread_id": "t1"}})
+
+        self.assertEqual(self._stored(), 0)
+        self.assertEqual([m.content for m in state.values["messages"]], ["hi", "echo: hi", "again", "echo: again"])
+
+    def test_turn_end_flush_stores_one_checkpoint_per_turn(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        for text in ("hi", "again"):
+            self._chat(graph, "t1", text)
+            flush_checkpoints(saver, "t1")
+
+        self.assertEqual(self._stored(), 2)
+        self.assertEqual(self._reopened("t1"), ["hi", "echo: hi", "again", "echo: again"])
+        # Each turn's input, __start__ and echo checkpoints collapse into the last.
+        self.assertEqual(metrics.snapshot()["checkpointer.coalesced"], 4)
+        self.assertEqual(metrics.snapshot()["checkpointer.flushes"], 2)
+        self.assertEqual(len(list(graph.get_state_history({"configurable": {"thread_id": "t1"}}))), 2)
+
+    def test_flush_of_one_thread_leaves_the_others_pending(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        self._chat(graph, "t1", "hi")
+        self._chat(graph, "t2", "hi")
+
+        flush_checkpoints(saver, "t1")
+
+        self.assertEqual(self._stored(), 1)
+        self.assertEqual(metrics.snapshot()["checkpointer.pending"], 1)
+
+    def test_full_batch_stored_in_the_background(self):
+        graph = _graph(self._saver(batch=2))
+        self._chat(graph, "t1", "hi")
+        self._chat(graph, "t2", "hi")
+
+        deadline = time.monotonic() + 5
+        while self._stored() < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self._stored(), 2)
+
+    def test_close_stores_what_is_pending(self):
+        saver = self._saver()
+        self._chat(_graph(saver), "t1", "hi")
+
+        saver.close()
+
+        self.assertEqual(self._reopened("t1"), ["hi", "echo: hi"])
+
+    def test_failed_flush_is_retried_with_newer_checkpoints(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        self._chat(graph, "t1", "hi")
+        put_batch = saver.saver.put_batch
+        saver.saver.put_batch = lambda *args: (_ for _ in ()).throw(sqlite3.OperationalError("database is locked"))
+        with self.assertRaises(sqlite3.OperationalError):
+            saver.flush()
+        saver.saver.put_batch = put_batch
+        self._chat(graph, "t1", "again")
+
+        saver.flush()
+
+        self.assertEqual(self._stored(), 1)
+        self.assertEqual(self._reopened("t1"), ["hi", "echo: hi", "again", "echo: again"])
+
+    def test_delete_drops_pending_checkpoints(self):
+        saver = self._saver()
+        graph = _graph(saver)
+        self._chat(graph, "t1", "hi")
+        flush_checkpoints(saver)
+        self._chat(graph, "t1", "again")
+
+        saver.delete_thread("t1")
+        saver.flush()
+
+        self.assertIsNone(saver.get_tuple({"configurable": {"thread_id": "t1"}}))
+        self.assertEqual(self._stored(), 0)
+
+    def test_async_turns(self):
+        saver = self._saver()
+        graph = _graph(saver)
+
+        async def turns():
+            config = {"configurable": {"thread_id": "t1"}}
+            for text in ("hi", "again"):
+                await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+                await saver.aflush("t1")
+            return await graph.aget_state(config)
+
+        self.assertEqual(len(asyncio.run(turns()).values["messages"]), 4)
+        self.assertEqual(len(self._reopened("t1")), 4)
+
+
+class TestOpenCheckpointer(unittest.TestCase):
+
+    def test_memory_by_default_and_unknown_backends_rejected(self):
+        self.assertIsInstance(open_checkpointer("memory"), BoundedMemorySaver)
+        with self.assertRaises(ValueError):
+            open_checkpointer("redis://localhost")
+
+    def test_sql_backends_written_behind_when_enabled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            saver = open_checkpointer(f"sqlite:///{directory}/checkpoints.db", write_behind=True)
+            saver.close()
+        self.assertIsInstance(saver, WriteBehindSaver)
+        self.assertIsInstance(open_checkpointer("memory", write_behind=True), BoundedMemorySaver)
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_connections_are_reused_and_broken_ones_dropped(self):
+        opened = []
+        pool = ConnectionPool(lambda: opened.append(sqlite3.connect(":memory:")) or opened[-1], 2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            self.assertIs(second, first)
+        with self.assertRaises(RuntimeError):
+            with pool.connection():
+                raise RuntimeError
+        with pool.connection() as third:
+            self.assertIsNot(third, first)
+        self.assertEqual(len(opened), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.graph import models
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        models.reset()
+        self.addCleanup(models.reset)
+        patcher = patch("src.graph.models.ChatOpenAI", side_effect=lambda **kwargs: MagicMock(**kwargs))
+        self.mock_chat = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_agents_share_one_http_pool(self):
+        greeter = models.get_model("greeter")
+        guardrail = models.get_model("guardrail")
+        http_client, http_async_client = models.http_clients()
+
+        for call in self.mock_chat.call_args_list:
+            self.assertIs(call.kwargs["http_client"], http_client)
+            self.assertIs(call.kwargs["http_async_client"], http_async_client)
+        # Same model and temperature: one instance
+        self.assertIs(greeter, guardrail)
+
+    def test_per_agent_overrides(self):
+        with patch.dict(models.AGENT_LLM_MODELS, {"guardrail": "gpt-4o-mini"}), \
+                patch.dict(models.AGENT_LLM_TEMPERATURES, {"summarizer": 0.3}):
+            greeter = models.get_model("greeter")
+            guardrail = models.get_model("guardrail")
+            summarizer = models.get_model("summarizer")
+
+        self.assertIsNot(greeter, guardrail)
+        self.assertEqual(self.mock_chat.call_args_list[1].kwargs["model"], "gpt-4o-mini")
+        self.assertEqual(self.mock_chat.call_args_list[2].kwargs["temperature"], 0.3)
+        self.assertIsNot(greeter, summarizer)
+
+    def test_runnable_built_once_per_agent(self):
+        build = MagicMock()
+
+        first = models.get_runnable("specialist", build)
+        second = models.get_runnable("specialist", build)
+
+        self.assertIs(first, second)
+        build.assert_called_once_with(models.get_model("specialist"))
+
+    def test_warm_up_ignores_unreachable_endpoint(self):
+        with patch.dict("os.environ", {"OPENAI_BASE_URL": "http://127.0.0.1:9"}):
+            models.warm_up()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
 import unittest
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
-from src.graph.routing import dispatcher, greeter_router, route_after_bouncer, route_after_bouncer_tools, route_after_specialist
+from src.graph.routing import (
+    dispatcher,
+    greeter_router,
+    route_after_bouncer,
+    route_after_bouncer_tools,
+    route_after_guardrail,
+    route_after_specialist,
+    route_input,
+)
 from src.graph.state import State
 
 
@@ -154,5 +162,33 @@ class TestSpecialistRouter(unittest.TestCase):
         self.assertEqual(result, "continue_specialist")
 
 
+class TestTurnRouting(unittest.TestCase):
+
+    def test_input_goes_to_active_agent(self):
+        state = {"messages": [HumanMessage(content="Hi")], "active_agent": "bouncer"}
+        self.assertEqual(route_input(state), "bouncer")
+
+    def test_input_without_message_ends(self):
+        self.assertEqual(route_input({"messages": []}), "__end__")
+        self.assertEqual(route_input({"messages": [AIMessage(content="Hello")]}), "__end__")
+
+    def test_turn_ends_after_guardrail(self):
+        state = {"messages": [HumanMessage(content="Hi"), AIMessage(content="Hello")], "active_agent": "greeter"}
+        self.assertEqual(route_after_guardrail(state), "__end__")
+
+    def test_long_conversation_summarized_after_guardrail(self):
+        messages = [HumanMessage(content="Hi"), AIMessage(content="Hello")] * 10
+        self.assertEqual(route_after_guardrail({"messages": messages, "active_agent": "bouncer"}), "summarize_conversation")
+
+    def test_too_many_failures_ends_without_summary(self):
+        messages = [HumanMessage(content="Hi"), AIMessage(content="Hello")] * 10
+        state = {"messages": messages, "active_agent": "greeter", "failed_verification_attempts": 3}
+        self.assertEqual(route_after_guardrail(state), "__end__")
+
+    def test_guardrail_never_hands_the_turn_to_an_agent(self):
+        state = {"messages": [AIMessage(content="Hello"), HumanMessage(content="Hi")], "active_agent": "bouncer"}
+        self.assertEqual(route_after_guardrail(state), "__end__")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, AIMessageChunk
+from src.agents.guardrail import SafetyAssessment
+from src.graph.streaming import SentenceBuffer, stream_turn
+
+
+class FakeGraph:
+    """Replays (mode, chunk) pairs like ``graph.astream(stream_mode=["messages", "values"])``."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def astream(self, payload, config, stream_mode, durability=None):
+        for chunk in self.chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+def _token(text, node="greeter", message_id="m1", last=False):
+    chunk = AIMessageChunk(content=text, id=message_id, chunk_position="last" if last else None)
+    return "messages", (chunk, {"langgraph_node": node})
+
+
+async def _validate(text):
+    if "secret" in text:
+        return SafetyAssessment(is_safe=False, violation_reason="PII", sanitized_content="[redacted].")
+    return SafetyAssessment(is_safe=True, violation_reason=None, sanitized_content=None)
+
+
+async def _collect(graph):
+    return [event async for event in stream_turn(graph, "Hi", "thread-1")]
+
+
+class TestSentenceBuffer(unittest.TestCase):
+
+    def test_releases_whole_sentences(self):
+        buffer = SentenceBuffer()
+
+        self.assertEqual(buffer.feed("Hello"), "")
+        self.assertEqual(buffer.feed("! How are"), "Hello! ")
+        self.assertEqual(buffer.feed(" you? I can help with 3.5 or"), "How are you? ")
+        self.assertEqual(buffer.flush(), "I can help with 3.5 or")
+        self.assertEqual(buffer.flush(), "")
+
+
+@patch("src.graph.streaming.avalidate_response", side_effect=_validate)
+class TestStreamTurn(unittest.TestCase):
+
+    def test_sentences_are_validated_before_release(self, _):
+        graph = FakeGraph([
+            _token("Hello there. The "),
+            _token("secret is out. "),
+            _token("Bye", last=True),
+            ("values", {"messages": [AIMessage(content="Hello there. [redacted]. Bye")]}),
+        ])
+
+        events = asyncio.run(_collect(graph))
+
+        self.assertEqual(events, [
+            ("delta", {"message_id": "m1", "text": "Hello there. "}),
+            ("delta", {"message_id": "m1", "text": "[redacted]."}),
+            ("delta", {"message_id": "m1", "text": "Bye"}),
+            ("done", {"response": "Hello there. [redacted]. Bye", "thread_id": "thread-1",
+                      "conversation_ended": False}),
+        ])
+
+    def test_internal_nodes_are_not_streamed(self, _):
+        graph = FakeGraph([
+            _token('{"is_safe": true}', node="guardrail", last=True),
+            _token("Summary of the chat.", node="summarize_conversation", last=True),
+            _token("Welcome", node="bouncer", message_id="m2"),
+            ("values", {"messages": [AIMessage(content="Welcome")], "conversation_ended": True}),
+        ])
+
+        events = asyncio.run(_collect(graph))
+
+        # The bouncer never marked its last chunk: the tail is flushed at the end.
+        self.assertEqual(events[0], ("delta", {"message_id": "m2", "text": "Welcome"}))
+        self.assertEqual(events[1][1]["conversation_ended"], True)
+        self.assertEqual(len(events), 2)
+
+    def test_replies_built_in_code_are_streamed_whole(self, _):
+        graph = FakeGraph([
+            ("messages", (AIMessage(content="", id="m3"), {"langgraph_node": "bouncer"})),
+            ("messages", (AIMessage(content="You are a regular client. Call us.", id="m4"), {"langgraph_node": "bouncer"})),
+            ("values", {"messages": [AIMessage(content="You are a regular client. Call us.")]}),
+        ])
+
+        events = asyncio.run(_collect(graph))
+
+        self.assertEqual(events[0], ("delta", {"message_id": "m4", "text": "You are a regular client. Call us."}))
+        self.assertEqual(len(events), 2)
+
+    def test_bouncer_text_is_dropped_when_it_hands_off(self, _):
+        handoff = {"name": "handoff_to_specialist", "args": "{}", "id": "call_1", "index": 0, "type": "tool_call_chunk"}
+        graph = FakeGraph([
+            _token("Let me transfer you. ", node="bouncer", message_id="m5"),
+            ("messages", (AIMessageChunk(content="", id="m5", tool_call_chunks=[handoff], chunk_position="last"),
+                          {"langgraph_node": "bouncer"})),
+            _token("Welcome. How can ", node="bouncer", message_id="m6"),
+            _token("I help?", node="bouncer", message_id="m6", last=True),
+            ("values", {"messages": [AIMessage(content="Welcome. How can I help?")]}),
+        ])
+
+        events = asyncio.run(_collect(graph))
+
+        self.assertEqual(events[:-1], [("delta", {"message_id": "m6", "text": "Welcome. How can I help?"})])
+
+    def test_events_keep_their_order_when_checks_finish_out_of_order(self, mock_validate):
+        async def slow_first(text):
+            if text.startswith("First"):
+                await asyncio.sleep(0.05)
+            return await _validate(text)
+        mock_validate.side_effect = slow_first
+        graph = FakeGraph([
+            _token("First one. "),
+            _token("Second one.", last=True),
+            ("values", {"messages": [AIMessage(content="First one. Second one.")]}),
+        ])
+
+        events = asyncio.run(_collect(graph))
+
+        self.assertEqual([data.get("text") for _, data in events], ["First one. ", "Second one.", None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import unittest
+from unittest.mock import patch
+from langchain_core.messages import AIMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+from src.graph.routing import route_after_greeter_tools
+from src.graph.state import State
+from src.graph.verification import (
+    after_verification,
+    collect,
+    is_verified_result,
+    tool_updates,
+    tools_node,
+)
+from src.tools.greeter_tools import lookup_customer, verify_answer
+from src.utils.data import CustomerStore
+
+STORE = CustomerStore({
+    "customers": [{
+        "name": "Lisa", "phone": "+1122334455", "iban": "DE89 3704 0044 0532 0130 00",
+        "secret": "What is the name of your pet?", "answer": "Yoda",
+    }],
+    "accounts": [],
+})
+VERIFIED = json.dumps({"status": "VERIFIED", "user_data": {"name": "Lisa", "iban": "DE89370400440532013000"}})
+
+
+def _call(name, args, call_id="call_1"):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": call_id}])
+
+
+class TestTransitions(unittest.TestCase):
+
+    def test_verified_result_is_parsed_not_searched(self):
+        self.assertTrue(is_verified_result(VERIFIED))
+        for result in ["Incorrect answer", "NOT VERIFIED", '"VERIFIED"', "Customer not found."]:
+            with self.subTest(result=result):
+                self.assertFalse(is_verified_result(result))
+
+    def test_failures_count_up_and_reset_on_success(self):
+        self.assertEqual(after_verification({"failed_verification_attempts": 1}, "Incorrect answer"),
+                         {"failed_verification_attempts": 2})
+        updates = after_verification({"failed_verification_attempts": 2, "pending_question": "?"}, VERIFIED)
+        self.assertEqual(updates["failed_verification_attempts"], 0)
+        self.assertTrue(updates["is_verified"])
+        self.assertIsNone(updates["pending_question"])
+        self.assertEqual(updates["customer_key"], "DE89370400440532013000")
+
+    def test_collect_merges_and_reports_nothing_new(self):
+        state = {"identity": {"name": "Lisa"}}
+        self.assertEqual(collect(state, {"phone": "+1122334455", "iban": None}),
+                         {"name": "Lisa", "phone": "+1122334455"})
+        self.assertIsNone(collect(state, {"name": "Lisa"}))
+        self.assertIsNone(collect({}, {"name": None}))
+
+    def test_lookup_result_records_customer_and_question(self):
+        state = {"messages": [_call("lookup_customer", {"name": "Lisa", "phone": "+1122334455"})]}
+        result = ToolMessage(
+            content="Customer found. Ask this secret question: What is the name of your pet?",
+            name="lookup_customer", tool_call_id="call_1", artifact="DE89370400440532013000",
+        )
+
+        self.assertEqual(tool_updates(state, [result]), {
+            "identity": {"name": "Lisa", "phone": "+1122334455"},
+            "customer_key": "DE89370400440532013000",
+            "pending_question": "What is the name of your pet?",
+        })
+
+
+@patch("src.tools.greeter_tools.get_customer_store", return_value=STORE)
+class TestToolsNode(unittest.TestCase):
+
+    def setUp(self):
+        # ToolNode needs the graph's runtime, so run it as the only node of one.
+        builder = StateGraph(State)
+        builder.add_node("greeter_tools", tools_node([lookup_customer, verify_answer]))
+        builder.add_edge(START, "greeter_tools")
+        builder.add_edge("greeter_tools", END)
+        self.graph = builder.compile()
+
+    def test_records_verification_for_routing(self, *_):
+        state = {
+            "messages": [_call("verify_answer", {"answer": "Yoda", "name": "Lisa", "phone": "+1122334455"})],
+            "pending_question": "What is the name of your pet?",
+        }
+
+        result = self.graph.invoke(state)
+
+        self.assertEqual(result["messages"][-1].name, "verify_answer")
+        self.assertTrue(result["is_verified"])
+        self.assertEqual(route_after_greeter_tools(result), "go_to_bouncer")
+
+    def test_lookup_records_the_customer_found_by_the_tool(self, _):
+        state = {"messages": [_call("lookup_customer", {"name": "Lisa", "phone": "+1122334455"})]}
+
+        with patch.object(STORE, "find_customer", wraps=STORE.find_customer) as find_customer:
+            result = self.graph.invoke(state)
+
+        self.assertEqual(result["customer_key"], "DE89370400440532013000")
+        self.assertEqual(result["pending_question"], "What is the name of your pet?")
+        self.assertNotIn("DE89", result["messages"][-1].content)
+        find_customer.assert_called_once()
+
+    def test_wrong_answer_returns_to_greeter(self, *_):
+        state = {"messages": [_call("verify_answer", {"answer": "Rex", "name": "Lisa", "phone": "+1122334455"})]}
+
+        result = self.graph.invoke(state)
+
+        self.assertEqual(result["failed_verification_attempts"], 1)
+        self.assertEqual(route_after_greeter_tools(result), "return_to_greeter")
+
+
+if __name__ == '__main__':
+    unittest.main()
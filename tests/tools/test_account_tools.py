@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 from src.tools.bouncer_tools import check_account_status
+from src.utils.data import CustomerStore
 
 class TestAccountTools(unittest.TestCase):
 
@@ -13,27 +14,27 @@ class TestAccountTools(unittest.TestCase):
             ]
         }
 
-    @patch('src.tools.bouncer_tools.load_customers_data')
-    def test_check_account_status_premium(self, mock_load_data):
-        mock_load_data.return_value = self.mock_data
+    @patch('src.tools.bouncer_tools.get_customer_store')
+    def test_check_account_status_premium(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_data)
         result = check_account_status.invoke("PREMIUM_IBAN")
         self.assertEqual(result, "Premium")
 
-    @patch('src.tools.bouncer_tools.load_customers_data')
-    def test_check_account_status_regular(self, mock_load_data):
-        mock_load_data.return_value = self.mock_data
+    @patch('src.tools.bouncer_tools.get_customer_store')
+    def test_check_account_status_regular(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_data)
         result = check_account_status.invoke("REGULAR_IBAN")
         self.assertEqual(result, "Regular")
 
-    @patch('src.tools.bouncer_tools.load_customers_data')
-    def test_check_account_status_non_client(self, mock_load_data):
-        mock_load_data.return_value = self.mock_data
+    @patch('src.tools.bouncer_tools.get_customer_store')
+    def test_check_account_status_non_client(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_data)
         result = check_account_status.invoke("NON_EXISTENT_IBAN")
         self.assertEqual(result, "Non-Client")
 
-    @patch('src.tools.bouncer_tools.load_customers_data')
-    def test_check_account_status_whitespace(self, mock_load_data):
-        mock_load_data.return_value = self.mock_data
+    @patch('src.tools.bouncer_tools.get_customer_store')
+    def test_check_account_status_whitespace(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_data)
         result = check_account_status.invoke("  PREMIUM_IBAN  ")
         self.assertEqual(result, "Premium")
 
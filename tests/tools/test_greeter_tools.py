@@ -1,6 +1,9 @@
+import asyncio
+import threading
 import unittest
 from unittest.mock import patch
 from src.tools.greeter_tools import lookup_customer, verify_answer
+from src.utils.data import CustomerStore
 
 class TestGreeterTools(unittest.TestCase):
 
@@ -24,9 +27,9 @@ class TestGreeterTools(unittest.TestCase):
             ]
         }
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_lookup_customer_insufficient_details(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_lookup_customer_insufficient_details(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         # 0 details
         result = lookup_customer.invoke({})
@@ -36,9 +39,9 @@ class TestGreeterTools(unittest.TestCase):
         result = lookup_customer.invoke({"name": "Test User"})
         self.assertIn("Error: You must provide at least two details", result)
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_lookup_customer_success(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_lookup_customer_success(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         # Name + Phone
         result = lookup_customer.invoke({"name": "Test User", "phone": "+123456789"})
@@ -53,9 +56,9 @@ class TestGreeterTools(unittest.TestCase):
         result = lookup_customer.invoke({"phone": "+123456789", "iban": "DE123456789"})
         self.assertIn("Customer found", result)
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_lookup_customer_mismatch(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_lookup_customer_mismatch(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         # Matching name but wrong phone
         result = lookup_customer.invoke({"name": "Test User", "phone": "+987654321"})
@@ -65,9 +68,31 @@ class TestGreeterTools(unittest.TestCase):
         result = lookup_customer.invoke({"name": "Non Existent", "phone": "+000000000"})
         self.assertIn("Customer not found", result)
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_verify_answer_success(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_lookup_customer_async(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
+
+        result = asyncio.run(lookup_customer.ainvoke({"name": "Test User", "phone": "+123456789"}))
+        self.assertIn("Customer found", result)
+        result = asyncio.run(verify_answer.ainvoke({"name": "Test User", "phone": "+123456789", "answer": "The Answer"}))
+        self.assertIn("VERIFIED", result)
+
+    @patch('src.tools.inline_async.customer_store_in_memory', return_value=False)
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_lookup_opens_a_cold_store_off_the_event_loop(self, mock_get_store, _ready):
+        threads = []
+        store = CustomerStore(self.mock_customers)
+        mock_get_store.side_effect = lambda: threads.append(threading.current_thread()) or store
+
+        result = asyncio.run(lookup_customer.ainvoke({"name": "Test User", "phone": "+123456789"}))
+
+        self.assertIn("Customer found", result)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_verify_answer_success(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         # Correct answer
         result = verify_answer.invoke({"name": "Test User", "phone": "+123456789", "answer": "The Answer"})
@@ -77,16 +102,16 @@ class TestGreeterTools(unittest.TestCase):
         result = verify_answer.invoke({"name": "Test User", "phone": "+123456789", "answer": "the answer"})
         self.assertIn("VERIFIED", result)
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_verify_answer_incorrect(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_verify_answer_incorrect(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         result = verify_answer.invoke({"name": "Test User", "phone": "+123456789", "answer": "Wrong Answer"})
         self.assertIn("Incorrect answer", result)
 
-    @patch('src.tools.greeter_tools.load_customers_data')
-    def test_verify_answer_customer_not_found(self, mock_load_data):
-        mock_load_data.return_value = self.mock_customers
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_verify_answer_customer_not_found(self, mock_get_store):
+        mock_get_store.return_value = CustomerStore(self.mock_customers)
         
         result = verify_answer.invoke({"name": "Non Existent", "phone": "+123456789", "answer": "The Answer"})
         self.assertIn("Customer not found", result)
@@ -0,0 +1,89 @@
+"""
+Formatted identifiers, as customers type them, against the bundled customer data.
+
+Every lookup miss costs the greeter an extra LLM round trip (apologise, ask
+again, call the tool again), so the corpus below measures how many of those
+turns canonical phone/IBAN keys save compared to the old strip-only match.
+"""
+
+import json
+import unittest
+from unittest.mock import patch
+from src.tools.greeter_tools import INVALID_IBAN_MESSAGE, lookup_customer
+from src.utils.data import CustomerStore, _resolve_data_path
+
+# (details as typed, customer they identify)
+CORPUS = [
+    ({"name": "Lisa", "phone": "+1122334455"}, "Lisa"),
+    ({"name": "Lisa", "phone": "+1 122 334 455"}, "Lisa"),
+    ({"name": "Lisa", "phone": "001122334455"}, "Lisa"),
+    ({"name": "Lisa", "phone": "+1 (122) 334-455"}, "Lisa"),
+    ({"name": "lisa", "iban": "DE89370400440532013000"}, "Lisa"),
+    ({"name": "Lisa", "iban": "de89 3704 0044 0532 0130 00"}, "Lisa"),
+    ({"phone": "0011 2233 4455", "iban": "DE89 3704 0044 0532 0130 00"}, "Lisa"),
+    ({"name": "John Smith", "phone": "+1234567890"}, "John Smith"),
+    ({"name": "John Smith", "phone": "+1 234-567-890"}, "John Smith"),
+    ({"name": "John Smith", "iban": "de89370400440532013001"}, "John Smith"),
+    ({"name": "Maria Garcia", "iban": "ES91 2100 0418 4502 0005 1332"}, "Maria Garcia"),
+    ({"name": "Maria Garcia", "phone": "0098 7654 3210"}, "Maria Garcia"),
+]
+
+
+def _strip_only_match(data, name=None, phone=None, iban=None):
+    """The matching rule before canonical keys: strip() and compare."""
+    for customer in data["customers"]:
+        if name and customer["name"].strip().lower() != name.strip().lower():
+            continue
+        if phone and customer["phone"].strip() != phone.strip():
+            continue
+        if iban and customer["iban"].strip() != iban.strip():
+            continue
+        return customer
+    return None
+
+
+class TestIdentifierFormats(unittest.TestCase):
+
+    def setUp(self):
+        with open(_resolve_data_path()) as f:
+            self.data = json.load(f)
+        self.store = CustomerStore(self.data)
+
+    def test_every_spelling_finds_the_customer(self):
+        for details, expected in CORPUS:
+            with self.subTest(details=details):
+                self.assertEqual(self.store.find_customer(**details)["name"], expected)
+
+    def test_llm_turns_saved(self):
+        old_misses = sum(_strip_only_match(self.data, **details) is None for details, _ in CORPUS)
+        new_misses = sum(self.store.find_customer(**details) is None for details, _ in CORPUS)
+        # Each miss is at least one extra greeter turn to re-ask and retry.
+        print(f"\nformatted-input corpus: {len(CORPUS)} lookups, "
+              f"{old_misses} retries before, {new_misses} after, {old_misses - new_misses} LLM turns saved")
+        self.assertEqual(new_misses, 0)
+        self.assertEqual(old_misses, 9)
+
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_invalid_iban_rejected_before_lookup(self, mock_get_store):
+        mock_get_store.return_value = self.store
+        # Lisa's IBAN with two digits swapped fails the checksum.
+        with patch.object(self.store, "find_customer") as find_customer:
+            result = lookup_customer.invoke({"name": "Lisa", "iban": "DE89370400440532010300"})
+        self.assertEqual(result, INVALID_IBAN_MESSAGE)
+        find_customer.assert_not_called()
+
+    @patch('src.tools.greeter_tools.get_customer_store')
+    def test_legacy_iban_on_file_is_accepted(self, mock_get_store):
+        mock_get_store.return_value = self.store
+        # John's IBAN fails mod-97 but is a record we hold.
+        result = lookup_customer.invoke({"name": "John Smith", "iban": "DE89370400440532013001"})
+        self.assertIn("Customer found", result)
+
+    def test_legacy_ibans_listed_at_load(self):
+        self.assertTrue(self.store.has_legacy_iban("de89 3704 0044 0532 0130 01"))
+        self.assertFalse(self.store.has_legacy_iban("DE89370400440532013000"))
+        self.assertFalse(self.store.has_legacy_iban("DE89370400440532010300"))
+
+
+if __name__ == '__main__':
+    unittest.main()
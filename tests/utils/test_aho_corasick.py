@@ -0,0 +1,51 @@
+import random
+import unittest
+from src.utils.aho_corasick import TokenAutomaton
+
+
+def _brute_force(patterns, text):
+    found = set()
+    for tokens, label in patterns.items():
+        for end in range(len(tokens) - 1, len(text)):
+            if tuple(text[end - len(tokens) + 1:end + 1]) == tokens:
+                found.add((end, len(tokens), label))
+    return found
+
+
+class TestTokenAutomaton(unittest.TestCase):
+
+    def test_overlapping_and_nested_patterns(self):
+        automaton = TokenAutomaton([([1, 2, 3], 1), ([2, 3], 2), ([3], 3), ([2, 3, 4], 1)])
+
+        self.assertEqual(
+            sorted(automaton.scan([1, 2, 3, 4])),
+            [(2, 1, 3), (2, 2, 2), (2, 3, 1), (3, 3, 1)],
+        )
+        self.assertEqual(list(automaton.scan([5, 6])), [])
+
+    def test_repeated_pattern_keeps_first_label(self):
+        automaton = TokenAutomaton([([7, 8], 1), ([7, 8], 2)])
+
+        self.assertEqual(automaton.patterns, 1)
+        self.assertEqual(list(automaton.scan([7, 8])), [(1, 2, 1)])
+
+    def test_matches_brute_force_beyond_initial_table_size(self):
+        rng = random.Random(0)
+        patterns = {}
+        while len(patterns) < 2000:
+            tokens = tuple(rng.randrange(12) for _ in range(rng.randint(1, 4)))
+            patterns.setdefault(tokens, rng.randint(1, 3))
+        automaton = TokenAutomaton(patterns.items())
+        text = [rng.randrange(12) for _ in range(500)]
+
+        self.assertEqual(automaton.patterns, len(patterns))
+        self.assertEqual(set(automaton.scan(text)), _brute_force(patterns, text))
+
+    def test_large_token_hashes(self):
+        automaton = TokenAutomaton([([0xFFFFFFFE, 0x80000000], 5)])
+
+        self.assertEqual(list(automaton.scan([1, 0xFFFFFFFE, 0x80000000])), [(2, 2, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
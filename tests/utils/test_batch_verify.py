@@ -0,0 +1,83 @@
+import csv
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.utils.batch_verify import INSUFFICIENT_DETAILS, MATCH, NO_MATCH, main, verify_batch
+from src.utils.data import CustomerStore
+from src.utils.sqlite_store import SqliteCustomerStore, import_json
+
+
+class TestBatchVerify(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "customers": [
+                {"name": "Test User", "phone": "+123456789", "iban": "DE123456789",
+                 "secret": "Secret one?", "answer": "One"},
+                {"name": "Another User", "phone": "+987654321", "iban": "DE987654321",
+                 "secret": "Secret two?", "answer": "Two"},
+                {"name": "No Account", "phone": "+555000111", "iban": "DE555000111",
+                 "secret": "Secret three?", "answer": "Three"},
+            ],
+            "accounts": [
+                {"iban": "DE123456789", "premium": True},
+                {"iban": "DE987654321", "premium": False},
+            ],
+        }
+        self.identities = [
+            {"name": "test user", "phone": "+123 456 789"},
+            {"phone": "+987654321", "iban": "DE987654321"},
+            {"name": "No Account", "iban": "DE555000111"},
+            {"name": "Test User", "phone": "+123456789", "iban": "DE987654321"},
+            {"name": "Test User"},
+            {"name": "", "phone": "+123456789", "iban": None},
+        ]
+        self.expected = [
+            (MATCH, "Premium"),
+            (MATCH, "Regular"),
+            (MATCH, "Non-Client"),
+            (NO_MATCH, None),
+            (INSUFFICIENT_DETAILS, None),
+            (INSUFFICIENT_DETAILS, None),
+        ]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = Path(self.tmp.name) / "customers.json"
+        self.json_path.write_text(json.dumps(self.data))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_statuses_and_tiers(self):
+        results = verify_batch(CustomerStore(self.data), self.identities)
+        self.assertEqual([tuple(result) for result in results], self.expected)
+
+    def test_sqlite_backend_agrees(self):
+        db_path = Path(self.tmp.name) / "customers.db"
+        import_json(self.json_path, db_path)
+        store = SqliteCustomerStore(db_path, pool_size=1)
+        try:
+            results = verify_batch(store, self.identities)
+        finally:
+            store.close()
+        self.assertEqual([tuple(result) for result in results], self.expected)
+
+    def test_cli_csv_round_trip(self):
+        input_path = Path(self.tmp.name) / "calls.csv"
+        output_path = Path(self.tmp.name) / "results.csv"
+        with open(input_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["call_id", "name", "phone", "iban"])
+            writer.writeheader()
+            for i, identity in enumerate(self.identities):
+                writer.writerow({"call_id": i, **identity})
+
+        main([str(input_path), "-o", str(output_path), "--data", str(self.json_path)])
+
+        with open(output_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["call_id"] for row in rows], [str(i) for i in range(len(self.identities))])
+        self.assertEqual([(row["status"], row["tier"] or None) for row in rows], self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
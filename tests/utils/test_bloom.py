@@ -0,0 +1,32 @@
+import unittest
+from src.utils.bloom import BloomFilter, key_hashes
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def setUp(self):
+        self.members = [f"DE{i:020d}".encode() for i in range(20_000)]
+        self.bloom = BloomFilter.from_hashes(map(key_hashes, self.members), len(self.members), 0.01)
+
+    def test_no_false_negatives(self):
+        self.assertTrue(all(self.bloom.might_contain(key_hashes(key)) for key in self.members))
+        self.assertEqual(len(self.bloom), len(self.members))
+
+    def test_false_positive_rate_near_target(self):
+        others = [f"NL{i:020d}".encode() for i in range(20_000)]
+        observed = sum(self.bloom.might_contain(key_hashes(key)) for key in others) / len(others)
+        self.assertLess(observed, 0.02)
+        self.assertAlmostEqual(self.bloom.false_positive_rate, 0.01, delta=0.002)
+
+    def test_add_and_buffers_round_trip(self):
+        bloom = BloomFilter.for_capacity(10)
+        bloom.add(key_hashes(b"DE1"))
+        # As read back from a snapshot: raw byte views.
+        copy = BloomFilter.from_buffers({k: memoryview(v).cast("B") for k, v in bloom.buffers().items()})
+        self.assertTrue(copy.might_contain(key_hashes(b"DE1")))
+        self.assertEqual(len(copy), 1)
+        self.assertEqual(copy.size_bytes, bloom.size_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import json
+import unittest
+from array import array
+from src.utils.columnar import (
+    EMPTY,
+    CategoricalColumn,
+    HashIndex,
+    StringColumn,
+    iter_json_arrays,
+    stable_hash,
+)
+from src.utils.data import CustomerStore
+
+
+class TestIterJsonArrays(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "meta": {"version": 3, "tags": ["a", "b"]},
+            "customers": [{"name": "Zoë", "n": 12345678901234}, {"name": "Bob, \"Jr\"", "n": -1.5e3}],
+            "empty": [],
+            "accounts": [{"iban": "DE1", "premium": True}],
+        }
+        self.text = json.dumps(self.data, indent=2)
+
+    def test_yields_elements_in_order_for_any_chunk_size(self):
+        expected = [("customers", c) for c in self.data["customers"]] + [("accounts", self.data["accounts"][0])]
+        for chunk_size in (1, 2, 7, 64, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                items = list(iter_json_arrays(io.StringIO(self.text), ("customers", "accounts"), chunk_size))
+                self.assertEqual(items, expected)
+
+    def test_empty_object_and_array(self):
+        self.assertEqual(list(iter_json_arrays(io.StringIO("{}"), ("customers",))), [])
+        self.assertEqual(list(iter_json_arrays(io.StringIO('{"customers": []}'), ("customers",))), [])
+
+    def test_truncated_document_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_arrays(io.StringIO(self.text[:-20]), ("customers", "accounts"), 8))
+
+
+class TestColumns(unittest.TestCase):
+
+    def test_string_column_round_trip(self):
+        column = StringColumn()
+        for value in ["", "Lisa", "Zoë Ünïcode", "x" * 1000]:
+            column.append(value)
+        self.assertEqual(len(column), 4)
+        self.assertEqual([column[i] for i in range(4)], ["", "Lisa", "Zoë Ünïcode", "x" * 1000])
+
+    def test_categorical_column_shares_values(self):
+        column = CategoricalColumn()
+        for value in ["a", "b", "a", "a"]:
+            column.append(value)
+        self.assertEqual([column[i] for i in range(4)], ["a", "b", "a", "a"])
+        self.assertEqual(len(column._values), 2)
+
+    def test_hash_index_returns_duplicates_in_insertion_order(self):
+        keys = ["x", "y", "x", "z", "x"]
+        index = HashIndex(array("I", [stable_hash(k) for k in keys]))
+        self.assertEqual(list(index.rows(stable_hash("x"))), [0, 2, 4])
+        self.assertEqual(list(index.rows(stable_hash("missing"))), [])
+
+    def test_hash_index_find_returns_first_accepted_row(self):
+        keys = ["x", "y", "x", "z", "x"]
+        index = HashIndex(array("I", [stable_hash(k) for k in keys]))
+        self.assertEqual(index.find(stable_hash("x"), lambda row: row > 0), 2)
+        self.assertEqual(index.find(stable_hash("x"), lambda row: False), EMPTY)
+        self.assertEqual(index.find(stable_hash("missing"), lambda row: True), EMPTY)
+
+
+class TestStreamingStore(unittest.TestCase):
+
+    def test_from_json_matches_in_memory_build(self):
+        from src.utils.data import _resolve_data_path
+
+        path = _resolve_data_path()
+        with open(path) as f:
+            data = json.load(f)
+        streamed = CustomerStore.from_json(path)
+        built = CustomerStore(data)
+
+        self.assertEqual(len(streamed), len(data["customers"]))
+        for customer in data["customers"]:
+            found = streamed.find_customer(name=customer["name"], iban=customer["iban"])
+            self.assertEqual(found, built.find_customer(name=customer["name"], iban=customer["iban"]))
+            self.assertEqual(found, customer)
+        for account in data["accounts"]:
+            self.assertEqual(streamed.is_premium(account["iban"]), account["premium"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from src.utils import metrics
+from src.utils.data import CustomerStore
+
+
+class TestCustomerStore(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "customers": [
+                {"name": "Test User", "phone": "+123456789", "iban": "DE123456789",
+                 "secret": "Secret one?", "answer": "One"},
+                {"name": "Another User", "phone": "+987654321", "iban": "DE987654321",
+                 "secret": "Secret two?", "answer": "Two"},
+                # Same name as the first record, different phone/IBAN
+                {"name": "test user", "phone": "+555000111", "iban": "DE555000111",
+                 "secret": "Secret three?", "answer": "Three"},
+            ],
+            "accounts": [
+                {"iban": "DE123456789", "premium": True},
+                {"iban": "DE987654321", "premium": False},
+            ],
+        }
+        self.store = CustomerStore(self.data)
+
+    def test_len(self):
+        self.assertEqual(len(self.store), 3)
+
+    def test_composite_lookups(self):
+        self.assertEqual(self.store.find_customer(name="Test User", phone="+123456789")["answer"], "One")
+        self.assertEqual(self.store.find_customer(name="TEST USER", iban="DE555000111")["answer"], "Three")
+        self.assertEqual(self.store.find_customer(phone="+987654321", iban="DE987654321")["answer"], "Two")
+        self.assertEqual(
+            self.store.find_customer(name="Another User", phone="+987654321", iban="DE987654321")["answer"],
+            "Two",
+        )
+
+    def test_all_details_must_match(self):
+        self.assertIsNone(self.store.find_customer(name="Another User", phone="+123456789"))
+        self.assertIsNone(self.store.find_customer(name="Test User", phone="+123456789", iban="DE987654321"))
+
+    def test_single_detail_returns_first_in_file_order(self):
+        self.assertEqual(self.store.find_customer(name="test user")["answer"], "One")
+        self.assertEqual(self.store.find_customer(iban="DE555000111")["answer"], "Three")
+
+    def test_input_is_normalized(self):
+        self.assertIsNotNone(self.store.find_customer(name="  test user ", phone=" +123 456-789 "))
+        self.assertIsNotNone(self.store.find_customer(phone="+123456789", iban=" DE123456789 "))
+
+    def test_misspelt_name_needs_an_exact_phone_or_iban(self):
+        self.assertEqual(self.store.find_customer(name="Test Usr", phone="+123456789")["answer"], "One")
+        self.assertEqual(self.store.find_customer(name="Anothr User", iban="DE987654321")["answer"], "Two")
+        self.assertIsNone(self.store.find_customer(name="Test Usr"))
+        self.assertIsNone(self.store.find_customer(name="Test Usr", phone="+000000000"))
+        # Phone and IBAN belong to different customers: no fallback rescues that.
+        self.assertIsNone(self.store.find_customer(name="Test User", phone="+123456789", iban="DE987654321"))
+
+    def test_search_names(self):
+        results = self.store.search_names("Anothr User", limit=2)
+        self.assertEqual(results[0][1]["answer"], "Two")
+        self.assertAlmostEqual(results[0][0], 10 / 14)
+        self.assertEqual([score for score, _ in results], sorted((score for score, _ in results), reverse=True))
+
+    def test_no_details_returns_none(self):
+        self.assertIsNone(self.store.find_customer())
+
+    def test_is_premium(self):
+        self.assertIs(self.store.is_premium("DE123456789"), True)
+        self.assertIs(self.store.is_premium(" DE987654321 "), False)
+        self.assertIsNone(self.store.is_premium("DE000000000"))
+
+    def test_account_filter_answers_non_clients(self):
+        metrics.reset()
+        for i in range(100):
+            self.assertIsNone(self.store.is_premium(f"NL{i:09d}"))
+        self.store.is_premium("DE123456789")
+        values = metrics.snapshot()
+        self.assertEqual(values["account_filter.positives"], 1)
+        self.assertEqual(values["account_filter.negatives"] + values.get("account_filter.false_positives", 0), 100)
+        self.assertGreater(values["account_filter.negatives"], 90)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from src.utils.entities import Identity, extract_identity
+
+
+class TestExtractIdentity(unittest.TestCase):
+
+    def test_common_first_messages(self):
+        for text, expected in [
+            ("Hi, I'm Lisa, my number is +1 122 334 455",
+             Identity(name="Lisa", phone="+1 122 334 455")),
+            ("My name is John Smith and my IBAN is DE89 3704 0044 0532 0130 01",
+             Identity(name="John Smith", iban="DE89 3704 0044 0532 0130 01")),
+            ("my iban is de89370400440532013000 and phone is +1 (122) 334-455",
+             Identity(phone="+1 (122) 334-455", iban="de89370400440532013000")),
+            ("IBAN ES91 2100 0418 4502 0005 1332 and name is Maria Garcia",
+             Identity(name="Maria Garcia", iban="ES91 2100 0418 4502 0005 1332")),
+            ("call me at 0044 20 7946 0958 please, I am Olga Novak",
+             Identity(name="Olga Novak", phone="0044 20 7946 0958")),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(extract_identity(text), expected)
+
+    def test_iban_groups_with_letters(self):
+        self.assertEqual(extract_identity("GB82 WEST 1234 5698 7654 32 thanks").iban, "GB82 WEST 1234 5698 7654 32")
+
+    def test_iban_digits_are_not_a_phone_number(self):
+        self.assertIsNone(extract_identity("DE89 3704 0044 0532 0130 00").phone)
+
+    def test_nothing_to_extract(self):
+        for text in ["Hi", "I want a loan", "I'm looking for help with my card", "Yoda", "call 12345"]:
+            with self.subTest(text=text):
+                self.assertEqual(extract_identity(text).details, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from src.utils.data import CustomerStore
+from src.utils.leaks import _TOKEN, IBAN, NAME, PHONE, LeakScanner, StoreLeakScanner, redact
+from src.utils.sqlite_store import SqliteCustomerStore, import_json
+
+CUSTOMERS = (
+    ("John Smith", "+1234567890", "DE89370400440532013001"),
+    ("Lisa", "+1122334455", "DE89370400440532013000"),
+)
+FOUND = [
+    ("Your number is +1 (234) 567-890.", PHONE),
+    ("Your number is 001234567890.", PHONE),
+    ("Your number is 1234567890.", PHONE),
+    ("IBAN: de89 3704 0044 0532 0130 01", IBAN),
+    ("Is this JOHN SMITH?", NAME),
+]
+NOT_FOUND = [
+    "Please call our support department at +11223344.",
+    "Hello Lisa, what is the name of your pet?",
+    "Is this John?",
+    "Your number is +1234567891.",
+    "DE89370400440532013002",
+]
+
+
+def _store(*customers):
+    return CustomerStore({
+        "customers": [
+            {"name": name, "phone": phone, "iban": iban, "secret": "Secret?", "answer": "Answer"}
+            for name, phone, iban in customers
+        ],
+        "accounts": [],
+    })
+
+
+class TestLeakScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.store = _store(*CUSTOMERS)
+        self.scanner = LeakScanner.build(self.store)
+
+    def _kinds(self, text, scanner=None):
+        return [leak.kind for leak in (scanner or self.scanner).scan(text)]
+
+    def test_identifiers_found_whatever_their_formatting(self):
+        for text, kind in FOUND:
+            with self.subTest(text=text):
+                self.assertEqual(self._kinds(text), [kind])
+
+    def test_no_false_positives(self):
+        for text in NOT_FOUND:
+            with self.subTest(text=text):
+                self.assertEqual(self._kinds(text), [])
+
+    def test_number_kind_comes_from_the_store(self):
+        # A phone whose token hash collided with an IBAN pattern is still a phone.
+        tokens = list(_TOKEN.finditer("+1234567890"))
+
+        self.assertEqual(self.scanner._confirmed(IBAN, tokens), PHONE)
+        self.assertIsNone(self.scanner._confirmed(PHONE, list(_TOKEN.finditer("+1234567899"))))
+
+    def test_redact(self):
+        text = "John Smith, your phone +1234567890 is on file."
+
+        self.assertEqual(redact(text, self.scanner.scan(text)), "[redacted], your phone [redacted] is on file.")
+
+    @patch("src.utils.leaks.REBUILD_FRACTION", 1.0)
+    def test_update_indexes_only_new_identifiers(self):
+        store = _store(
+            ("John Smith", "+1234567890", "DE89370400440532013001"),
+            ("Maria Garcia", "+9876543210", "ES9121000418450200051332"),
+        )
+        updated = self.scanner.updated(store)
+
+        self.assertEqual(updated.delta_patterns, 3)
+        self.assertEqual(self._kinds("Maria Garcia, +9876543210", updated), [NAME, PHONE])
+        # Still in the base automaton, but no longer a customer.
+        self.assertEqual(self._kinds("IBAN DE89370400440532013000", updated), [])
+
+    def test_large_update_rebuilds(self):
+        store = _store(*[(f"Customer {i}", f"+44{i:08d}", f"GB00{i:018d}") for i in range(10)])
+        updated = self.scanner.updated(store)
+
+        self.assertEqual(updated.delta_patterns, 0)
+        self.assertEqual(updated.patterns, 30)
+
+
+class TestStoreLeakScanner(unittest.TestCase):
+    """The scanner for SQLite stores finds what LeakScanner finds, asking the database."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        json_path = Path(directory.name) / "customers.json"
+        json_path.write_text(json.dumps({
+            "customers": [
+                {"name": name, "phone": phone, "iban": iban, "secret": "Secret?", "answer": "Answer"}
+                for name, phone, iban in CUSTOMERS
+            ],
+            "accounts": [],
+        }))
+        import_json(json_path, Path(directory.name) / "customers.db")
+        store = SqliteCustomerStore(Path(directory.name) / "customers.db", pool_size=1)
+        self.addCleanup(store.close)
+        self.scanner = StoreLeakScanner(store)
+
+    def test_same_findings_as_the_automaton(self):
+        for text, kind in FOUND:
+            with self.subTest(text=text):
+                self.assertEqual([leak.kind for leak in self.scanner.scan(text)], [kind])
+        for text in NOT_FOUND:
+            with self.subTest(text=text):
+                self.assertEqual(self.scanner.scan(text), [])
+
+    def test_redact(self):
+        text = "John Smith, your phone +1234567890 is on file."
+
+        self.assertEqual(redact(text, self.scanner.scan(text)), "[redacted], your phone [redacted] is on file.")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from src.utils.normalize import canonical_iban, canonical_phone, iban_checksum_valid
+
+
+class TestNormalize(unittest.TestCase):
+
+    def test_canonical_phone(self):
+        for spelling in ("+1122334455", "+1 122 334 455", "001122334455", " +1 (122) 334-455 ", "00 1 122.334.455"):
+            self.assertEqual(canonical_phone(spelling), "+1122334455", spelling)
+        self.assertEqual(canonical_phone("030 1234567"), "0301234567")
+
+    def test_canonical_iban(self):
+        self.assertEqual(canonical_iban(" de89 3704 0044 0532 0130 00 "), "DE89370400440532013000")
+
+    def test_iban_checksum(self):
+        self.assertTrue(iban_checksum_valid("DE89370400440532013000"))
+        self.assertTrue(iban_checksum_valid("ES9121000418450200051332"))
+        self.assertTrue(iban_checksum_valid("GB82WEST12345698765432"))
+        self.assertFalse(iban_checksum_valid("DE89370400440532013001"))  # one digit off
+        self.assertFalse(iban_checksum_valid("DE123456789"))  # too short
+        self.assertFalse(iban_checksum_valid("not an iban"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.utils import metrics
+from src.utils.data import CustomerDataReloader, add_reload_listener, customer_store_in_memory, load_customers_data
+from src.utils.sqlite_store import import_json
+
+
+def _data(answer, premium):
+    return {
+        "customers": [{"name": "Test User", "phone": "+123456789", "iban": "DE123456789",
+                       "secret": "Secret?", "answer": answer}],
+        "accounts": [{"iban": "DE123456789", "premium": premium}],
+    }
+
+
+class TestCustomerDataReloader(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "customers.json"
+        self.path.write_text(json.dumps(_data("Old", True)))
+        self.reloader = CustomerDataReloader(str(self.path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _replace(self, data):
+        # Write-then-rename, like a nightly export landing on disk.
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+
+    def test_unchanged_file_is_not_reloaded(self):
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertEqual(self.reloader.version, 1)
+
+    def test_changed_file_is_swapped_in_after_it_settles(self):
+        old_store = self.reloader.current()
+        self._replace(_data("New", False))
+
+        # First poll only notices the change; the second one reloads.
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertTrue(self.reloader.check_for_update())
+
+        new_store = self.reloader.current()
+        self.assertIsNot(new_store, old_store)
+        self.assertEqual(new_store.find_customer(name="Test User", phone="+123456789")["answer"], "New")
+        self.assertIs(new_store.is_premium("DE123456789"), False)
+
+        # A caller still holding the previous snapshot keeps reading it.
+        self.assertEqual(old_store.find_customer(name="Test User", phone="+123456789")["answer"], "Old")
+
+        values = metrics.snapshot()
+        self.assertEqual(self.reloader.version, 2)
+        self.assertEqual(values["customer_data.snapshot_version"], 2)
+        self.assertEqual(values["customer_data.reload_count"], 1)
+        self.assertIn("customer_data.last_reload_seconds", values)
+
+    def test_broken_file_keeps_previous_snapshot(self):
+        old_store = self.reloader.current()
+        self.path.write_text('{"customers": [')
+
+        self.reloader.check_for_update()
+        self.assertFalse(self.reloader.check_for_update())
+        self.assertIs(self.reloader.current(), old_store)
+        self.assertEqual(metrics.snapshot()["customer_data.reload_errors"], 1)
+
+    def test_listeners_get_the_new_store(self):
+        failing, listener = MagicMock(side_effect=RuntimeError("boom")), MagicMock()
+        with patch("src.utils.data._reload_listeners", []):
+            add_reload_listener(failing)
+            add_reload_listener(listener)
+            self._replace(_data("New", False))
+            self.reloader.check_for_update()
+            self.assertTrue(self.reloader.check_for_update())
+
+        # A failing listener neither undoes the reload nor starves the others.
+        listener.assert_called_once_with(self.reloader.current())
+
+
+    def test_only_the_columnar_store_is_in_memory(self):
+        db_path = Path(self.tmp.name) / "customers.db"
+        import_json(self.path, db_path)
+        sqlite = CustomerDataReloader(f"sqlite:///{db_path}")
+        self.addCleanup(sqlite.current().close)
+
+        for reloader, expected in [(None, False), (self.reloader, True), (sqlite, False)]:
+            with self.subTest(reloader=reloader), patch("src.utils.data._reloader", reloader):
+                self.assertEqual(customer_store_in_memory(), expected)
+
+
+    def test_load_customers_data_returns_the_current_store(self):
+        with patch("src.utils.data._reloader", self.reloader):
+            self.assertIs(load_customers_data(), self.reloader.current())
+
+
+if __name__ == '__main__':
+    unittest.main()
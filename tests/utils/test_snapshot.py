@@ -0,0 +1,119 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from src.utils.data import CustomerStore
+from src.utils.snapshot import (
+    SnapshotError,
+    attach_snapshot,
+    build_snapshot,
+    is_current,
+    open_or_build,
+    open_snapshot,
+    read_source_info,
+)
+
+
+def _open_or_build_inode(json_path, snapshot_path, results):
+    store = open_or_build(json_path, snapshot_path)
+    results.put((len(store), os.stat(snapshot_path).st_ino))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "customers": [
+                {"name": "Zoë User", "phone": "+123456789", "iban": "DE123456789",
+                 "secret": "Secret?", "answer": "One"},
+                {"name": "Another User", "phone": "+987654321", "iban": "DE987654321",
+                 "secret": "Secret?", "answer": "Two"},
+            ],
+            "accounts": [
+                {"iban": "DE123456789", "premium": True},
+                {"iban": "DE987654321", "premium": False},
+            ],
+        }
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = Path(self.tmp.name) / "customers.json"
+        self.json_path.write_text(json.dumps(self.data))
+        self.snapshot_path = Path(self.tmp.name) / "customers.snapshot"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_snapshot_matches_source_store(self):
+        store = build_snapshot(self.json_path, self.snapshot_path)
+        reference = CustomerStore(self.data)
+
+        self.assertEqual(len(store), 2)
+        for query in ({"name": "zoë user", "phone": "+123456789"}, {"phone": "+987654321", "iban": "DE987654321"},
+                      {"name": "Another User"}, {"name": "Nobody", "iban": "DE123456789"}):
+            self.assertEqual(store.find_customer(**query), reference.find_customer(**query))
+        self.assertIs(store.is_premium("DE123456789"), True)
+        self.assertIs(store.is_premium("DE987654321"), False)
+        self.assertIsNone(store.is_premium("DE000"))
+        self.assertTrue(store.has_legacy_iban("DE123456789"))
+        self.assertFalse(store.has_legacy_iban("DE000"))
+
+    def test_reopened_snapshot_is_mapped_not_rebuilt(self):
+        build_snapshot(self.json_path, self.snapshot_path)
+        store = open_snapshot(self.snapshot_path)
+        self.assertIsInstance(store._names._data, memoryview)
+        self.assertEqual(store.find_customer(name="Another User", iban="DE987654321")["answer"], "Two")
+
+    def test_checksum_decides_rebuild(self):
+        build_snapshot(self.json_path, self.snapshot_path)
+        self.assertTrue(is_current(self.json_path, self.snapshot_path))
+
+        # Touched but identical content: still current via checksum.
+        stat = os.stat(self.json_path)
+        os.utime(self.json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(is_current(self.json_path, self.snapshot_path))
+
+        self.data["customers"][1]["answer"] = "Changed"
+        self.json_path.write_text(json.dumps(self.data))
+        self.assertFalse(is_current(self.json_path, self.snapshot_path))
+
+        store = open_or_build(self.json_path, self.snapshot_path)
+        self.assertEqual(store.find_customer(name="Another User", phone="+987654321")["answer"], "Changed")
+        self.assertTrue(is_current(self.json_path, self.snapshot_path))
+
+    def test_corrupt_snapshot_is_rejected_and_rebuilt(self):
+        self.snapshot_path.write_bytes(b"not a snapshot at all, just some bytes....")
+        with self.assertRaises(SnapshotError):
+            read_source_info(self.snapshot_path)
+        store = open_or_build(self.json_path, self.snapshot_path)
+        self.assertEqual(len(store), 2)
+
+    def test_attach_waits_for_published_snapshot_and_never_builds(self):
+        with self.assertRaises(SnapshotError):
+            attach_snapshot(self.snapshot_path, timeout=0)
+        self.assertFalse(self.snapshot_path.exists())
+
+        build_snapshot(self.json_path, self.snapshot_path)
+        store = attach_snapshot(self.snapshot_path, timeout=0)
+        self.assertEqual(store.find_customer(name="Another User")["answer"], "Two")
+
+    def test_concurrent_workers_share_one_build(self):
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        workers = [
+            context.Process(target=_open_or_build_inode, args=(self.json_path, self.snapshot_path, results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        opened = [results.get(timeout=5) for _ in workers]
+        self.assertEqual({count for count, _ in opened}, {2})
+        # Every worker mapped the same published file: nobody rebuilt it.
+        self.assertEqual(len({inode for _, inode in opened}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
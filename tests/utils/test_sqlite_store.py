@@ -0,0 +1,107 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.utils.data import CustomerStore, open_customer_store, split_location
+from src.utils.sqlite_store import SqliteCustomerStore, import_json
+
+
+class TestSqliteCustomerStore(unittest.TestCase):
+
+    def setUp(self):
+        self.data = {
+            "customers": [
+                {"name": "Test User", "phone": "+123456789", "iban": "DE123456789",
+                 "secret": "Secret one?", "answer": "One"},
+                {"name": "Another User", "phone": "+987654321", "iban": "DE987654321",
+                 "secret": "Secret two?", "answer": "Two"},
+                {"name": "test user", "phone": "+555000111", "iban": "DE555000111",
+                 "secret": "Secret three?", "answer": "Three"},
+            ],
+            "accounts": [
+                {"iban": "DE123456789", "premium": True},
+                {"iban": "DE987654321", "premium": False},
+            ],
+        }
+        self.tmp = tempfile.TemporaryDirectory()
+        json_path = Path(self.tmp.name) / "customers.json"
+        json_path.write_text(json.dumps(self.data))
+        self.db_path = Path(self.tmp.name) / "customers.db"
+        self.imported = import_json(json_path, self.db_path)
+        self.store = SqliteCustomerStore(self.db_path, pool_size=2)
+        self.reference = CustomerStore(self.data)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_import_counts_customers(self):
+        self.assertEqual(self.imported, 3)
+        self.assertEqual(len(self.store), 3)
+
+    def test_lookups_match_in_memory_store(self):
+        queries = [
+            {"name": "Test User", "phone": "+123456789"},
+            {"name": "TEST USER", "iban": "DE555000111"},
+            {"phone": "+987654321", "iban": "DE987654321"},
+            {"name": "Another User", "phone": "+987654321", "iban": "DE987654321"},
+            {"name": "test user"},
+            {"phone": " +123 456-789 "},
+            {"name": "Another User", "phone": "+123456789"},
+            {"name": "Test Usr", "phone": "+123456789"},
+            {"name": "Anothr User", "iban": "DE987654321"},
+            {},
+        ]
+        for query in queries:
+            with self.subTest(**query):
+                self.assertEqual(self.store.find_customer(**query), self.reference.find_customer(**query))
+
+    def test_is_premium(self):
+        self.assertIs(self.store.is_premium("DE123456789"), True)
+        self.assertIs(self.store.is_premium("DE987654321"), False)
+        self.assertIsNone(self.store.is_premium("DE000000000"))
+
+    def test_connections_are_read_only(self):
+        with self.store._connection() as connection:
+            with self.assertRaises(Exception):
+                connection.execute("DELETE FROM customers")
+
+
+    def test_account_filter_is_loaded(self):
+        self.assertEqual(len(self.store.account_filter), 2)
+        self.assertIsNone(self.store.is_premium("NL000000000"))
+
+    def test_legacy_ibans_match_in_memory_store(self):
+        for iban in ("DE123456789", "de 555 000 111", "DE89370400440532013000", "DE000000000"):
+            with self.subTest(iban=iban):
+                self.assertIs(self.store.has_legacy_iban(iban), self.reference.has_legacy_iban(iban))
+
+
+class TestBackendSelection(unittest.TestCase):
+
+    def test_split_location(self):
+        self.assertEqual(split_location("sqlite:////srv/customers.db"), ("sqlite", Path("/srv/customers.db")))
+        scheme, path = split_location("sqlite:///data/customers.db")
+        self.assertEqual(scheme, "sqlite")
+        self.assertTrue(path.is_absolute())
+        self.assertEqual(path.parts[-2:], ("data", "customers.db"))
+        self.assertEqual(split_location("data/customers.json")[0], "json")
+
+    def test_open_customer_store_by_scheme(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp) / "customers.json"
+            json_path.write_text(json.dumps({"customers": [], "accounts": []}))
+            import_json(json_path, Path(tmp) / "customers.db")
+
+            self.assertIsInstance(open_customer_store(str(json_path)), CustomerStore)
+            store = open_customer_store(f"sqlite:///{tmp}/customers.db")
+            self.assertIsInstance(store, SqliteCustomerStore)
+            store.close()
+
+    def test_unknown_scheme(self):
+        with self.assertRaises(ValueError):
+            open_customer_store("redis://localhost/0")
+
+
+if __name__ == '__main__':
+    unittest.main()
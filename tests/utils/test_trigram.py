@@ -0,0 +1,26 @@
+import unittest
+from src.utils.trigram import TrigramIndex, similarity, trigrams
+
+
+class TestTrigram(unittest.TestCase):
+
+    def test_trigrams_are_padded_per_word(self):
+        self.assertEqual(trigrams("jon"), {"  j", " jo", "jon", "on "})
+        self.assertEqual(trigrams(""), frozenset())
+
+    def test_similarity(self):
+        self.assertEqual(similarity("john smith", "john smith"), 1.0)
+        self.assertAlmostEqual(similarity("jon smith", "john smith"), 8 / 13)
+        self.assertLess(similarity("maria garcia", "john smith"), 0.1)
+
+    def test_search_ranks_closest_names(self):
+        names = ["john smith", "joan smithers", "lisa", "maria garcia", "jon smyth", "john smith"]
+        index = TrigramIndex(names)
+        results = index.search("jon smith", names.__getitem__, limit=3)
+        self.assertEqual([row for _, row in results], [0, 5, 4])
+        self.assertEqual(results[0][0], similarity("jon smith", "john smith"))
+        self.assertEqual(index.search("zzz", names.__getitem__), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from src.utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_least_recently_used_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60, clock=self.clock)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=10, ttl=60, clock=self.clock)
+        cache.put("a", {"is_safe": True})
+        self.clock.now += 59
+        self.assertEqual(cache.get("a"), {"is_safe": True})
+        self.clock.now += 2
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.hit_ratio, 0.5)
+
+    def test_sqlite_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            cache = TTLCache(maxsize=10, ttl=60, path=path, clock=self.clock)
+            cache.put("a", {"is_safe": False})
+            cache.put("b", {"is_safe": True})
+            cache.close()
+
+            self.clock.now += 30
+            restarted = TTLCache(maxsize=1, ttl=60, path=path, clock=self.clock)
+            self.assertEqual(len(restarted), 0)
+            self.assertEqual(restarted.get("a"), {"is_safe": False})
+            # Evicted from memory, still on disk.
+            self.assertEqual(restarted.get("b"), {"is_safe": True})
+            self.assertEqual(restarted.get("a"), {"is_safe": False})
+            self.clock.now += 31
+            self.assertIsNone(restarted.get("b"))
+            restarted.close()
+
+    def test_expired_rows_pruned_while_running(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.db")
+            cache = TTLCache(maxsize=10, ttl=60, path=path, clock=self.clock, prune_every=3)
+            cache.put("a", 1)
+            cache.put("b", 2)
+            self.clock.now += 61
+
+            cache.put("c", 3)
+
+            with sqlite3.connect(path) as connection:
+                self.assertEqual([row[0] for row in connection.execute("SELECT key FROM entries")], ["c"])
+            cache.close()
+
+    def test_discard_forgets_both_tiers(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = TTLCache(maxsize=10, ttl=60, path=os.path.join(tmp, "cache.db"), clock=self.clock)
+            cache.put("a", 1)
+            cache.discard("a")
+            cache.discard("missing")
+
+            self.assertIsNone(cache.get("a"))
+            cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()